@@ -1 +1,2 @@
 from . import solver, parser
+from .solver import compile, CompiledExpression, evaluate_many
@@ -1,3 +1,4 @@
 from .parser import *
 from .objects import *
 from .utility import *
+from .tree import *
@@ -1,5 +0,0 @@
-from .utility import verify_parentheses
-
-
-def check_integrity(equation: str):
-    verify_parentheses(equation)
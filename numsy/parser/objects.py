@@ -1,14 +1,55 @@
 from __future__ import annotations
 
-from functools import cached_property
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fractions import Fraction as Rational
+from functools import lru_cache
 from itertools import chain
-from typing import TYPE_CHECKING, ClassVar
+from math import copysign, isqrt
+from typing import TYPE_CHECKING, ClassVar, TypeAlias, cast
 from decimal import Decimal
 
 if TYPE_CHECKING:
     from numsy.solver.datatype import No_RO
 
 
+def _contains_variable(groups: list) -> bool:
+    # Iterative, so deeply nested powers and parentheses don't reach the recursion limit
+    stack = [groups]
+    while stack:
+        for group in stack.pop():
+            if isinstance(group, Group):
+                if group.variable is not None:
+                    return True
+                stack.append(group.power)
+            elif isinstance(group, ParenthesizedGroup):  # The power of a ParenthesizedGroup isn't checked
+                stack.append(group.groups)
+    return False
+
+
+def _hash_groups(root: Group | ParenthesizedGroup | Fraction) -> int:
+    # Structural hash computed with an explicit stack. The length of every nested list is part of the hash, so
+    # differently nested equations with the same objects in the same order don't collide.
+    result = 0
+    stack: list[Group | Operator | ParenthesizedGroup | Fraction | RelationalOperator] = [root]
+    while stack:
+        group = stack.pop()
+        if isinstance(group, Group):
+            result = hash((result, group.variable, group.number, len(group.power)))
+            stack.extend(reversed(group.power))
+        elif isinstance(group, ParenthesizedGroup):  # Only the inner groups, like `ParenthesizedGroup.__eq__`
+            result = hash((result, ParenthesizedGroup, len(group.groups)))
+            stack.extend(reversed(group.groups))
+        elif isinstance(group, Fraction):
+            result = hash((result, Fraction, len(group.numerator), len(group.denominator)))
+            stack.extend(reversed(group.denominator))
+            stack.extend(reversed(group.numerator))
+        else:
+            result = hash((result, group))
+    return result
+
+
 class Character:
     digit = 1
     power = 2
@@ -41,6 +82,8 @@ class Integrity:
 
 
 class Operator:
+    __slots__ = ("symbol",)
+
     Addition: ClassVar  # Workaround for: Cannot assign member "Addition" for type "type[Operator]" pyright error
     Add: ClassVar
     Division: ClassVar
@@ -48,8 +91,17 @@ class Operator:
     Multiplication: ClassVar
     Mul: ClassVar
 
-    def __init__(self, symbol: str):
-        self.symbol = symbol
+    _interned: ClassVar[dict[str, Operator]] = {}
+
+    def __new__(cls, symbol: str):
+        # Operators are immutable, so there's only one instance of each symbol, `Operator("+") is Operator.Add`
+        if (interned := cls._interned.get(symbol)) is None:
+            interned = cls._interned[symbol] = super().__new__(cls)
+            interned.symbol = symbol
+        return interned
+
+    def __reduce__(self):
+        return Operator, (self.symbol,)
 
     def __repr__(self):
         return f"<Operator symbol='{self.symbol}'>"
@@ -58,7 +110,7 @@ class Operator:
         return hash(self.symbol)
 
     def __eq__(self, other):
-        return self.symbol == other.symbol if isinstance(other, Operator) else False
+        return self is other or (self.symbol == other.symbol if isinstance(other, Operator) else False)
 
 
 Operator.Addition = Operator.Add = Operator("+")
@@ -66,54 +118,134 @@ Operator.Division = Operator.Div = Operator("/")
 Operator.Multiplication = Operator.Mul = Operator("*")
 
 
+# The values of one calculation all have the type of its numeric backend, which the type checker can't know, so the
+# operations between two of them are marked with `# type: ignore`
+Value: TypeAlias = Decimal | Rational | float
+
+_ZERO = Decimal(0)
+
+# Shared values of the small integers, which are most of the numbers in an equation
+_SMALL_INTEGERS = tuple(Decimal(i) for i in range(256))
+_SMALL_NEGATIVE_INTEGERS = tuple(Decimal(f"-{i}") for i in range(256))
+
+# The type of the values of new numbers: Decimal, `fractions.Fraction` (exact) or float, see `numeric_backend`
+BACKENDS: dict[str, Value] = {"decimal": _ZERO, "exact": Rational(0), "float": 0.0}  # With the zero of every backend
+_backend: ContextVar[str] = ContextVar("backend", default="decimal")
+
+
+@contextmanager
+def numeric_backend(backend: str = "decimal") -> Iterator[None]:
+    """Stores the values of the numbers created (or changed) inside the block with the type of `backend`. The parser
+    isn't affected, it always reads the digits as Decimal (see `convert_numbers`)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown numeric backend '{backend}', expected one of {', '.join(BACKENDS)}.")
+    token = _backend.set(backend)
+    try:
+        yield
+    finally:
+        _backend.reset(token)
+
+
+def _to_value(value: Value | int | str) -> Value:
+    # Converts a value to the type of the current backend
+    if (backend := _backend.get()) == "float":
+        return float(value)
+    if backend == "exact":
+        return value if isinstance(value, Rational) else Rational(value)
+    if isinstance(value, Rational):
+        return Decimal(value.numerator) / value.denominator
+    if isinstance(value, float):
+        value = repr(value)  # The shortest digits which give back the float, not its binary expansion
+    return value if isinstance(value, Decimal) else Decimal(value)
+
+
+def _copy_abs(value: Value) -> Value:
+    return value.copy_abs() if isinstance(value, Decimal) else abs(value)
+
+
+def _copy_negate(value: Value) -> Value:
+    # Unlike `-value`, a Decimal keeps its exponent and the sign of zero
+    return value.copy_negate() if isinstance(value, Decimal) else -value
+
+
+def _is_signed(value: Value) -> bool:
+    if isinstance(value, Decimal):
+        return value.is_signed()
+    return copysign(1.0, value) < 0 if isinstance(value, float) else value < 0
+
+
+@lru_cache(maxsize=1024)
+def _factors(n: Value) -> frozenset[int]:
+    # Cached by value, instead of on every `Number` instance
+    if n % 1 != 0:
+        return frozenset({1})  # RFC: Should we raise error, return {1} or return {1, self.value}?
+    return frozenset(chain.from_iterable([i, int(n) // i] for i in range(1, isqrt(int(n)) + 1) if n % i == 0))
+
+
 class Number:
+    __slots__ = ("_value", "modified")
+
     def __init__(self):
-        self._integer: int = 0
-        self.is_negative = False
-        self.decimal: Decimal = Decimal(0)
+        # The signed value, `integer`, `decimal` and `is_negative` are derived from it. A negative zero is kept, it's
+        # how the parser stores a sign before the digits are read
+        self._value: Value = BACKENDS[_backend.get()]
         self.modified = False
 
     @property
-    def value(self) -> Decimal:
-        return Decimal(f"{'-' if self.is_negative else ''}{self.integer + self.decimal}")
+    def value(self) -> Value:
+        return self._value
 
     @value.setter
-    def value(self, value: Decimal):
+    def value(self, value: Value):
         self.from_data(value, self=self)
 
     @classmethod
-    def from_data(cls, value: Decimal | int, decimal: Decimal | str = "0.0", is_negative: bool = False, self: Number | None = None) -> Number:
+    def from_data(cls, value: Value | int, decimal: Decimal | str = _ZERO, is_negative: bool = False, self: Number | None = None) -> Number:
         self = self or cls()
-        self.decimal = Decimal(decimal)
-        if int(value) == value:
-            self.integer = int(abs(value))
-        else:
-            digit, dec = str(value).split(".")
-            self.integer, self.decimal = abs(int(digit)), Decimal(f"0.{dec}")
-        self.is_negative = is_negative or value < 0
+        value = _to_value(value)
+        magnitude = _copy_abs(value)
+        if decimal and magnitude % 1 == 0:  # `decimal` is only the decimal part of an integer value
+            magnitude += _to_value(decimal)  # type: ignore
+        # A negative zero is only kept with `is_negative`
+        self._value = _copy_negate(magnitude) if is_negative or value < 0 else magnitude
         return self
 
     def append_digit(self, string: str, decimal: bool = False) -> Number:
-        if decimal:
-            if str(self.decimal) == "0":  # This is for leading 0 bug, for example '0.03'
-                self.decimal = Decimal(f"0.{string}")
-            else:
-                self.decimal = Decimal(f"{self.decimal:f}{string}")
+        value = cast(Decimal, self._value)  # Only used by the parser, which always reads Decimal values
+        if decimal:  # The digits are placed after the existing ones, so '0.03' keeps its leading zero
+            digits = Decimal(string).scaleb(min(cast(int, value.as_tuple().exponent), 0) - len(string))
+            self._value = value - digits if value.is_signed() else value + digits
+            return self
+        if not value:  # The first digits of the number, nothing to shift
+            integer = int(string)
+            if integer < 256:
+                self._value = (_SMALL_NEGATIVE_INTEGERS if value.is_signed() else _SMALL_INTEGERS)[integer]
+                return self
+            value = Decimal(integer)
         else:
-            self.integer = int(str(self.integer) + string)
+            magnitude = value.copy_abs()
+            value = (int(magnitude) * 10 ** len(string) + int(string)) + magnitude % 1
+        self._value = value.copy_negate() if _is_signed(self._value) else value
         return self
 
     def copy(self):
         new = Number()
-        new._integer = self._integer
-        new.is_negative = self.is_negative
-        new.decimal = self.decimal
+        new._value = self._value
         new.modified = self.modified
         return new
 
+    @property
+    def is_negative(self) -> bool:
+        return _is_signed(self._value)
+
+    @is_negative.setter
+    def is_negative(self, value: bool):
+        if value != _is_signed(self._value):
+            self._value = _copy_negate(self._value)
+
     @property
     def integer(self) -> int:
-        return self._integer
+        return int(_copy_abs(self._value))
 
     @integer.setter
     def integer(self, value: int | float):  # Float here is only to fix the typechecker
@@ -121,51 +253,70 @@ class Number:
             value = int(value)
         if not isinstance(value, int):
             raise TypeError("Integer should be class int.")
-        self._integer = abs(value)
-        if value < 0:
-            self.is_negative = True
+        magnitude = abs(value) + self.decimal
+        self._value = _copy_negate(magnitude) if value < 0 or self.is_negative else magnitude
+
+    @property
+    def decimal(self) -> Value:
+        return _copy_abs(self._value) % 1
+
+    @decimal.setter
+    def decimal(self, value: Decimal):
+        magnitude = self.integer + _to_value(value)
+        self._value = _copy_negate(magnitude) if self.is_negative else magnitude
 
     @property
     def _is_base(self):
-        return not self.integer and not self.decimal and not self.modified
+        return not self._value and not self.modified
 
     @_is_base.setter
     def _is_base(self, value):
         self.modified = not value
 
-    @cached_property
-    def factors(self) -> set[int]:
-        if self.value >= 1E10:
+    @property
+    def factors(self) -> frozenset[int]:
+        if abs(value := self.value) >= 1E10:  # Either sign, `_factors` trial-divides up to the square root
             raise ValueError("Value is too large.")
-        if (n := abs(self.value)) % 1 != 0:
-            return {1}  # RFC: Should we raise error, return {1} or return {1, self.value}?
-        return set(chain.from_iterable([i, int(n) // i] for i in range(1, int(n.sqrt()) + 1) if n % i == 0))
+        return _factors(abs(value))
 
     def __repr__(self):
         return f"<Number integer={self.integer} decimal={self.decimal} negative={self.is_negative}>"
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.integer == other.integer and self.is_negative == other.is_negative and self.decimal == other.decimal
+        return isinstance(other, self.__class__) and self._value == other._value and self.is_negative == other.is_negative
 
     def __hash__(self):
-        return hash(self.integer) + hash(self.is_negative) + hash(self.decimal)
+        return hash((self._value, self.is_negative))
 
 
 class Variable:
-    def __init__(self, name: str):
-        self.name = name
+    __slots__ = ("name",)
+
+    _interned: ClassVar[dict[str, Variable]] = {}
+
+    def __new__(cls, name: str):
+        # Like `Operator`, every variable name has a single shared instance
+        if (interned := cls._interned.get(name)) is None:
+            interned = cls._interned[name] = super().__new__(cls)
+            interned.name = name
+        return interned
+
+    def __reduce__(self):
+        return Variable, (self.name,)
 
     def __repr__(self):
         return f"<Variable name={self.name}>"
 
     def __eq__(self, other):
-        return isinstance(other, Variable) and self.name == other.name
+        return self is other or (isinstance(other, Variable) and self.name == other.name)
 
     def __hash__(self):
         return hash(self.name)
 
 
 class Group:
+    __slots__ = ("variable", "number", "power", "modified")
+
     def __init__(self):
         self.variable: Variable | None = None
         self.number: Number = Number()
@@ -181,20 +332,17 @@ class Group:
         return self
 
     @classmethod
-    def from_value(cls, value: Decimal, *args, **kwargs):
-        num, dec = value, "0"
-        if "." in (val := str(value)):
-            num, dec = val.split(".")
-        return cls.from_data(value=Number.from_data(abs(Decimal(num)), Decimal(f"0.{dec}"), value < 0), *args, **kwargs)
+    def from_value(cls, value: Value | int, *args, **kwargs):
+        return cls.from_data(value=Number.from_data(value), *args, **kwargs)
 
-    def get_value(self) -> Decimal:
+    def get_value(self) -> Value:
         return self.number.value
 
     def copy(self):
         new = Group()
         new.number = self.number.copy()
         new.variable = self.variable
-        new.power = self.power
+        new.power = self.power.copy()  # The groups of the power are shared, but not the list
         new.modified = self.modified
         return new
 
@@ -212,7 +360,7 @@ class Group:
 
     @property
     def power_contains_variable(self) -> bool:
-        return any(group.contains_variable for group in self.power if isinstance(group, (Group, ParenthesizedGroup)))
+        return _contains_variable(self.power)
 
     @property
     def is_zero(self) -> bool:
@@ -230,12 +378,12 @@ class Group:
                     raise NotImplementedError("Group with variable-contained power is not supported yet.")
                 else:
                     # Using solve_basic here to simplify power to a single group
-                    total_pow = (solve_basic(self.power) or 1) + (solve_basic(second.power) or 1)
-                    new.power = [Group().from_value(Decimal(total_pow))]
+                    total_pow = (solve_basic(self.power) or 1) + (solve_basic(second.power) or 1)  # type: ignore
+                    new.power = [Group.from_value(total_pow)]
             else:
                 raise NotImplementedError("Multiplying groups which have different variables is not supported yet.")
         variable = self.variable if self.variable else second.variable
-        coefficient = self.get_value() * second.get_value()
+        coefficient = self.get_value() * second.get_value()  # type: ignore
         new.variable = variable
         new.number.value = coefficient
         return new
@@ -247,10 +395,12 @@ class Group:
         return isinstance(other, self.__class__) and self.number == other.number and self.variable == other.variable and self.power == other.power
 
     def __hash__(self):
-        return hash(self.variable) + hash(self.number) + hash(tuple(self.power))
+        return _hash_groups(self)
 
 
 class RelationalOperator:
+    __slots__ = ("symbol", "func")
+
     def __init__(self, symbol: str, func):
         self.symbol = symbol
         self.func = func
@@ -274,6 +424,8 @@ LowerThanOrEquals = RelationalOperator("<=", lambda first, second: first <= seco
 
 
 class ParenthesizedGroup:
+    __slots__ = ("groups", "power", "is_negative")
+
     def __init__(self, groups: No_RO, power: No_RO | None = None):
         self.groups = groups
         self.power = power or []
@@ -283,21 +435,23 @@ class ParenthesizedGroup:
         return isinstance(other, ParenthesizedGroup) and self.groups == other.groups
 
     def __hash__(self):
-        return sum(hash(group) for group in self.groups)
+        return _hash_groups(self)
 
     def __repr__(self):
         return f"<ParenthesizedGroup groups={[group for group in self.groups]} power={[p for p in self.power]} is_negative={self.is_negative}>"
 
     @property
     def contains_variable(self) -> bool:
-        return any(group.contains_variable for group in self.groups if isinstance(group, (Group, ParenthesizedGroup)))
+        return _contains_variable(self.groups)
 
     @property
     def power_contains_variable(self) -> bool:
-        return any(group.contains_variable for group in self.power if isinstance(group, (Group, ParenthesizedGroup)))
+        return _contains_variable(self.power)
 
 
 class Fraction:
+    __slots__ = ("numerator", "denominator")
+
     def __init__(self, numerator: No_RO, denominator: No_RO):
         self.numerator = numerator
         if isinstance(deno := denominator[0], Group) and deno.number.value == 0:
@@ -312,8 +466,8 @@ class Fraction:
         return isinstance(other, Fraction) and self.numerator == other.numerator and self.denominator == other.denominator
 
     def __hash__(self):
-        return id(self)  # Not good
+        return _hash_groups(self)
 
     @property
     def contains_variable(self):
-        return any(group.contains_variable for group in (self.numerator + self.denominator) if isinstance(group, (Group, ParenthesizedGroup)))
+        return _contains_variable(self.numerator) or _contains_variable(self.denominator)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Generator
 from decimal import Decimal
+from typing import Any
 
-from .utility import match_parentheses
+from .utility import trampoline
+from .tree import Node, Equation, to_tree
 from .errors import UnmatchedParenthesis, ParseError
-from .checker import check_integrity
 from .objects import (
     Character,
     Group,
@@ -12,36 +14,42 @@ from .objects import (
     Variable,
     Operator,
     Equals,
-    Number,
     ParenthesizedGroup,
     LowerThan,
     LowerThanOrEquals,
     GreaterThan,
     GreaterThanOrEquals,
-    NotEquals
+    NotEquals,
+    numeric_backend
 )
 
 
+CHARACTER_TYPES: dict[str, int] = {
+    **{digit: Character.digit for digit in "0123456789"},
+    "^": Character.power,
+    "-": Character.integrity,
+    "+": Character.operator,
+    "/": Character.operator,
+    "*": Character.operator,
+    "(": Character.opening_parentheses,
+    ")": Character.closing_parentheses,
+    ".": Character.decimal,
+    "=": Character.equals,
+    "≠": Character.not_equals,
+    "<": Character.lower_than,
+    ">": Character.greater_than,
+    "≤": Character.lower_than_or_equals,
+    "≥": Character.greater_than_or_equals,
+    "!": Character.exclamation,
+    # Denoted with "E" (uppercase) to avoid ambiguity with the euler constant "e" (lowercase)
+    "E": Character.scientific,
+}
+
+
 def verify_type(character: str):
-    if character.isdigit():
-        return Character.digit
-    match character:
-        case "^": return Character.power
-        case "-": return Character.integrity
-        case "+" | "/" | "*": return Character.operator
-        case "(" | ")": return Character.opening_parentheses if character == "(" else Character.closing_parentheses
-        case ".": return Character.decimal
-        case "=": return Character.equals
-        case "≠": return Character.not_equals
-        case "<": return Character.lower_than
-        case ">": return Character.greater_than
-        case "≤": return Character.lower_than_or_equals
-        case "≥": return Character.greater_than_or_equals
-        case "!": return Character.exclamation
-        # Denoted with "E" (uppercase) to avoid ambiguity with the euler constant "e" (lowercase)
-        case "E": return Character.scientific
-
-    return Character.variable
+    if (_type := CHARACTER_TYPES.get(character)) is not None:
+        return _type
+    return Character.digit if character.isdigit() else Character.variable
 
 
 RO = (
@@ -53,85 +61,109 @@ RO = (
     Character.not_equals
 )
 
+RELATIONAL_OPERATORS = {
+    Character.equals: Equals,
+    Character.greater_than: GreaterThan,
+    Character.greater_than_or_equals: GreaterThanOrEquals,
+    Character.lower_than: LowerThan,
+    Character.lower_than_or_equals: LowerThanOrEquals,
+    Character.not_equals: NotEquals
+}
+
+# Two-character relational operators (">=", "<=", "==" and "!="), keyed by the type of their first character
+COMPOUND_RO = {
+    Character.greater_than: Character.greater_than_or_equals,
+    Character.lower_than: Character.lower_than_or_equals,
+    Character.equals: Character.equals,
+    Character.exclamation: Character.not_equals
+}
+
+# A power operand (for example `-4y` in `3^-4y + 6`) ends on one of these, but only after a digit or a variable
+OPERAND_END = (Character.operator, Character.integrity, Character.opening_parentheses, *RO)
+
+# Parsing modes of `_parse`, they decide where the parsed sequence ends
+EXPRESSION, PARENTHESES, OPERAND = range(3)
+
+
+def _read_while(string: str, index: int, allowed: str) -> int:
+    # Returns the index of the first character (starting from `index`) which isn't in `allowed`
+    length = len(string)
+    while index < length and string[index] in allowed:
+        index += 1
+    return index
+
+
+ParseResult = Generator[Any, Any, tuple[list, int]]
 
-def parse_single_group(string: str) -> tuple[int, str]:  # This is to get the substring between the parentheses
-    if string.startswith("("):
-        opening, closing = match_parentheses(string)[0]  # Get the position of opening and closing parentheses
-        return closing + 1, string[opening + 1:closing]
-    after_obj = False
-    for index, char in enumerate(string):
-        _type = verify_type(char)
-        if _type in (Character.operator, Character.integrity, Character.opening_parentheses, *RO) and after_obj:
-            return index, string[:index]
-        elif _type in (Character.digit, Character.variable):
-            after_obj = True
-        elif _type == Character.power:
-            after_obj = False
-    return len(string), string  # Until the end of the query
-
-
-def replace_to_valid_RO(string: str):
-    _dict = {
-        ">=": "≥",
-        "<=": "≤",
-        "==": "="
-    }
-    for k, v in _dict.items():
-        string = string.replace(k, v)
-    return string
-
-
-def parse_group(string: str, provided_group: Group | None = None, last_object: object = None,
-                groups_only: bool = False, start_from: int = 0, _from_recursion: bool = False):
-    if not _from_recursion:  # Slight performance
-        string = replace_to_valid_RO(string)
-        check_integrity(string)
-    groups, last_obj, group, jump_to, after_decimal, group_is_parent = [], last_object, provided_group or Group(), start_from, False, False
+
+def _parse_operand(string: str, index: int, groups_only: bool) -> ParseResult:
+    # Parses the exponent after "^". Parenthesized exponents are unpacked, so `2^(1 + 1)` has [1, +, 1] as its power
+    index = _read_while(string, index, " ")
+    if index < len(string) and string[index] == "(":
+        return _parse(string, index + 1, groups_only, PARENTHESES)
+    return _parse(string, index, groups_only, OPERAND)
+
+
+def _parse(string: str, index: int, groups_only: bool, mode: int) -> ParseResult:
+    # Parses `string` from `index` on until the end of the current mode, then returns the groups with the index
+    # where the parsing has stopped. The string is shared between every nested call, so nothing is ever sliced.
+    # Nested parentheses and powers are yielded to `trampoline`, so the nesting depth isn't limited by recursion.
+    groups, last_obj, group, after_decimal, after_obj = [], None, Group(), False, False
     scientific_value = None
-    for index, char in enumerate(string):
-        if jump_to:
-            if index == jump_to:
-                jump_to = 0
-            else:
-                continue
+    opened_at, length = index - 1, len(string)
+    while index < length:
+        char = string[index]
         if char == " ":
+            index += 1
             continue
 
-        __type = verify_type(char)
-        if __type is Character.decimal:
-            after_decimal = True
-        elif __type is Character.digit:
+        __type = CHARACTER_TYPES.get(char)
+        if __type is None:
+            __type = verify_type(char)
+        width = 1
+        if __type in COMPOUND_RO and index + 1 < length and string[index + 1] == "=":
+            __type, width = COMPOUND_RO[__type], 2
+
+        if mode == OPERAND and after_obj and __type in OPERAND_END:
+            break
+
+        if __type is Character.digit:
+            end = _read_while(string, index + 1, "0123456789")
             if last_obj is Character.scientific:
-                groups.append(Operator("*"))
-                group = Group.from_value(Decimal("10"))  # Create empty group to convert from E to "* 10^n"
-                i, rest = parse_single_group(string[index:])
+                # Convert "nEm" to "(n * 10^m)", the ParenthesizedGroup avoids problems with PEMDAS operation
+                end = _read_while(string, end, "0123456789.")
                 scientific_value = "+" if scientific_value is None else scientific_value
-                group.power = [Group.from_value(Decimal(scientific_value + rest))]
-                jump_to, scientific_value = index + i, None
-                # Make this a parent group to not make problems with PEMDAS operation
-                groups.append(ParenthesizedGroup([groups.pop(-2), groups.pop(-1), group]))
-                group = Group()
-                last_obj = Character.digit
+                group = Group.from_value(Decimal("10"))
+                group.power = [Group.from_value(Decimal(scientific_value + string[index:end]))]
+                groups.append(ParenthesizedGroup([groups.pop(), Operator("*"), group]))
+                # Like a closing parenthesis, so a power after it (`4E2^2`) belongs to the ParenthesizedGroup
+                group, last_obj, scientific_value, after_obj, index = Group(), Character.closing_parentheses, None, True, end
                 continue
 
             if last_obj is Character.variable:
                 raise ParseError(f"Digits cannot appear after variable names (found in position {index}). Perhaps you missed \"*\"?")
 
             group._is_base = False  # This is for the number 0, so the parser doesn't see it as a base group
-            last_obj = Character.digit
+            last_obj, after_obj = Character.digit, True
             if after_decimal:
-                group.number.append_digit(char, decimal=True)
-                continue
-            if not group.power and last_obj is not Character.scientific:
-                group.number.append_digit(char)
-        else:
-            after_decimal = False
+                group.number.append_digit(string[index:end], decimal=True)
+            elif not group.power:
+                group.number.append_digit(string[index:end])
+            index = end
+            continue
+
+        if __type is Character.decimal:
+            after_decimal = True
+            index += 1
+            continue
+        after_decimal = False
 
         if __type is Character.integrity:  # Remove ambiguity between negative and subtraction
             if last_obj is Character.scientific:
                 scientific_value = "-"
+                index += 1
                 continue
-            if groups and isinstance(groups[-1], ParenthesizedGroup):
+            if groups and isinstance(groups[-1], ParenthesizedGroup) and not groups_only:
                 groups.append(Operator("+"))
             if last_obj not in (Character.operator, Integrity.negative):  # We need to create a new group object
                 if not group._is_base:
@@ -143,33 +175,38 @@ def parse_group(string: str, provided_group: Group | None = None, last_object: o
             last_obj = Integrity.negative
 
         elif __type is Character.power:
-            last_obj = Character.power
-            i, rest = parse_single_group(string[index + 1:])
-            power = parse_group(rest, groups_only=groups_only)
-            if group_is_parent:
-                jump_to, groups[-1].power = index + 1 + i, power
+            power, index = yield _parse_operand(string, index + 1, groups_only)
+            if last_obj is Character.closing_parentheses:  # The power belongs to the ParenthesizedGroup before it
+                groups[-1].power = power
             else:
-                jump_to, group.power = index + 1 + i, power
+                group.power = power
+            last_obj, after_obj = Character.power, True
+            continue
 
         elif __type is Character.opening_parentheses:
             if not group._is_base:
                 groups.append(group)
-            i, rest = parse_single_group(string[index:])
-            content = parse_group(rest, groups_only=groups_only)
+            content, index = yield _parse(string, index + 1, groups_only, PARENTHESES)
             par = ParenthesizedGroup(content)
             if last_obj is Integrity.negative:
                 par.is_negative = group.number.is_negative
             groups.append(par)
-            jump_to = index + i
-            group_is_parent = True
-            group = Group()
+            group, last_obj, after_obj = Group(), Character.closing_parentheses, True
+            continue
 
         elif __type is Character.closing_parentheses:
+            if mode == PARENTHESES:
+                if not group._is_base:
+                    groups.append(group)
+                return groups, index + 1
+            if mode == OPERAND:  # The parenthesis closes the group which contains this power
+                break
             raise UnmatchedParenthesis(index + 1, is_closing_parenthesis=True)
 
         elif __type is Character.operator:
             if last_obj is Character.scientific and char == "+":
                 scientific_value = "+"
+                index += 1
                 continue
             elif last_obj is Character.scientific and char != "+":
                 raise TypeError(f"Unsupported operator {char} after scientific notation E.")
@@ -184,27 +221,37 @@ def parse_group(string: str, provided_group: Group | None = None, last_object: o
             group.variable = Variable(char)
             if last_obj is not Character.digit:
                 group.number.integer = 1
-            last_obj = Character.variable
+            last_obj, after_obj = Character.variable, True
 
         elif __type in RO:
             last_obj = __type
-            entry = {
-                Character.equals: Equals,
-                Character.greater_than: GreaterThan,
-                Character.greater_than_or_equals: GreaterThanOrEquals,
-                Character.lower_than: LowerThan,
-                Character.lower_than_or_equals: LowerThanOrEquals,
-                Character.not_equals: NotEquals
-            }
             if not group._is_base:
                 groups.append(group)
-            groups.append(entry[__type])
+            groups.append(RELATIONAL_OPERATORS[__type])
             group = Group()
 
         elif __type is Character.scientific:
             last_obj = Character.scientific
             groups.append(group)
+            group = Group()
+
+        index += width
 
+    if mode == PARENTHESES:
+        raise UnmatchedParenthesis(opened_at + 1)
     if not group._is_base:
         groups.append(group)
+    return groups, index
+
+
+def parse_group(string: str, groups_only: bool = False):
+    # Single pass over the string, relational operators like ">=" and parentheses are checked along the way.
+    # The digits are always read as Decimal, whatever the `numeric_backend` is.
+    with numeric_backend("decimal"):
+        groups, _ = trampoline(_parse(string, 0, groups_only, EXPRESSION))
     return groups
+
+
+def parse_tree(string: str) -> Node | Equation:
+    # Same as `parse_group`, but returns an immutable tree instead of the flat list of groups
+    return to_tree(parse_group(string))
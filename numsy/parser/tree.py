@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from collections.abc import Generator
+from dataclasses import dataclass
+from typing import Any, TYPE_CHECKING, TypeAlias
+
+from .objects import Group, Number, Variable, Operator, ParenthesizedGroup, RelationalOperator, Fraction, Value, _is_signed
+from .utility import trampoline
+
+if TYPE_CHECKING:
+    from numsy.solver.datatype import Maybe_RO, No_RO
+
+
+# Immutable expression tree. Nodes are compared and hashed by their structure, so equal subtrees can be shared.
+@dataclass(frozen=True, slots=True)
+class Num:
+    value: Value
+
+
+@dataclass(frozen=True, slots=True)
+class Var:
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class Pow:
+    base: Node
+    exponent: Node
+
+
+@dataclass(frozen=True, slots=True)
+class UnaryOp:  # Negation, the only unary operator
+    operand: Node
+
+
+@dataclass(frozen=True, slots=True)
+class BinOp:  # "+", "*" or "/", subtraction is the addition of a negated operand like in the flat group list
+    operator: str
+    left: Node
+    right: Node
+
+
+@dataclass(frozen=True, slots=True)
+class Equation:  # `sides[i]` and `sides[i + 1]` are compared with `relations[i]`
+    sides: tuple[Node, ...]
+    relations: tuple[RelationalOperator, ...]
+
+
+Node: TypeAlias = Num | Var | Pow | UnaryOp | BinOp
+
+TreeResult = Generator[Any, Any, Node]
+
+
+def _group_to_tree(group: Group | ParenthesizedGroup | Fraction) -> TreeResult:
+    if isinstance(group, Fraction):
+        return BinOp("/", (yield _to_tree(group.numerator)), (yield _to_tree(group.denominator)))
+    if isinstance(group, ParenthesizedGroup):
+        node = yield _to_tree(group.groups)
+        if group.power:
+            node = Pow(node, (yield _to_tree(group.power)))
+        return UnaryOp(node) if group.is_negative else node
+
+    value = group.get_value()
+    if group.variable is None:
+        if not group.power:
+            return Num(value)
+        node = Pow(Num(abs(value)), (yield _to_tree(group.power)))  # The sign stays outside the power
+        return UnaryOp(node) if group.number.is_negative else node
+    node = Var(group.variable.name)
+    if group.power:  # The power belongs to the variable only, 5x^2 is 5 * x^2
+        node = Pow(node, (yield _to_tree(group.power)))
+    return node if value == 1 else BinOp("*", Num(value), node)
+
+
+def _to_tree(groups: No_RO) -> TreeResult:
+    terms: list[Node] = []
+    term: Node | None = None
+    operator: str | None = None
+    for group in groups:
+        if isinstance(group, RelationalOperator):
+            raise TypeError("Relational operators cannot be inside power or ParenthesizedGroup.")
+        if isinstance(group, Operator):
+            if group == Operator.Add:
+                if term is not None:
+                    terms.append(term)
+                term = None
+            else:
+                operator = group.symbol
+            continue
+        node = yield _group_to_tree(group)
+        if term is not None and operator is None:  # Groups next to each other are joined like `clean_equation` does
+            if isinstance(group, ParenthesizedGroup) and not group.is_negative:
+                operator = "*"
+            else:
+                terms.append(term)
+                term = None
+        term = node if term is None else BinOp(operator, term, node)  # type: ignore
+        operator = None
+    if term is None:
+        raise ValueError("Cannot create a tree from an empty expression.")
+    terms.append(term)
+    node = terms[0]
+    for right in terms[1:]:  # Additions are calculated from left to right
+        node = BinOp("+", node, right)
+    return node
+
+
+def to_tree(groups: Maybe_RO) -> Node | Equation:
+    """Converts a parsed (cleaned or not) list of groups to a tree. An equation with relational operators becomes an
+    `Equation`, anything else a single `Node`."""
+    sides: list[No_RO] = [[]]
+    relations: list[RelationalOperator] = []
+    for group in groups:
+        if isinstance(group, RelationalOperator):
+            relations.append(group)
+            sides.append([])
+        else:
+            sides[-1].append(group)
+    if not relations:
+        return trampoline(_to_tree(sides[0]))
+    return Equation(tuple(trampoline(_to_tree(side)) for side in sides), tuple(relations))
+
+
+def _wrap(groups: No_RO) -> No_RO:
+    return groups if len(groups) == 1 else [ParenthesizedGroup(groups)]
+
+
+def _is_variable(node: Node) -> bool:
+    return isinstance(node, Var) or isinstance(node, Pow) and isinstance(node.base, Var)
+
+
+def _from_tree(node: Node) -> Generator[Any, Any, No_RO]:
+    if isinstance(node, Num):
+        return [Group.from_data(Number.from_data(node.value, is_negative=_is_signed(node.value)))]
+    if isinstance(node, Var):
+        return [Group.from_data(Number.from_data(1), Variable(node.name))]
+    if isinstance(node, Pow):
+        power = yield _from_tree(node.exponent)
+        if isinstance(base := node.base, Var):
+            return [Group.from_data(Number.from_data(1), Variable(base.name), power)]
+        if isinstance(base, Num) and not _is_signed(base.value):
+            return [Group.from_data(Number.from_data(base.value, is_negative=_is_signed(base.value)), power=power)]
+        return [ParenthesizedGroup((yield _from_tree(base)), power)]
+    if isinstance(node, UnaryOp):
+        groups = yield _from_tree(node.operand)
+        group = groups[0] if len(groups) == 1 else None
+        if isinstance(group, Group):
+            group.number.is_negative = not group.number.is_negative
+            return groups
+        if isinstance(group, ParenthesizedGroup):
+            group.is_negative = not group.is_negative
+            return groups
+        parenthesized = ParenthesizedGroup(groups)
+        parenthesized.is_negative = True
+        return [parenthesized]
+
+    if node.operator == "*" and isinstance(node.left, Num) and _is_variable(node.right):  # Back to a single group
+        group = (yield _from_tree(node.right))[0]
+        group.number = Number.from_data(node.left.value, is_negative=_is_signed(node.left.value))
+        return [group]
+    left, right = (yield _from_tree(node.left)), (yield _from_tree(node.right))
+    if node.operator == "+":  # The order of the additions is kept with a ParenthesizedGroup
+        return left + [Operator.Add] + (_wrap(right) if isinstance(node.right, BinOp) and node.right.operator == "+" else right)
+    if isinstance(node.left, BinOp) and node.left.operator == "+":
+        left = _wrap(left)
+    if isinstance(node.right, BinOp):  # Multiplications and divisions are calculated from left to right
+        right = _wrap(right)
+    return left + [Operator.Mul if node.operator == "*" else Operator.Div] + right
+
+
+def from_tree(tree: Node | Equation) -> Maybe_RO:
+    """Converts a tree back to a cleaned list of groups, which can be given to the solver. The groups are equivalent to
+    the ones the tree was created from, but not always identical (for example `2 * x` becomes `2x`)."""
+    if not isinstance(tree, Equation):
+        return trampoline(_from_tree(tree))
+    groups: Maybe_RO = trampoline(_from_tree(tree.sides[0]))
+    for relation, side in zip(tree.relations, tree.sides[1:]):
+        groups += [relation] + trampoline(_from_tree(side))
+    return groups
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import decimal
 
+from collections.abc import Generator
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from fractions import Fraction as Rational
+from typing import Any, TYPE_CHECKING, TypeVar
 
-from .objects import Number, Group, Variable, Operator, ParenthesizedGroup, RelationalOperator, Fraction
+from .objects import Number, Group, Variable, Operator, ParenthesizedGroup, RelationalOperator, Fraction, Value
 
 if TYPE_CHECKING:
     from numsy.solver.datatype import Maybe_RO
@@ -14,39 +16,27 @@ if TYPE_CHECKING:
 
 VALID_OBJECTS = (Group, Operator, ParenthesizedGroup, RelationalOperator, Fraction)
 
+T = TypeVar("T")
 
-def verify_parentheses(s: str) -> bool:
-    if len(s) % 2 != 0:  # len() is O(1), so, it is faster on large strings
-        return False
-    match = {
-        "]": "[",
-        "}": "{",
-        ")": "(",
-    }
-    expecting = []
-    for char in s:
-        if char in match.values():
-            expecting.append(char)
-        elif char in match:
-            try:
-                if expecting.pop() != match[char]:
-                    return False
-            except IndexError:
-                return False
-    return not expecting
-
-
-def match_parentheses(string: str) -> list[tuple[int, int]]:
-    stack: list[int] = []
-    parentheses_locs: dict[int, int] = {}
-    for index, character in enumerate(string):
-        if character == '(':
-            stack.append(index)
-        elif character == ')':
-            parentheses_locs[stack.pop()] = index
-            if not stack:
-                return list(sorted([(k, v) for k, v in parentheses_locs.items()], key=lambda e: e[0]))
-    return list(sorted([(k, v) for k, v in parentheses_locs.items()], key=lambda e: e[0]))
+# Exact values with more bits are shown as a Decimal approximation, Python refuses to convert an integer of more than
+# 4300 digits (about 14000 bits) to a string
+_MAX_EXACT_BITS = 12000
+
+
+def trampoline(generator: Generator[Any, Any, T]) -> T:
+    # Runs a recursive generator function with an explicit stack instead of the Python call stack, so deeply nested
+    # equations don't reach the recursion limit. A generator "calls" another generator by yielding it, and receives
+    # the returned value as the result of that `yield` expression.
+    stack: list[Generator[Any, Any, Any]] = [generator]
+    value = None
+    while stack:
+        try:
+            stack.append(stack[-1].send(value))
+            value = None
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+    return value  # type: ignore
 
 
 tab = "\t"
@@ -92,14 +82,18 @@ def prettify_output(__object: Maybe_RO, indent: int = 0, base: bool = True):
     return string
 
 
-def groups_to_string(groups: Maybe_RO | Result | NoSolution):
-    string = ""
+def groups_to_string(groups: Maybe_RO | Result | NoSolution | Value):
     if isinstance(groups, VALID_OBJECTS):
         return groups_to_string([groups])
-    if isinstance(groups, Decimal):
+    if isinstance(groups, (Decimal, Rational, float)):
         return str(truncate_trailing_zero(groups))
     if not isinstance(groups, list):  # NoSolution or Result instances
         return str(groups)
+    return trampoline(_groups_to_string(groups))
+
+
+def _groups_to_string(groups: Maybe_RO) -> Generator[Any, str, str]:
+    string = ""
     for index, group in enumerate(groups):
         if isinstance(group, Group):
             neg = " - " if group.number.is_negative else ""
@@ -114,7 +108,7 @@ def groups_to_string(groups: Maybe_RO | Result | NoSolution):
             val = "" if val == Decimal("1") and var else val
             _pow = ""
             if group.power and not (isinstance((p := group.power[0]), Group) and p.number.integer == 1):
-                _pow = groups_to_string(group.power) if group.power else ""
+                _pow = yield _groups_to_string(group.power)
             _pow = f"^({_pow})" if len(group.power) > 1 else f"^{_pow}" if _pow else ""
             string += f"{neg}{val}{var}{_pow}"
 
@@ -126,14 +120,16 @@ def groups_to_string(groups: Maybe_RO | Result | NoSolution):
             string += f" {group.symbol} "
 
         elif isinstance(group, ParenthesizedGroup):
-            inside = groups_to_string(group.groups)  # Inside ParenthesizedGroup shouldn't be empty
-            _pow = groups_to_string(group.power) if group.power else ""
+            inside = yield _groups_to_string(group.groups)  # Inside ParenthesizedGroup shouldn't be empty
+            _pow = (yield _groups_to_string(group.power)) if group.power else ""
             _pow = f"^({_pow})" if len(group.power) > 1 else f"^{_pow}" if _pow else ""
             neg = "-" if group.is_negative else ""
             string += f"{neg}({inside}){_pow}"
 
         elif isinstance(group, Fraction):
-            string += f"{groups_to_string(group.numerator)}/{groups_to_string(group.denominator)}"
+            numerator = yield _groups_to_string(group.numerator)
+            denominator = yield _groups_to_string(group.denominator)
+            string += f"{numerator}/{denominator}"
 
     return string.strip()
 
@@ -141,7 +137,56 @@ def groups_to_string(groups: Maybe_RO | Result | NoSolution):
 gts = groups_to_string
 
 
-def truncate_trailing_zero(number: Decimal) -> Decimal:
+def copy_equation(groups: Maybe_RO) -> Maybe_RO:
+    # Deep copy of an equation, operators and variables are immutable so they're shared with the original
+    return trampoline(_copy_equation(groups))
+
+
+def _copy_equation(groups: Maybe_RO) -> Generator[Any, Maybe_RO, Maybe_RO]:
+    new: Maybe_RO = []
+    for group in groups:
+        if isinstance(group, Group):
+            copied = group.copy()
+            copied.power = yield _copy_equation(group.power)
+            group = copied
+        elif isinstance(group, ParenthesizedGroup):
+            copied = ParenthesizedGroup((yield _copy_equation(group.groups)), (yield _copy_equation(group.power)))
+            copied.is_negative = group.is_negative
+            group = copied
+        elif isinstance(group, Fraction):
+            group = Fraction((yield _copy_equation(group.numerator)), (yield _copy_equation(group.denominator)))
+        new.append(group)
+    return new
+
+
+def convert_numbers(groups: Maybe_RO) -> Maybe_RO:
+    # Copy of the equation with the value of every number converted to the type of the current `numeric_backend`, the
+    # original isn't modified. Operators and variables are shared like `copy_equation` does.
+    return trampoline(_convert_numbers(groups))
+
+
+def _convert_numbers(groups: Maybe_RO) -> Generator[Any, Maybe_RO, Maybe_RO]:
+    new: Maybe_RO = []
+    for group in groups:
+        if isinstance(group, Group):
+            converted = group.copy()  # With a copy of its number, which is converted in place
+            number = converted.number
+            number.from_data(number.value, is_negative=number.is_negative, self=number)
+            converted.power = yield _convert_numbers(group.power)
+            group = converted
+        elif isinstance(group, ParenthesizedGroup):
+            parenthesized = ParenthesizedGroup((yield _convert_numbers(group.groups)), (yield _convert_numbers(group.power)))
+            parenthesized.is_negative = group.is_negative
+            group = parenthesized
+        elif isinstance(group, Fraction):
+            group = Fraction((yield _convert_numbers(group.numerator)), (yield _convert_numbers(group.denominator)))
+        new.append(group)
+    return new
+
+
+def truncate_trailing_zero(number: Value) -> Value:
+    if isinstance(number, Rational) and max(number.numerator.bit_length(), number.denominator.bit_length()) > _MAX_EXACT_BITS:
+        number = Decimal(number.numerator) / number.denominator
     try:
         if "." not in (string := str(number)):
             return number
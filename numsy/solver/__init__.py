@@ -1,28 +1,74 @@
-from numsy.parser import parse_group
-from numsy.solver.core import Result
-from numsy.parser import gts
+from typing import cast
 
-from .utility import determine_equation_type, clean_equation
+from numsy.solver.core import Result, numeric_context
+from numsy.parser import gts, convert_numbers
+
+from .utility import determine_equation_type, clean_equation, fold_constants, step_budget
 from .datatype import CompleteEquation
 from .logging import set_log_equation, setup_log, _log
 from .matrices import *
+from .compiler import compile, CompiledExpression
 from .errors import *
+from .cache import ParseCache, parse_cache
+from .calculator import calculate
+from .batch import evaluate_many, Undefined
+from .preflight import preflight, estimate_cost, cost_budget, Cost
+from .memo import memoize, MemoInfo, SubexpressionMemo
+from .roots import root_finding, RootOptions
+from .system import solve_system
+
+def solve(equation: CompleteEquation | str | list[CompleteEquation | str], backend: str = "decimal", precision: int | None = None, rounding: str | None = None) -> Result:
+    """Solves the equation. The numbers are calculated with the `backend` ("decimal", "exact" for `fractions.Fraction`
+    or "float"), and the values of the result have its type (`Result.to_decimal` converts them). `precision` and
+    `rounding` only apply to this call, see `numeric_context`. Raises `ExpressionTooComplex` without solving anything
+    if the estimated cost of the equation is over the budget, see `cost_budget`. `Result.memo` counts the identical
+    subexpressions which were reused instead of being calculated again. A parsed equation is never modified, the solver
+    only copies the parts it changes.
 
-def solve(equation: CompleteEquation | str) -> Result:
+    A system of linear equations is given as a list of equations, or as a string with the equations separated by ";"
+    (like `"x + y = 3; x - y = 1"`). The result has every variable, see `solve_system`."""
+    if isinstance(equation, str) and ";" in equation or isinstance(equation, list) and equation and isinstance(equation[0], (str, list)):
+        return _solve_system(cast("list[CompleteEquation | str] | str", equation), backend, precision, rounding)
     log_equation = gts(equation) if isinstance(equation, list) else equation
     set_log_equation(log_equation)
     _log.info("Solving equation '%s'", log_equation)
-    if isinstance(equation, str):
-        equation = parse_group(equation)
-        _log.info("Finished parsing equation, got '%s'", gts(equation))
-    equation = equation.copy()  # Copy so original equation (if it's CompleteEquation) doesn't change
-    equation = clean_equation(equation)
-    result = determine_equation_type(equation, base=True)
+    with numeric_context(backend, precision, rounding):
+        if isinstance(equation, str):
+            if (value := calculate(equation)) is not None:  # Calculator-style expressions don't need to be parsed
+                _log.info("Identified as [BASIC PEMDAS], calculated directly, got '%s' as the answer!\n", gts(value))
+                return Result(value)
+            equation = parse_cache.parse(equation, copy=False)  # Shared with the cache, the solver doesn't modify it
+            _log.info("Finished parsing equation, got '%s'", gts(equation))
+        else:  # None of the steps modify the equation of the caller, the unchanged parts are shared with it
+            equation = clean_equation(equation)
+        preflight(equation)
+        equation = fold_constants(equation)  # Before the numbers are converted, only the exact results are kept
+        if backend != "decimal":  # The parser always reads Decimal values
+            equation = convert_numbers(equation)
+        with memoize() as memo:  # Identical subexpressions are calculated once per solve
+            result = determine_equation_type(equation, base=True)
+        result.memo = memo.info()
     _log.info("Equation solved, got '%s' as the answer!\n", gts(result))
 
     return result
 
 
+def _solve_system(equations: list[CompleteEquation | str] | str, backend: str, precision: int | None, rounding: str | None) -> Result:
+    if isinstance(equations, str):
+        equations = [equation.strip() for equation in equations.split(";") if equation.strip()]
+    log_equation = "; ".join(equation if isinstance(equation, str) else gts(equation) for equation in equations)
+    set_log_equation(log_equation)
+    _log.info("Solving system '%s'", log_equation)
+    with numeric_context(backend, precision, rounding):
+        # Parsed like a single equation, the lowering reads the numbers exactly so they aren't converted
+        parsed = [parse_cache.parse(equation, copy=False) if isinstance(equation, str) else clean_equation(equation) for equation in equations]
+        for equation in parsed:
+            preflight(equation)
+        result = solve_system(parsed)
+    _log.info("System solved, got '%s' as the answer!\n", gts(result))
+    return result
+
+
 # Setup logging
 setup_log()
 set_log_equation("N/A")
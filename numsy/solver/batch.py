@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import importlib
+import math
+import operator
+
+from collections.abc import Generator, Iterable
+from itertools import repeat
+from typing import Any, TypeAlias
+
+from numsy.parser import parse_tree, trampoline, Num, Var, Pow, UnaryOp, BinOp, Equation, Node
+
+try:  # Optional, the columns are calculated with plain Python lists without it (so it isn't imported statically)
+    numpy: Any = importlib.import_module("numpy")
+except ImportError:
+    numpy = None
+
+
+class Undefined:
+    """Marks an element whose value is undefined, because of a division by zero (or a power without a real result, or
+    `0 ** 0`). The solver raises for these instead."""
+
+    def __eq__(self, other):
+        return isinstance(other, Undefined)
+
+    def __hash__(self):
+        return 3
+
+    def __repr__(self):
+        return "Undefined"
+
+
+UNDEFINED = Undefined()
+
+# A column of values, a single value is shared by every element (constant parts of the expression aren't expanded)
+Column: TypeAlias = "list[float | Undefined] | float | Undefined"
+
+
+def _divide(a, b):
+    if a is UNDEFINED or b is UNDEFINED or b == 0:
+        return UNDEFINED
+    return a / b
+
+
+def _fast_power(a, b):
+    if not a and not b:  # `math.pow` gives 1
+        raise ValueError("0 ** 0 is undefined.")
+    return math.pow(a, b)
+
+
+def _power(a, b):
+    if a is UNDEFINED or b is UNDEFINED or not a and not b:
+        return UNDEFINED
+    try:
+        return math.pow(a, b)
+    except ValueError:  # 0 ** -1 or (-8) ** 0.5
+        return UNDEFINED
+    except OverflowError:  # Too large, like a float multiplication which overflows
+        return -math.inf if a < 0 and b % 2 == 1 else math.inf
+
+
+def _safe(function):
+    # The same operation for elements which may be undefined
+    return lambda *values: UNDEFINED if UNDEFINED in values else function(*values)
+
+
+# Every operation has a fast version for a whole column, it raises on the first undefined element and the column is
+# then calculated again element by element with the safe version
+OPERATIONS = {
+    "+": (operator.add, _safe(operator.add)),
+    "*": (operator.mul, _safe(operator.mul)),
+    "/": (operator.truediv, _divide),
+    "^": (_fast_power, _power),
+    "neg": (operator.neg, _safe(operator.neg)),
+}
+
+
+def _apply(symbol: str, *operands: Column) -> Column:
+    fast, safe = OPERATIONS[symbol]
+    if not any(isinstance(operand, list) for operand in operands):
+        return safe(*operands)
+    columns = [operand if isinstance(operand, list) else repeat(operand) for operand in operands]
+    try:
+        return list(map(fast, *columns))
+    except (ArithmeticError, ValueError, TypeError):
+        columns = [operand if isinstance(operand, list) else repeat(operand) for operand in operands]
+        return list(map(safe, *columns))
+
+
+def _evaluate(node: Node, columns: dict[str, list[float | Undefined]]) -> Generator[Any, Column, Column]:
+    if isinstance(node, Num):
+        return float(node.value)
+    if isinstance(node, Var):
+        return columns[node.name]
+    if isinstance(node, Pow):
+        return _apply("^", (yield _evaluate(node.base, columns)), (yield _evaluate(node.exponent, columns)))
+    if isinstance(node, UnaryOp):
+        return _apply("neg", (yield _evaluate(node.operand, columns)))
+    return _apply(node.operator, (yield _evaluate(node.left, columns)), (yield _evaluate(node.right, columns)))
+
+
+def _evaluate_numpy(node: Node, columns: dict[str, Any], undefined: Any) -> Generator[Any, Any, Any]:
+    # Same as `_evaluate` with NumPy arrays, the undefined elements are collected in the `undefined` mask
+    if isinstance(node, Num):
+        return numpy.float64(node.value)  # Not a Python float, so a constant division by zero doesn't raise
+    if isinstance(node, Var):
+        return columns[node.name]
+    if isinstance(node, UnaryOp):
+        return -(yield _evaluate_numpy(node.operand, columns, undefined))
+    left = yield _evaluate_numpy(node.base if isinstance(node, Pow) else node.left, columns, undefined)
+    right = yield _evaluate_numpy(node.exponent if isinstance(node, Pow) else node.right, columns, undefined)
+    if isinstance(node, Pow):
+        result = numpy.power(left, right)
+        undefined |= numpy.isnan(result) & ~numpy.isnan(left) & ~numpy.isnan(right)
+        undefined |= (left == 0) & (right <= 0)
+        return result
+    if node.operator == "/":
+        undefined |= right == 0
+        return left / right
+    return left + right if node.operator == "+" else left * right
+
+
+def evaluate_many(expression: str, **variables: Iterable[float]) -> list[float | Undefined]:
+    """Evaluates an expression for every element of the given columns of variable values, for example
+    `evaluate_many("3x^2 + 2x", x=[1, 2, 3])`. Every column must have the same length.
+
+    The values are calculated as floats, column by column (with NumPy when it's installed), instead of solving the
+    expression once per element. The results are in the same order as the values, an element which can't be calculated
+    (division by zero, `0^0`) is `Undefined`, where the solver raises.
+    """
+    tree = parse_tree(expression)
+    if isinstance(tree, Equation):
+        raise TypeError("Relational operators cannot be evaluated, only expressions are supported.")
+    names = _collect_variables(tree)
+    if missing := names - variables.keys():
+        raise TypeError(f"Missing values for variables {', '.join(sorted(missing))}.")
+    columns: dict[str, Any]  # NumPy arrays or lists of floats
+    if numpy is not None:
+        columns = {name: numpy.asarray(values, dtype=float) for name, values in variables.items()}
+    else:
+        columns = {name: [float(value) for value in values] for name, values in variables.items()}
+    if len(lengths := {len(column) for column in columns.values()}) > 1:
+        raise ValueError("Every column of values should have the same length.")
+    length = lengths.pop() if lengths else 1
+
+    if numpy is None:
+        result = trampoline(_evaluate(tree, columns))
+        return result if isinstance(result, list) else [result] * length
+    undefined = numpy.zeros(length, dtype=bool)
+    with numpy.errstate(all="ignore"):
+        result = trampoline(_evaluate_numpy(tree, columns, undefined))
+    values = numpy.broadcast_to(result, length).tolist()
+    for index in numpy.flatnonzero(undefined).tolist():
+        values[index] = UNDEFINED
+    return values
+
+
+def _collect_variables(tree: Node) -> set[str]:
+    names, stack = set(), [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Var):
+            names.add(node.name)
+        elif isinstance(node, Pow):
+            stack += (node.base, node.exponent)
+        elif isinstance(node, UnaryOp):
+            stack.append(node.operand)
+        elif isinstance(node, BinOp):
+            stack += (node.left, node.right)
+    return names
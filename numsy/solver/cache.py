@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple, cast
+
+from numsy.parser import parse_group, copy_equation
+
+from .datatype import CompleteEquation
+from .utility import clean_equation
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+def normalize_equation(equation: str) -> str:
+    # Spaces are ignored by the parser, except between the two characters of a relational operator like "> ="
+    parts = equation.split()
+    key = parts[0] if parts else ""
+    for part in parts[1:]:
+        key += " " + part if key[-1] in "<>=!" and part[0] == "=" else part
+    return key
+
+
+class ParseCache:
+    """A size-bounded LRU cache of parsed and cleaned equations, keyed by the normalized equation string.
+
+    The cache is disabled while `maxsize` is 0. Every lookup returns a private copy of the cached equation, unless
+    `copy` is disabled (the solver does that, it never modifies the equation it's given).
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self._entries: OrderedDict[str, CompleteEquation] = OrderedDict()
+        self._lock = Lock()
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def parse(self, equation: str, copy: bool = True) -> CompleteEquation:
+        if not self.enabled:
+            return clean_equation(parse_group(equation))
+        key = normalize_equation(equation)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cast(CompleteEquation, copy_equation(cached)) if copy else cached
+            self.misses += 1
+        cached = clean_equation(parse_group(equation))  # Parse outside the lock, it's the expensive part
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            self._evict()
+        return cast(CompleteEquation, copy_equation(cached)) if copy else cached
+
+    def resize(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("Cache size cannot be negative.")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"<ParseCache hits={self.hits} misses={self.misses} evictions={self.evictions} size={len(self)}/{self.maxsize}>"
+
+
+# Opt-in, enable it with `parse_cache.resize(n)`
+parse_cache = ParseCache()
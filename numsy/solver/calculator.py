@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import re
+
+from decimal import Decimal
+
+from numsy.parser import Value
+from numsy.parser.objects import _copy_negate, _to_value
+
+from .preflight import (_budget, magnitude, power_magnitude, power_steps, operation_work, operation_digits, sign,
+                        value_digits)
+from .solve_basic import calculate_power
+
+# One token of a calculator-style expression: a number (optionally in scientific notation) or an operator.
+# Digits are matched with [0-9], the parser only treats ASCII characters as operators and digits.
+TOKEN = re.compile(r" *(?:([0-9]+\.?[0-9]*|\.[0-9]+)(?: *E *([+-]?) *([0-9][0-9.]*))?|([-+*/^()]))")
+CALCULATOR_CHARACTERS = frozenset("0123456789.+-*/^()E ")
+
+# Precedence of the operators on the operator stack, the unary negation binds looser than "^" like `solve_basic`
+# keeps the sign of a group outside its power (-2^2 = -4)
+PRECEDENCE = {"+": 1, "*": 2, "/": 2, "neg": 3, "^": 4}
+
+# Kinds of the last consumed token, used to reject inputs which the parser reads in an unusual way
+OPERATOR, NUMBER, SCIENTIFIC, PARENTHESES, POWER_PARENTHESES = range(5)
+
+# A ParenthesizedGroup, the parentheses of a power ("2^(1 + 1)") and a ParenthesizedGroup inside a power ("2^-(1 + 1)")
+OPENING = ("(", "^(", "p(")
+ZERO = Decimal("0.0")
+
+
+class _Unsupported(Exception):
+    # The expression is valid for the parser, but it isn't handled by the calculator, use the full solver instead
+    ...
+
+
+class _Work:
+    # The work budget left for the calculation, counted like `estimate_cost` but with the calculated values. The full
+    # solver rejects the expressions which are over it, before calculating anything.
+    __slots__ = ("remaining", "digits")
+
+    def __init__(self):
+        self.remaining, self.digits = _budget.get().work, operation_digits()
+
+    def spend(self, size: float, steps: float = 1):
+        self.remaining -= operation_work(size, steps, self.digits)
+        if self.remaining < 0:
+            raise _Unsupported
+
+
+def _apply(operator: str, values: list[tuple[Value, bool]], work: _Work):
+    # Every value is stored with whether it comes from a ParenthesizedGroup, because `solve_basic` negates those with
+    # `-result` while a negative number only has its sign flipped (the difference shows in the sign of zero)
+    if operator == "neg":
+        value, is_parenthesized = values.pop()
+        values.append((-value if is_parenthesized else _copy_negate(value), False))
+        return
+    second, _ = values.pop()
+    first, is_parenthesized = values.pop()
+    if operator == "+":
+        values.append((result := first + second, False))  # type: ignore
+    elif operator == "*":
+        values.append((result := first * second, False))  # type: ignore
+    elif operator == "/":
+        values.append((result := first / second, False))  # type: ignore
+    else:  # The base is never signed here, its sign is a pending "neg" with a lower precedence
+        base, exponent = magnitude(first), magnitude(second)
+        if value_digits(size := power_magnitude(base, exponent, sign(second))) > _budget.get().magnitude:
+            raise _Unsupported  # Too large, the full solver rejects it before calculating anything
+        work.spend(size, power_steps(base, exponent))
+        result = calculate_power(first, second)
+        if isinstance(result, Decimal) and not result.is_finite():  # 0^-1, the parser fails on it with an OverflowError
+            raise _Unsupported
+        values.append((result, is_parenthesized))
+        return
+    work.spend(magnitude(result) if work.digits is None else 0)  # Only the exact values grow
+
+
+def _push_operator(operator: str, operators: list[str], values: list[tuple[Value, bool]], work: _Work):
+    precedence = PRECEDENCE[operator]
+    while operators and operators[-1] not in OPENING:
+        top = PRECEDENCE[operators[-1]]
+        if top < precedence or (top == precedence and operator == "^"):  # "^" is right-associative
+            break
+        _apply(operators.pop(), values, work)
+    operators.append(operator)
+
+
+def _calculate(string: str) -> Value:
+    operators: list[str] = []
+    values: list[tuple[Value, bool]] = []
+    work = _Work()
+    # `term` is the kind of the last group outside of powers on the current parentheses level, `terms` keeps the one of
+    # every outer level. `subtracted` is the `term` before a subtraction, until its right operand is read.
+    terms: list[int | None] = []
+    term = subtracted = None
+    last, negative, signed, after_power, literal, index, length = OPERATOR, False, False, False, True, 0, len(string)
+    while index < length:
+        if (match := TOKEN.match(string, index)) is None:
+            raise _Unsupported
+        index = match.end()
+        number, sign, exponent, symbol = match.groups()
+        expecting_operand = last == OPERATOR
+        literal = literal and expecting_operand and (number is not None or symbol == "-")  # Only signs and one number
+
+        if number is not None:
+            if not expecting_operand:  # The parser joins "2 3" into 23, or adds it to a ParenthesizedGroup before it
+                raise _Unsupported
+            if negative:
+                operators.append("neg")
+            if exponent is None:
+                values.append((_to_value(number), False))
+                last = NUMBER
+            else:  # "nEm" is calculated like the parser's "(n * 10^m)"
+                # The parser multiplies "2 - 5E3" instead of subtracting, because the ParenthesizedGroup of "5E3"
+                # isn't negative (its mantissa is)
+                if after_power or subtracted == NUMBER:
+                    raise _Unsupported
+                if isinstance(value := _to_value(number), Decimal):
+                    values.append((+value * Decimal(10) ** +Decimal(sign + exponent), False))
+                else:
+                    values.append((value * calculate_power(_to_value(10), _to_value(sign + exponent)), False))  # type: ignore
+                last = SCIENTIFIC
+            if not after_power:
+                term = last
+            negative = signed = after_power = False
+            subtracted = None
+
+        elif expecting_operand:
+            if symbol == "-":  # Sign of the next group, '--' cancels out
+                negative, signed = not negative, True
+            elif symbol == "(":
+                if subtracted == NUMBER and not negative:  # Like "2 - 5E3", "2 --(3)" is a multiplication for the parser
+                    raise _Unsupported
+                if negative:
+                    operators.append("neg")
+                # A parenthesis right after "^" is the power itself, not a ParenthesizedGroup
+                operators.append(("^(" if not signed else "p(") if after_power else "(")
+                terms.append(term)
+                term = subtracted = None
+                negative = signed = after_power = False
+            else:
+                raise _Unsupported
+
+        elif symbol == ")":
+            while operators and operators[-1] not in OPENING:
+                _apply(operators.pop(), values, work)
+            if not operators or last == OPERATOR:  # Unmatched or empty parentheses
+                raise _Unsupported
+            opening, term = operators.pop(), terms.pop()
+            last = POWER_PARENTHESES if opening == "^(" else PARENTHESES
+            if opening == "(":
+                term = PARENTHESES
+            value, _ = values.pop()
+            values.append((value, last == PARENTHESES))
+
+        elif symbol == "^":
+            if last == POWER_PARENTHESES or last == SCIENTIFIC and operators and operators[-1] == "neg":
+                raise _Unsupported  # Read differently by the parser, "-4E2^2" is "(-4 * 10^2)^2" there
+            _push_operator("^", operators, values, work)
+            last, after_power = OPERATOR, True
+
+        elif symbol == "(":  # Implicit multiplication, for example 2(1 + 2)
+            _push_operator("*", operators, values, work)
+            operators.append("(")
+            terms.append(term)
+            last, term = OPERATOR, None
+
+        else:
+            # Subtraction is an addition of a negative group, like the parser does it
+            _push_operator("+" if symbol == "-" else symbol, operators, values, work)
+            last, negative = OPERATOR, symbol == "-"
+            subtracted = term if negative else None
+
+    if last == OPERATOR:  # Empty expression or a trailing operator
+        raise _Unsupported
+    while operators:
+        if (operator := operators.pop()) in OPENING:
+            raise _Unsupported
+        _apply(operator, values, work)
+    value = values[0][0]
+    if not value and not literal and isinstance(value, Decimal):  # A calculated zero is stored by `create_new_group` as 0.0 (or -0.0)
+        return ZERO.copy_sign(value)
+    return value
+
+
+def calculate(equation: str) -> Value | None:
+    """Calculates a numeric expression directly from the string, without building any `Group`. The values have the type
+    of the current `numeric_backend`.
+
+    Returns `None` if the expression contains something else than numbers, parentheses and arithmetic operators, or
+    is written in a way the calculator doesn't handle. Those expressions (and the ones raising an arithmetic error)
+    should go through the full solver, which produces the same answers and errors.
+    """
+    if not CALCULATOR_CHARACTERS.issuperset(equation):
+        return None
+    try:
+        return _calculate(equation.rstrip(" "))
+    except (_Unsupported, ArithmeticError, ValueError):
+        return None
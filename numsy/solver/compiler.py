@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Callable, TypeAlias, cast
+
+from numsy.parser import parse_group, Group, Operator, ParenthesizedGroup, RelationalOperator, Fraction, Value
+
+from .core import _normalize
+from .datatype import No_RO
+from .solve_basic import solve_basic, calculate_power
+from .utility import clean_equation
+
+Environment: TypeAlias = dict[str, Decimal]
+Evaluator: TypeAlias = Callable[[Environment], Value]
+
+
+def _constant(value: Value) -> Evaluator:
+    return lambda _: value
+
+
+def _contains_variable(group: Group | ParenthesizedGroup) -> bool:
+    return group.contains_variable or group.power_contains_variable
+
+
+def _power(base: Value, exponent: Value) -> Value:
+    # Like `solve_basic`, rounded the same way, and 0^-1 fails instead of giving an infinite value
+    result = calculate_power(base, exponent)
+    if isinstance(result, Decimal) and not result.is_finite():
+        raise OverflowError(f"Cannot calculate the expression, got {result}.")
+    return result
+
+
+def _lower_power(power: No_RO) -> Evaluator | Value | None:
+    # Constant powers are calculated once here, so they cost nothing on evaluation
+    if not power:
+        return None
+    if any(_contains_variable(g) for g in power if isinstance(g, (Group, ParenthesizedGroup))):
+        return _lower(power)
+    return solve_basic(power)
+
+
+def _lower_group(group: Group | ParenthesizedGroup) -> Evaluator:
+    if not _contains_variable(group):
+        return _constant(solve_basic([group]))
+    power = _lower_power(group.power)
+    if isinstance(group, ParenthesizedGroup):
+        inside, negative = _lower(group.groups), group.is_negative
+        if power is None:
+            return (lambda env: -inside(env)) if negative else inside
+        if not callable(power):
+            return (lambda env: -_power(inside(env), power)) if negative else (lambda env: _power(inside(env), power))
+        return (lambda env: -_power(inside(env), power(env))) if negative else (lambda env: _power(inside(env), power(env)))
+
+    coefficient = group.get_value()
+    if group.variable is None:  # Only the power contains a variable, the sign stays outside the power like `solve_basic`
+        op, base, exponent = (-1 if group.number.is_negative else 1), abs(coefficient), cast(Evaluator, power)
+        return lambda env: op * _power(base, exponent(env))
+    name = group.variable.name
+    if power is None:
+        return lambda env: coefficient * env[name]  # type: ignore
+    if not callable(power):
+        return lambda env: coefficient * _power(env[name], power)  # type: ignore
+    return lambda env: coefficient * _power(env[name], power(env))  # type: ignore
+
+
+def _lower_term(factors: list[Evaluator], operators: list[Operator]) -> Evaluator:
+    first, rest = factors[0], list(zip(operators, factors[1:]))
+    if not rest:
+        return first
+
+    def term(env: Environment) -> Value:
+        value = first(env)
+        for operator, factor in rest:  # Multiplications and divisions are calculated from left to right
+            value = value * factor(env) if operator is Operator.Mul else value / factor(env)  # type: ignore
+        return value
+    return term
+
+
+def _lower(groups: No_RO) -> Evaluator:
+    flat: No_RO = []
+    for group in groups:  # Fractions are calculated as a plain division, the same way `solve_basic` does it
+        flat += group.numerator + [Operator.Div] + group.denominator if isinstance(group, Fraction) else [group]
+
+    terms: list[Evaluator] = []
+    factors: list[Evaluator] = []
+    operators: list[Operator] = []
+    for group in flat:
+        if isinstance(group, RelationalOperator):
+            raise TypeError("Relational operators cannot be compiled, only expressions are supported.")
+        if isinstance(group, Operator):
+            if group == Operator.Add:
+                terms.append(_lower_term(factors, operators))
+                factors, operators = [], []
+            else:
+                operators.append(Operator.Mul if group == Operator.Mul else Operator.Div)
+            continue
+        factors.append(_lower_group(cast(Group | ParenthesizedGroup, group)))  # The fractions were flattened above
+    if not factors:
+        raise ValueError("Cannot compile an empty expression.")
+    terms.append(_lower_term(factors, operators))
+
+    first, rest = terms[0], terms[1:]
+    if not rest:
+        return first
+
+    def expression(env: Environment) -> Value:
+        value = first(env)
+        for term in rest:
+            value = value + term(env)  # type: ignore
+        return value
+    return expression
+
+
+def _collect_variables(groups: No_RO, found: set[str]) -> set[str]:
+    for group in groups:
+        if isinstance(group, Fraction):
+            _collect_variables(group.numerator + group.denominator, found)
+        elif isinstance(group, (Group, ParenthesizedGroup)):
+            if isinstance(group, Group) and group.variable is not None:
+                found.add(group.variable.name)
+            elif isinstance(group, ParenthesizedGroup):
+                _collect_variables(group.groups, found)
+            _collect_variables(group.power, found)
+    return found
+
+
+class CompiledExpression:
+    """An expression which is parsed once and can be evaluated many times with different variable values.
+
+    The result of `evaluate` is the same as solving the expression with `solver.solve` after substituting every
+    variable with its value, but without parsing and simplifying the expression again.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        groups = cast(No_RO, clean_equation(parse_group(expression)))
+        self.variables: tuple[str, ...] = tuple(sorted(_collect_variables(groups, set())))
+        self._evaluator = _lower(groups)
+
+    def evaluate(self, **variables: Decimal | int | float | str) -> Value:
+        env: Environment = {}
+        for name in self.variables:
+            try:
+                value = variables[name]
+            except KeyError:
+                raise TypeError(f"Missing value for variable '{name}'.") from None
+            env[name] = value if isinstance(value, Decimal) else Decimal(value if isinstance(value, (int, str)) else str(value))
+        return _normalize(self._evaluator(env))
+
+    __call__ = evaluate
+
+    def __repr__(self):
+        return f"<CompiledExpression expression='{self.expression}' variables={self.variables}>"
+
+
+def compile(expression: str) -> CompiledExpression:
+    return CompiledExpression(expression)
@@ -1,24 +1,31 @@
 from __future__ import annotations
 
-from decimal import Decimal
-from typing import Mapping, TYPE_CHECKING, TypeAlias, cast
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, localcontext
+from fractions import Fraction as Rational
+from operator import itemgetter
+from typing import Any, Mapping, TYPE_CHECKING, TypeAlias, cast
 
 from numsy.parser import Group, Operator, ParenthesizedGroup, RelationalOperator, Number, Variable, Fraction
-from numsy.parser import truncate_trailing_zero
+from numsy.parser import truncate_trailing_zero, numeric_backend
 
 
 if TYPE_CHECKING:
-    from .datatype import Maybe_RO, No_RO, Tuple_NO_RO
+    from .datatype import CompleteEquation, Maybe_RO, No_RO, Tuple_NO_RO
+    from .memo import MemoInfo
 
     RETURN: TypeAlias = tuple[
         list[int],  # ParenthesizedGroup Locations
         dict[Operator, list[int]],  # Operator Locations
         list[int],  # Power-existing Group/ParenthesizedGroup locations
-        dict[Fraction, int],  # Fraction locations
+        list[tuple[Fraction, int]],  # Fraction locations
         list[tuple[RelationalOperator, int]],  # Relational operator locations
         dict[Group, list[int]]  # Unique Variable group locations
     ]
-    VAR_VALUE: TypeAlias = Decimal | Fraction | Tuple_NO_RO | "NoSolution" | "TrueForAll" | "Range"
+    VAR_VALUE: TypeAlias = Decimal | Rational | float | complex | Fraction | Tuple_NO_RO | "NoSolution" | "TrueForAll" | "Range"
 
 
 class NoSolution:
@@ -65,14 +72,21 @@ class Range:
 
 
 class Positions:
+    """The indexes of every kind of group in a list of groups, by category. The changes of the list should go through
+    `insert`, `delete` and `replace`, which keep the indexes up to date (the ones after the change are shifted) instead
+    of scanning the whole list again. `update_data` scans a new list."""
+
     def __init__(self, parsed_groups: Maybe_RO):
         self.groups = parsed_groups
         self.parent_loc: list[int] = []
         self.operators: dict[Operator, list[int]] = {}
         self.existing_powers: list[int] = []
-        self.fractions: dict[Fraction, int] = {}
+        self.fractions: list[tuple[Fraction, int]] = []
         self.ro_positions: list[tuple[RelationalOperator, int]] = []
         self.variable_groups: dict[Group, list[int]] = {}
+        # Keys of the groups without power and their indexes (the lists of `variable_groups`) by variable, so they're
+        # found without hashing the key
+        self._keys: dict[Variable | None, tuple[Group, list[int]]] = {}
 
         self.update_data(self.groups)
 
@@ -84,6 +98,88 @@ class Positions:
 
     def update_data(self, parsed_groups: No_RO):
         self.parent_loc, self.operators, self.existing_powers, self.fractions, self.ro_positions, self.variable_groups = get_positions(parsed_groups)
+        self._keys = {key.variable: (key, indexes) for key, indexes in self.variable_groups.items() if not key.power}
+
+    def insert(self, index: int, group: Group | Operator | ParenthesizedGroup | Fraction | RelationalOperator):
+        self._shift(index, 1)
+        cast("CompleteEquation[RelationalOperator]", self.groups).insert(index, group)  # Relational operators only go in equations
+        self._add(index, group)
+
+    def delete(self, index: int) -> Group | Operator | ParenthesizedGroup | Fraction | RelationalOperator:
+        if index < 0:
+            index += len(self.groups)
+        group = self.groups.pop(index)
+        self._remove(index, group)
+        self._shift(index + 1, -1)
+        return group
+
+    def delete_many(self, indexes: Iterable[int]):
+        # Deletes several groups at once (by their current indexes), so the other indexes are shifted a single time
+        removed = sorted(set(indexes))
+        for index in removed:
+            self._remove(index, self.groups[index])
+        deleted = set(removed)
+        self.groups[:] = [group for index, group in enumerate(self.groups) if index not in deleted]
+        for kept in (self.parent_loc, self.existing_powers, *self.operators.values(), *self.variable_groups.values()):
+            kept[:] = [index - bisect_left(removed, index) for index in kept]
+        located: list[tuple[Any, int]]  # `self.fractions` or `self.ro_positions`
+        for located in (self.fractions, self.ro_positions):
+            located[:] = [(group, index - bisect_left(removed, index)) for group, index in located]
+
+    def replace(self, index: int, group: Group | Operator | ParenthesizedGroup | Fraction | RelationalOperator):
+        self._remove(index, self.groups[index])
+        cast("CompleteEquation[RelationalOperator]", self.groups)[index] = group
+        self._add(index, group)
+
+    def _shift(self, start: int, offset: int):
+        # Moves the indexes from `start` on by `offset`, every list is sorted so only its end changes
+        for indexes in (self.parent_loc, self.existing_powers, *self.operators.values(), *self.variable_groups.values()):
+            if indexes and indexes[-1] >= start:
+                first = bisect_left(indexes, start)
+                indexes[first:] = [index + offset for index in indexes[first:]]
+        located: list[tuple[Any, int]]  # `self.fractions` or `self.ro_positions`
+        for located in (self.fractions, self.ro_positions):
+            if located and located[-1][1] >= start:
+                first = bisect_left(located, start, key=itemgetter(1))
+                located[first:] = [(group, index + offset) for group, index in located[first:]]
+
+    def _indexes(self, group: Group | Operator | ParenthesizedGroup | Fraction | RelationalOperator) -> list[list[int]]:
+        # The lists of indexes the group belongs to, the ones which don't exist yet are created
+        if isinstance(group, Operator):
+            return [self.operators.setdefault(group, [])]
+        if isinstance(group, ParenthesizedGroup):
+            return [self.parent_loc, self.existing_powers] if group.power else [self.parent_loc]
+        if isinstance(group, Group):
+            if group.power:
+                return [self.existing_powers, self.variable_groups.setdefault(Group.from_data(Number(), group.variable, power=group.power), [])]
+            if (found := self._keys.get(group.variable)) is None:
+                key = Group.from_data(Number(), group.variable)
+                found = self._keys[group.variable] = (key, self.variable_groups.setdefault(key, []))
+            return [found[1]]
+        return []
+
+    def _add(self, index: int, group: Group | Operator | ParenthesizedGroup | Fraction | RelationalOperator):
+        for indexes in self._indexes(group):
+            insort(indexes, index)
+        if isinstance(group, Fraction):
+            insort(self.fractions, (group, index), key=itemgetter(1))
+        elif isinstance(group, RelationalOperator):
+            insort(self.ro_positions, (group, index), key=itemgetter(1))
+
+    def _remove(self, index: int, group: Group | Operator | ParenthesizedGroup | Fraction | RelationalOperator):
+        for indexes in self._indexes(group):
+            del indexes[bisect_left(indexes, index)]
+        if isinstance(group, Fraction):
+            del self.fractions[bisect_left(self.fractions, index, key=itemgetter(1))]
+        elif isinstance(group, RelationalOperator):
+            del self.ro_positions[bisect_left(self.ro_positions, index, key=itemgetter(1))]
+        # Like a new scan, there's no entry for a kind of group which isn't in the list anymore
+        if isinstance(group, Operator) and not self.operators[group]:
+            del self.operators[group]
+        elif isinstance(group, Group) and not group.power and not (found := self._keys[group.variable])[1]:
+            del self.variable_groups[found[0]], self._keys[group.variable]
+        elif isinstance(group, Group) and group.power and not self.variable_groups[key := Group.from_data(Number(), group.variable, power=group.power)]:
+            del self.variable_groups[key]
 
     @property
     def rhs(self) -> No_RO:  # Assuming has only 1 RO
@@ -98,38 +194,68 @@ def get_positions(parsed_group: Maybe_RO) -> RETURN:  # Increases performance a
     operator_positions = {}
     parenthesized_group_positions = []
     available_powers = []
-    fractions = {}
+    fractions = []
     relational_operator_positions = []
     variable_groups = {}  # Similar groups (same power and variable name), but coefficient may vary
+    keys: dict[Variable | None, Group] = {}  # Keys of the groups without power, one per variable
     for index, group in enumerate(parsed_group):
         if isinstance(group, Operator):
-            operator_positions[group] = operator_positions.get(group, []) + [index]
+            operator_positions.setdefault(group, []).append(index)
         elif isinstance(group, ParenthesizedGroup):
             parenthesized_group_positions.append(index)
             if group.power:
                 available_powers.append(index)
         elif isinstance(group, Group):
-            new = Group().from_data(Number(), Variable(v.name) if (v := group.variable) else None, power=group.power)
-            variable_groups[new] = variable_groups.get(new, []) + [index]
             if group.power:
+                key = Group.from_data(Number(), group.variable, power=group.power)
                 available_powers.append(index)
+            elif (key := keys.get(group.variable)) is None:
+                # New groups for every call, the positions of another list have their own keys
+                key = keys[group.variable] = Group.from_data(Number(), group.variable)
+            variable_groups.setdefault(key, []).append(index)
         elif isinstance(group, Fraction):
-            fractions[group] = index
+            fractions.append((group, index))
         elif isinstance(group, RelationalOperator):
             relational_operator_positions.append((group, index))
     return parenthesized_group_positions, operator_positions, available_powers, fractions, relational_operator_positions, variable_groups
 
 
+# Digits after the point kept by `Result` for Decimal values (in scientific notation), see `numeric_context`
+_result_digits: ContextVar[int] = ContextVar("result_digits", default=12)
+
+
+@contextmanager
+def numeric_context(backend: str = "decimal", precision: int | None = None, rounding: str | None = None) -> Iterator[None]:
+    """Calculates the numbers inside the block with the given backend ("decimal", "exact" or "float").
+
+    `precision` and `rounding` are set on a local Decimal context, they apply to Decimal calculations only. With an
+    explicit precision, Decimal results keep all of their significant digits instead of 13.
+    """
+    with numeric_backend(backend), localcontext() as context:
+        if precision is not None:
+            context.prec = precision
+        if rounding is not None:
+            context.rounding = rounding
+        token = _result_digits.set(context.prec - 1 if precision is not None else _result_digits.get())
+        try:
+            yield
+        finally:
+            _result_digits.reset(token)
+
+
 def _normalize(value):
-    if isinstance(value, Decimal):
-        return truncate_trailing_zero(Decimal(f"{value:.12e}"))
+    if isinstance(value, Decimal):  # Exact values (`fractions.Fraction`) and floats are kept as they are
+        return truncate_trailing_zero(Decimal(f"{value:.{_result_digits.get()}e}"))
     return value
 
 
 class Result:
-    def __init__(self, data: Mapping[Variable, VAR_VALUE | set[VAR_VALUE]] | bool | Decimal):
+    memo: MemoInfo | None = None  # Set by `solve`, the calculator-style expressions don't use the memo
+    numeric = False  # Whether the values are approximated numerically (irrational roots of polynomials)
+
+    def __init__(self, data: Mapping[Variable, VAR_VALUE | set[VAR_VALUE]] | bool | Decimal | Rational | float):
         self.variables_map = data if isinstance(data, dict) else {}
-        self.other_value = data if isinstance(data, (bool, Decimal)) else None
+        self.other_value = data if isinstance(data, (bool, Decimal, Rational, float)) else None
 
     def compare(self, target: Mapping[Variable, VAR_VALUE | set[VAR_VALUE]]):
         # Add value to a variable by a set or not by a set
@@ -165,10 +291,16 @@ class Result:
         return None if not variable else variable[0]
 
     def __repr__(self):
+        if isinstance(self.other_value, Rational):  # Shortened if it's too large to be shown exactly
+            return str(truncate_trailing_zero(self.other_value))
         if isinstance(self.other_value, bool) or self.other_value is not None:
             return str(self.other_value)
         return str(self.variables_map or "<Empty Result>")
 
     def to_decimal(self) -> Decimal | None:
-        # Converts Result instance to a Decimal if applicable
-        return self.other_value if isinstance(self.other_value, Decimal) else None
+        # Converts Result instance to a Decimal if applicable, an exact value is rounded to the current context here
+        if isinstance(value := self.other_value, Rational):
+            return Decimal(value.numerator) / value.denominator
+        if isinstance(value, float):
+            return Decimal(repr(value))
+        return value if isinstance(value, Decimal) else None
@@ -1,18 +1,32 @@
 from __future__ import annotations
 
-import sys
-
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .datatype import Maybe_RO
+    from .preflight import Cost
 
 
 class SolutionNotFoundError(Exception):
-    def __init__(self, equation: Maybe_RO):
-        self.equation = equation
-        self.recursion_limit = sys.getrecursionlimit()
-        super().__init__(f"Unable to solve equation. Recursion limit reached ({self.recursion_limit}).")
+    def __init__(self, equation: Maybe_RO, steps: int, repeated: bool = False):
+        self.equation = equation  # The last state of the equation
+        self.steps = steps
+        self.repeated = repeated
+        super().__init__(f"Unable to solve equation, it's the same as an earlier step after {steps} steps." if repeated else
+                         f"Unable to solve equation. Step budget reached ({steps}).")
+
+class ExpressionTooComplex(ArithmeticError):
+    def __init__(self, cost: Cost, budget: Cost):
+        self.cost = cost
+        self.budget = budget
+        super().__init__(f"Expression is too expensive to solve, estimated {cost.magnitude:.6g} digits and {cost.work:.6g} "
+                         f"digit operations (the budget is {budget.magnitude:.6g} and {budget.work:.6g}).")
+
+class RootsNotConverged(ArithmeticError):
+    def __init__(self, iterations: int):
+        self.iterations = iterations
+        super().__init__(f"Unable to approximate the roots of the polynomial after {iterations} iterations." if iterations else
+                         "Unable to approximate the roots of the polynomial, its coefficients are too large.")
 
 class BaseMatrixError(Exception): ...
 
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+from fractions import Fraction as Rational
+from typing import TypeVar
+
+from numsy.parser import Group, Fraction, Value
+from numsy.parser.objects import _to_value
+
+# The key of a term of a sparse exact form: the exponent of a polynomial, or the name of a variable of a linear
+# combination (with `None` for the constant term)
+Key = TypeVar("Key", bound=Hashable)
+
+
+class NotLowerable(Exception):
+    """The side of an equation doesn't have the form it's lowered into (or has a constant which isn't exact), it's
+    solved with the rewriting solver instead."""
+
+
+def to_rational(value: Value) -> Rational:
+    """The exact value of a number of any backend. Raises `NotLowerable` for infinity and NaN."""
+    if isinstance(value, float):  # The shortest digits which give back the float, like `_to_value`
+        value = repr(value)  # type: ignore
+    try:
+        return value if isinstance(value, Rational) else Rational(value)
+    except (ValueError, OverflowError):  # Infinity or NaN
+        raise NotLowerable from None
+
+
+def add_terms(first: dict[Key, Rational], second: dict[Key, Rational], sign: int = 1) -> dict[Key, Rational]:
+    """Adds the terms of `second` (times `sign`) to `first` in place and returns it, the terms which become zero are
+    removed. Both are sparse forms, `{key: coefficient}` without the zero coefficients."""
+    for key, coefficient in second.items():
+        if total := first.get(key, 0) + sign * coefficient:
+            first[key] = total
+        else:
+            first.pop(key, None)
+    return first
+
+
+def to_result(value: Rational, divided: bool) -> Value | Fraction:
+    """The answer has the type of the backend. The ones which were divided by the coefficient of the variable stay a
+    fraction (in its lowest terms) unless they're integers, the others only if they have no finite decimal digits."""
+    denominator = value.denominator
+    while not divided and denominator % 2 == 0:
+        denominator //= 2
+    while not divided and denominator % 5 == 0:
+        denominator //= 5
+    if denominator == 1:
+        return _to_value(value)
+    return Fraction(numerator=[Group.from_value(value.numerator)], denominator=[Group.from_value(value.denominator)])
@@ -1,20 +1,51 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from decimal import Decimal
 from enum import Enum
-from math import sqrt
-from typing import Final, Literal, TypeAlias, Callable, overload
+from fractions import Fraction
+from math import lcm, sqrt
+from typing import Generic, Literal, TypeAlias, TypeVar, Callable, cast, overload
 
 
+from numsy.parser.objects import _to_value
+from numsy.solver.core import numeric_context
 from numsy.solver.errors import DimensionMismatch, NonInvertibleMatrixError
 
-MatrixBase: TypeAlias = list[list[float]]
+# The type of the elements of a matrix, one of the `Value` types (every element of a matrix has the same one)
+Element = TypeVar("Element", float, Decimal, Fraction)
+MatrixBase: TypeAlias = "list[list[Element]]"
 
-def _dot(m1: Matrix | MatrixBase, m2: Matrix | MatrixBase):
+def _dot(m1: Matrix[Element] | MatrixBase[Element], m2: Matrix[Element] | MatrixBase[Element]) -> Element:
     res = 0
     for i in range(len(m1[0])):
         res += (m1[0][i]) * m2[0][i]
-    return res
+    return cast(Element, res)  # The type of the elements, unless the rows are empty
+
+def _solve_fraction_free(matrix: Sequence[Sequence[Fraction | int]], rhs: Sequence[Fraction | int]) -> list[Fraction]:
+    # The rows (with their value of `rhs`) are scaled to integers, and every elimination step divides exactly by the
+    # previous pivot. The elements stay integers, each one is a minor of the matrix.
+    rows = []
+    for row, value in zip(matrix, rhs):
+        scale = lcm(*(Fraction(e).denominator for e in row), Fraction(value).denominator)
+        rows.append([int(e * scale) for e in row] + [int(value * scale)])
+    size, previous = len(rows), 1
+    for k in range(size):
+        if (pivot := next((i for i in range(k, size) if rows[i][k]), None)) is None:
+            raise NonInvertibleMatrixError()
+        rows[k], rows[pivot] = rows[pivot], rows[k]
+        pivot_row = rows[k]
+        for row in rows[k + 1:]:
+            factor = row[k]
+            for j in range(k + 1, size + 1):
+                row[j] = (pivot_row[k] * row[j] - factor * pivot_row[j]) // previous
+            row[k] = 0
+        previous = pivot_row[k]
+    values: list[Fraction] = [Fraction(0)] * size
+    for i in range(size - 1, -1, -1):
+        row = rows[i]
+        values[i] = (row[size] - sum(row[j] * values[j] for j in range(i + 1, size) if row[j])) / Fraction(row[i])
+    return values
 
 class NormEnum(Enum):
     ONE = 1
@@ -23,8 +54,16 @@ class NormEnum(Enum):
 
     TWO = FROBENIUS
 
-class Matrix:
-    def __init__(self, matrix: Sequence[Sequence[float]]) -> None:
+class Matrix(Generic[Element]):
+    def __init__(self, matrix: Sequence[Sequence[Element]], backend: str | None = None, precision: int | None = None) -> None:
+        """Creates a matrix from its rows.
+
+        Parameters:
+            matrix (Sequence[Sequence[Element]]): The rows of the matrix, every row must have the same length.
+            backend (str | None): Converts the elements to the values of a numeric backend (`"decimal"`, `"exact"` or
+                `"float"`), like `solve` does. The elements are kept as they are if not given.
+            precision (int | None): Number of significant digits of the converted Decimal elements.
+        """
         first_len = None
         for m in matrix:
             if first_len is None:
@@ -33,7 +72,12 @@ class Matrix:
                 if len(m) != first_len:
                     raise DimensionMismatch("All row lengths must match the length of the first row.",[(0, first_len), (0, len(m))])
 
-        self.matrix = [list(m) for m in matrix]
+        self.matrix: MatrixBase[Element]
+        if backend is None:
+            self.matrix = [list(m) for m in matrix]
+        else:  # The operations of the matrix then follow the type of its elements, the one of the backend
+            with numeric_context(backend, precision):
+                self.matrix = cast("MatrixBase[Element]", [[+_to_value(e) for e in m] for m in matrix])
 
     @property
     def rows(self):
@@ -175,14 +219,14 @@ class Matrix:
         """
         return self.is_invertible and self.transpose() == self.inverse()
 
-    def _map(self, func: Callable[[float, int, int], float]):
+    def _map(self, func: Callable[[Element, int, int], Element]) -> Matrix[Element]:
         """An internal function to map each element inside the matrix with a function.
         The current value, i, j will be passed respectively to the callback function.
         """
-        res = []
+        res: MatrixBase[Element] = []
         i = 0
         for r in self.matrix:
-            inside = []
+            inside: list[Element] = []
             j = 0
             for o in r:
                 inside.append(func(o, j, i))
@@ -191,7 +235,7 @@ class Matrix:
             i += 1
         return Matrix(res)
 
-    def _dot(self, other: Matrix):
+    def _dot(self, other: Matrix[Element]) -> Element:
         return _dot(self.matrix, other)
 
     def _gaussian_eliminate(self):
@@ -220,7 +264,7 @@ class Matrix:
                     row -= 1
         return Matrix(mat), rank
 
-    def transpose(self):
+    def transpose(self) -> Matrix[Element]:
         """Returns the transpose of the matrix.
 
         The transpose of a matrix is obtained by swapping its rows and columns.
@@ -229,21 +273,21 @@ class Matrix:
         Returns:
             Matrix: A new matrix representing the transpose of the original matrix.
         """
-        res = []
+        res: MatrixBase[Element] = []
         for j in range(self.cols):  # Iterate over columns first instead of rows
-            row = []
+            row: list[Element] = []
             for i in range(self.rows):
                 row.append(self[i][j])
             res.append(row)
         return Matrix(res)
 
-    def determinant(self) -> float:
+    def determinant(self) -> Element:
         """ Computes the determinant of a square matrix using cofactor expansion (Laplace expansion).
 
         This method calculates the determinant by expanding along the first row of the matrix.
 
         Returns:
-            float: The determinant of the matrix.
+            Element: The determinant of the matrix.
 
         Raises:
             `DimensionMismatch`: If the matrix is not square (the number of rows and columns are not equal).
@@ -268,16 +312,16 @@ class Matrix:
         if self.size == (1, 1):
             return self[0, 0]
         elif self.size == (0, 0):
-            return 1
+            return cast(Element, 1)
         res = 0
         j = 0
         for column in self.matrix[0]:
             K = [x[:j] + x[j + 1:] for x in self.matrix[1:]]
             res += ((-1)**j) * column * Matrix(K).determinant()
             j += 1
-        return res
+        return cast(Element, res)
 
-    def adjugate(self) -> Matrix:
+    def adjugate(self) -> Matrix[Element]:
         """Computes the adjugate (adjoint) of a square matrix.
 
         The adjugate of a square matrix is the transpose of its cofactor matrix. Each element in the cofactor matrix
@@ -303,12 +347,12 @@ class Matrix:
             raise DimensionMismatch(f"Matrix must be a square matrix with same number of rows and columns.", [self.size])
         if self.size == (1, 1):
             return self
-        def callback(_: float, i: int, j: int) -> float:
+        def callback(_: Element, i: int, j: int) -> Element:
             co = [x[:j] + x[j + 1:] for x in self.matrix[:i] + self.matrix[i + 1:]]
             return ((-1) ** (i + j)) * Matrix(co).determinant()
         return self._map(callback)
 
-    def inverse(self) -> Matrix:
+    def inverse(self) -> Matrix[Element]:
         """Calculates the inverse of the matrix using the adjugate method.
 
         The inverse of a square matrix `A` is computed as:
@@ -328,22 +372,100 @@ class Matrix:
             raise NonInvertibleMatrixError()
         return self.adjugate()/self.determinant()
 
-    def trace(self) -> float:
+    def lu_decompose(self) -> tuple[Matrix[Element], list[int]]:
+        """Computes the LU decomposition of a square matrix with partial pivoting.
+
+        The rows of the matrix are permuted so that `P * A = L * U`, where `L` is a lower triangular matrix with ones on
+        its diagonal and `U` is an upper triangular matrix. Both are stored in a single matrix, `U` on and above the
+        diagonal and `L` below it (its diagonal of ones isn't stored). The pivot of every column is the element with the
+        largest absolute value below the diagonal, which keeps the rounding errors of floats small.
+
+        Returns:
+            tuple[`Matrix`, list[int]]: The combined `L` and `U` matrix, and the permutation of the rows (element `i` is
+                the index of the original row which is row `i` of the decomposition).
+
+        Raises:
+            `DimensionMismatch`: If the matrix is not square (the number of rows and columns are not equal).
+            `NonInvertibleMatrixError`: If the matrix is singular (det(A) == 0).
+
+        Example:
+            For the matrix:
+                | 1  2 |
+                | 3  4 |
+
+            The rows are swapped (permutation [1, 0]) and the decomposition is:
+                |   3    4 |
+                | 1/3  2/3 |
+        """
+        if self.rows != self.cols:
+            raise DimensionMismatch(f"Matrix must be a square matrix with same number of rows and columns.", [self.size])
+        lu = [list(row) for row in self.matrix]
+        permutation = list(range(self.rows))
+        for k in range(self.rows):
+            pivot = max(range(k, self.rows), key=lambda i: abs(lu[i][k]))
+            if lu[pivot][k] == 0:
+                raise NonInvertibleMatrixError()
+            lu[k], lu[pivot] = lu[pivot], lu[k]
+            permutation[k], permutation[pivot] = permutation[pivot], permutation[k]
+            pivot_row = lu[k]
+            columns = [j for j in range(k + 1, self.cols) if pivot_row[j] != 0]  # Skips the zeros of sparse matrices
+            for row in lu[k + 1:]:
+                if row[k] == 0:
+                    continue
+                row[k] = factor = row[k] / pivot_row[k]
+                for j in columns:
+                    row[j] -= factor * pivot_row[j]
+        return Matrix(lu), permutation
+
+    def solve(self, rhs: Sequence[Element]) -> list[Element]:
+        """Solves the linear system `A * x = rhs` for `x`, where `A` is the matrix.
+
+        The matrix is factorized once with `lu_decompose`, then `L * y = P * rhs` is solved by forward substitution and
+        `U * x = y` by back substitution. This takes O(n^3) operations, instead of the cofactor expansions of `inverse`.
+        The values have the type of the elements. Exact elements (integers and `fractions.Fraction`) give the exact
+        solution, they're eliminated without fractions (Bareiss's algorithm) so no denominators grow along the way.
+
+        Parameters:
+            rhs (Sequence[Element]): The right hand side of the system, one value per row of the matrix.
+
+        Returns:
+            list[Element]: The solution, one value per column of the matrix.
+
+        Raises:
+            `DimensionMismatch`: If the matrix is not square, or if `rhs` doesn't have a value for every row.
+            `NonInvertibleMatrixError`: If the matrix is singular, the system has no solution or infinitely many.
+        """
+        if len(rhs) != self.rows:
+            raise DimensionMismatch("The right hand side must have a value for every row of the matrix.", [self.size, (len(rhs), 1)])
+        if self.rows != self.cols:
+            raise DimensionMismatch(f"Matrix must be a square matrix with same number of rows and columns.", [self.size])
+        if all(isinstance(e, (int, Fraction)) for e in rhs) and all(isinstance(e, (int, Fraction)) for row in self.matrix for e in row):
+            return cast("list[Element]", _solve_fraction_free(cast("MatrixBase[Fraction]", self.matrix), cast("list[Fraction]", rhs)))
+        lu, permutation = self.lu_decompose()
+        values = [rhs[i] for i in permutation]
+        for i, row in enumerate(lu.matrix):  # L * y = P * rhs, the diagonal of L is ones
+            values[i] -= sum(row[j] * values[j] for j in range(i) if row[j] != 0)
+        for i in range(self.rows - 1, -1, -1):  # U * x = y
+            row = lu.matrix[i]
+            values[i] = (values[i] - sum(row[j] * values[j] for j in range(i + 1, self.cols) if row[j] != 0)) / row[i]
+        return values
+
+    def trace(self) -> Element:
         """Calculates the trace of the matrix.
 
         The trace of a matrix is the sum of the diagonal elements, i.e., the elements at positions (i, i) for all i.
 
         Returns:
-            float: The trace of the matrix, which is the sum of the diagonal elements.
+            Element: The trace of the matrix, which is the sum of the diagonal elements.
 
         Raises:
             DimensionMismatch: If the matrix is not square (the number of rows and columns are not equal).
         """
         if self.rows != self.cols:
             raise DimensionMismatch(f"Matrix must be a square matrix with same number of rows and columns.", [self.size])
-        return sum(self[i, i] for i in range(self.rows))
+        return cast(Element, sum(self[i, i] for i in range(self.rows)))
 
-    def row_echelon_form(self) -> Matrix:
+    def row_echelon_form(self) -> Matrix[Element]:
         """Computes the Row Echelon Form (REF) of the matrix.
 
         This method uses Gaussian elimination to transform the matrix into row echelon form (REF),
@@ -374,7 +496,7 @@ class Matrix:
         """
         return self._gaussian_eliminate()[1]
 
-    def norm(self, p: NormEnum = NormEnum.INFINITY) -> float:
+    def norm(self, p: NormEnum = NormEnum.INFINITY) -> Element | float:
         """Calculates the norm of the matrix.
 
         This method computes the norm of the matrix based on the specified norm type. Supported norm types include:
@@ -388,17 +510,17 @@ class Matrix:
                 Defaults to `NormEnum.INFINITY`.
 
         Returns:
-            float: The computed norm of the matrix.
+            Element | float: The computed norm of the matrix (a float for the Frobenius norm).
         """
         match p:
             case NormEnum.ONE:
-                return max(sum(abs(col) for col in row) for row in self.transpose().matrix)
+                return cast(Element, max(sum(abs(col) for col in row) for row in self.transpose().matrix))
             case NormEnum.INFINITY:
-                return max(sum(abs(col) for col in row) for row in self.matrix)
+                return cast(Element, max(sum(abs(col) for col in row) for row in self.matrix))
             case NormEnum.FROBENIUS:
                 return sqrt((self.transpose() * self).trace())
 
-    def condition_number(self, p: NormEnum = NormEnum.INFINITY) -> float:
+    def condition_number(self, p: NormEnum = NormEnum.INFINITY) -> Element | float:
         """Calculates the condition number of the matrix.
 
         The condition number is a measure of the sensitivity of the solution of a system of linear equations
@@ -409,15 +531,17 @@ class Matrix:
                 Must be one of the values in the `NormEnum` enumeration. Defaults to `NormEnum.INFINITY`.
 
         Returns:
-            float: The condition number of the matrix.
+            Element | float: The condition number of the matrix.
 
         Raises:
             `DimensionMismatch`: If the matrix is not square, as only square matrices have condition numbers.
             `NonInvertibleMatrixError`: If the matrix is singular and does not have an inverse.
         """
-        return self.norm(p) * self.inverse().norm(p)
+        if p is NormEnum.FROBENIUS:
+            return float(self.norm(p)) * float(self.inverse().norm(p))
+        return cast(Element, self.norm(p)) * cast(Element, self.inverse().norm(p))
 
-    def kronecker_product(self, other: Matrix) -> Matrix:
+    def kronecker_product(self, other: Matrix[Element]) -> Matrix[Element]:
         """Computes the Kronecker product of two matrices.
 
         The Kronecker product, also known as the tensor product, of two matrices results in a block matrix
@@ -431,10 +555,10 @@ class Matrix:
             `Matrix`: A new matrix representing the Kronecker product of the two matrices.
         """
         current_row = 0
-        ret = []
+        ret: MatrixBase[Element] = []
         for row in self.matrix:
             for _ in range(other.rows):
-                new = []
+                new: list[Element] = []
                 for col in row:
                     new += [elem * col for elem in other[current_row]]
                 ret.append(new)
@@ -442,7 +566,7 @@ class Matrix:
             current_row = 0
         return Matrix(ret)
 
-    def hadamard_product(self, other: Matrix) -> Matrix:
+    def hadamard_product(self, other: Matrix[Element]) -> Matrix[Element]:
         """Computes the Hadamard product (element-wise product) of two matrices.
 
         The Hadamard product is the element-wise multiplication of two matrices of the same dimensions.
@@ -460,7 +584,7 @@ class Matrix:
             raise DimensionMismatch("The dimension of the first matrix must be equal to the second matrix.", [self.size, other.size])
         return self._map(lambda o, i, j: o * other[j, i])
 
-    def hadamard_division(self, other: Matrix) -> Matrix:
+    def hadamard_division(self, other: Matrix[Element]) -> Matrix[Element]:
         """Computes the Hadamard division (element-wise division) of two matrices.
 
         The Hadamard division is the element-wise division of two matrices of the same dimensions.
@@ -481,29 +605,29 @@ class Matrix:
         return self._map(lambda o, i, j: o / other[j, i])
 
 
-    def element_wise_subtract(self, value: float):
+    def element_wise_subtract(self, value: Element) -> Matrix[Element]:
         """Performs element-wise subtraction of a scalar from the matrix.
 
         Parameters:
-            value (float): The scalar value to subtract from each element of the matrix.
+            value (Element): The scalar value to subtract from each element of the matrix.
 
         Returns:
             `Matrix`: A new matrix where each element is the result of subtracting the scalar value from the original matrix elements.
         """
         return self._map(lambda o, *_: o - value)
 
-    def element_wise_add(self, value: float):
+    def element_wise_add(self, value: Element) -> Matrix[Element]:
         """Performs element-wise addition of a scalar to the matrix.
 
         Parameters:
-            value (float): The scalar value to add to each element of the matrix.
+            value (Element): The scalar value to add to each element of the matrix.
 
         Returns:
             `Matrix`: A new matrix where each element is the result of adding the scalar value to the original matrix elements.
         """
         return self._map(lambda o, *_: o + value)
 
-    def submatrix(self, row_indices: list[int], col_indices: list[int]) -> Matrix:
+    def submatrix(self, row_indices: list[int], col_indices: list[int]) -> Matrix[Element]:
         """Extracts a submatrix defined by specified row and column indices.
 
         A submatrix is created by selecting specific rows and columns from the original matrix.
@@ -528,10 +652,10 @@ class Matrix:
         return isinstance(value, Matrix) and self.matrix == value.matrix
 
     @overload
-    def __getitem__(self, item: int) -> list[float]: ...
+    def __getitem__(self, item: int) -> list[Element]: ...
     @overload
-    def __getitem__(self, item: tuple[int, int]) -> float: ...
-    def __getitem__(self, item: int | tuple[int, int]) -> float | list[int | float]:
+    def __getitem__(self, item: tuple[int, int]) -> Element: ...
+    def __getitem__(self, item: int | tuple[int, int]) -> Element | list[Element]:
         """Accesses elements of the matrix.
 
         This method allows accessing elements in the matrix using either a single index (to get a row) or
@@ -546,15 +670,15 @@ class Matrix:
             item (tuple[int, int]): A tuple containing the row and column indices to retrieve a specific element.
 
         Returns:
-            list[float]: The row at the specified index (if `item` is an integer).
-            float: The element at the specified row and column (if `item` is a tuple of two integers).
+            list[Element]: The row at the specified index (if `item` is an integer).
+            Element: The element at the specified row and column (if `item` is a tuple of two integers).
 
         Raises:
             IndexError: If the index is out of bounds for the matrix.
         """
         return self.matrix[item[0]][item[1]] if isinstance(item, tuple) else self.matrix[item]
 
-    def __add__(self, other: Matrix):
+    def __add__(self, other: Matrix[Element]) -> Matrix[Element]:
         """Adds another matrix to the current matrix.
 
         This method performs element-wise addition between two matrices. The two matrices
@@ -573,7 +697,7 @@ class Matrix:
             raise DimensionMismatch("The dimension of the first matrix must be equal to the second matrix.", [self.size, other.size])
         return self._map(lambda e, i, j: e + other[j][i])
 
-    def __sub__(self, other: Matrix):
+    def __sub__(self, other: Matrix[Element]) -> Matrix[Element]:
         """Subtracts another matrix from the current matrix.
 
         This method performs element-wise subtraction between two matrices. The two matrices must have the same
@@ -593,7 +717,7 @@ class Matrix:
 
         return self._map(lambda e, i, j: e - other[j][i])
 
-    def __mul__(self, other: Matrix | float):
+    def __mul__(self, other: Matrix[Element] | Element) -> Matrix[Element]:
         """Multiplies the matrix with another matrix or a scalar.
 
         This method supports two types of multiplication:
@@ -602,7 +726,7 @@ class Matrix:
         2. **Scalar multiplication**: Multiplies each element of the matrix by the given scalar.
 
         Parameters:
-            other (`Matrix` | float): The other operand. Can be another matrix (for matrix multiplication) or
+            other (`Matrix` | Element): The other operand. Can be another matrix (for matrix multiplication) or
                 a scalar (for element-wise multiplication).
 
         Returns:
@@ -614,40 +738,40 @@ class Matrix:
         if isinstance(other, Matrix) and self.rows != other.cols:
             raise DimensionMismatch("The number of rows of the second matrix must be "
                                     "equal to the number of columns of the first one.", [self.size, other.size])
-        if isinstance(other, (float, int)):
+        if not isinstance(other, Matrix):
             return self._map(lambda e, *_: e * other)
 
-        res = []
+        res: MatrixBase[Element] = []
         for row in self.matrix:
-            inside = []
+            inside: list[Element] = []
             for r in other.transpose().matrix:
                 inside.append(_dot([row], [r]))
             res.append(inside)
         return Matrix(res)
 
-    def __truediv__(self, other: float):
+    def __truediv__(self, other: Element) -> Matrix[Element]:
         """Divides each element of the matrix by a scalar.
 
         Parameters:
-            other (float): The scalar to divide each element of the matrix by.
+            other (Element): The scalar to divide each element of the matrix by.
 
         Returns:
             `Matrix`: A new matrix with each element divided by the scalar.
         """
         return self._map(lambda e, *_: e / other)
 
-    def __floordiv__(self, other: float):
+    def __floordiv__(self, other: Element) -> Matrix[Element]:
         """Performs element-wise floor division of the matrix by a scalar.
 
         Parameters:
-            other (float): The scalar to floor-divide each element of the matrix by.
+            other (Element): The scalar to floor-divide each element of the matrix by.
 
         Returns:
             `Matrix`: A new matrix with each element floor-divided by the scalar.
         """
-        return self._map(lambda e, *_: e // other)
+        return self._map(lambda e, *_: cast(Element, e // other))  # An integer for exact elements
 
-    def __pow__(self, power: int, modulo: float | None = None):
+    def __pow__(self, power: int, modulo: Element | None = None) -> Matrix[Element]:
         """Raises the matrix to a given power using matrix multiplication, with support for negative powers and modulo.
 
         This method raises the matrix to a positive or negative integer power by multiplying the matrix
@@ -657,7 +781,7 @@ class Matrix:
         Parameters:
             power (int): The exponent to which the matrix is to be raised.
                 Can be positive, negative, or zero.
-            modulo (float | None, optional): If provided, the result of the exponentiation will be taken modulo this value.
+            modulo (Element | None, optional): If provided, the result of the exponentiation will be taken modulo this value.
 
         Returns:
             `Matrix`: The matrix raised to the specified power, optionally reduced modulo the given value.
@@ -678,18 +802,18 @@ class Matrix:
         if self.rows != self.cols:
             raise DimensionMismatch("Matrix should be a square matrix to be powered.", [self.size])
         if power == 0:
-            return Identity(self.cols)
+            return cast("Matrix[Element]", Identity(self.cols))
 
         new = self.inverse() if power < 0 else self
         for _ in range(abs(power) - 1):
             new *= self.inverse() if power < 0 else self
         return new % modulo if modulo is not None else new
 
-    def __mod__(self, other: float) -> Matrix:
+    def __mod__(self, other: Element) -> Matrix[Element]:
         """Performs element-wise modulus operation with a scalar.
 
         Parameters:
-            other (float): The scalar to compute the modulus of each element by.
+            other (Element): The scalar to compute the modulus of each element by.
 
         Returns:
             `Matrix`: A new matrix with each element modded by the scalar.
@@ -706,7 +830,7 @@ class Matrix:
     element_wise_divide = hadamard_division
 
 
-class Identity(Matrix):
+class Identity(Matrix[float]):
     """A class representing the identity matrix, which is a special square matrix in which all the elements of
     the principal diagonal are ones, and all other elements are zeros.
 
@@ -714,15 +838,15 @@ class Identity(Matrix):
     the matrix is the identity matrix.
     """
     def __init__(self, size: int):
-        self.matrix: Final = [[1 if i == j else 0 for j in range(size)] for i in range(size)]
+        self.matrix = [[1 if i == j else 0 for j in range(size)] for i in range(size)]
 
-    def __mul__(self, other: Matrix | float):
+    def __mul__(self, other: Matrix[float] | float) -> Matrix[float]:
         if isinstance(other, Matrix):
             return other
         else:
             return super().__mul__(other)
 
-    def __pow__(self, power: int, modulo=None) -> Matrix:
+    def __pow__(self, power: int, modulo=None) -> Matrix[float]:
         return self
 
     @property
@@ -744,13 +868,13 @@ class Identity(Matrix):
     def rank(self):
         return self.rows
 
-    def inverse(self) -> Matrix:
+    def inverse(self) -> Matrix[float]:
         return self
 
-    def adjugate(self) -> Matrix:
+    def adjugate(self) -> Matrix[float]:
         return self
 
-    def transpose(self) -> Matrix:
+    def transpose(self) -> Matrix[float]:
         return self
 
     def determinant(self) -> Literal[1]:
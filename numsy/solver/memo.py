@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Generator, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, NamedTuple
+
+from numsy.parser import Group, ParenthesizedGroup, Fraction, Num, Var, Pow, UnaryOp, BinOp, Node, trampoline
+
+from .datatype import No_RO
+
+MISSING = object()
+
+
+class MemoInfo(NamedTuple):
+    hits: int
+    misses: int
+    currsize: int
+
+
+class SubexpressionMemo:
+    """The results of the subexpressions calculated or simplified during a single solve, keyed by their structure. An
+    equation repeating the same block, like `(x + 1)(x + 1) - (x + 1) = 0`, calculates it once and reuses the result.
+
+    Every distinct list of groups gets a small integer id, the structure of a list is made of the ids of the lists inside
+    of it, so the key of every subexpression is calculated once (and compared without going through the nested lists).
+    """
+
+    def __init__(self):
+        self._ids: dict[tuple, int] = {(): 0}  # Structure of a list of groups -> its id, 0 is the empty list
+        self._results: dict[Hashable, Any] = {}
+        self.hits = self.misses = 0
+
+    def identify(self, groups: No_RO, found: dict[int, tuple[Any, Hashable]] | None = None) -> int:
+        """Returns the id of the structure of the groups. The key of every ParenthesizedGroup and Group with a power
+        inside them is stored in `found` by the `id` of the group (with the group, so the `id` isn't reused)."""
+        return trampoline(self._identify(groups, found))
+
+    def _identify(self, groups: No_RO, found: dict[int, tuple[Any, Hashable]] | None) -> Generator[Any, int, int]:
+        structure: list[Hashable] = []
+        for group in groups:
+            if isinstance(group, Group):
+                number = group.number  # `str` keeps the sign of a zero and the digits ("2.0" isn't printed like "2")
+                key: Hashable = (str(number.value), group.variable, group.modified or number.modified,
+                                 (yield self._identify(group.power, found)) if group.power else 0)
+            elif isinstance(group, ParenthesizedGroup):
+                key = ("(", group.is_negative, (yield self._identify(group.groups, found)),
+                       (yield self._identify(group.power, found)) if group.power else 0)
+            elif isinstance(group, Fraction):
+                key = ("/", (yield self._identify(group.numerator, found)), (yield self._identify(group.denominator, found)))
+            else:  # Operators and relational operators are compared by their symbol
+                structure.append(group)
+                continue
+            if found is not None and (isinstance(group, ParenthesizedGroup) or isinstance(group, Group) and group.power):
+                found[id(group)] = (group, key)
+            structure.append(key)
+        return self._ids.setdefault(tuple(structure), len(self._ids))
+
+    def identify_tree(self, node: Node, found: dict[int, int]) -> int:
+        """Returns the id of the structure of a tree (see `to_tree`), like `identify` for a list of groups. The id of every
+        Pow, UnaryOp and BinOp inside it is stored in `found` by the `id` of the node."""
+        return trampoline(self._identify_tree(node, found))
+
+    def _identify_tree(self, node: Node, found: dict[int, int]) -> Generator[Any, int, int]:
+        if isinstance(node, Num):  # Compared by value, the trees are only lowered (so "2.0" is the same as "2")
+            return self._ids.setdefault((Num, node.value), len(self._ids))
+        if isinstance(node, Var):
+            return self._ids.setdefault((Var, node.name), len(self._ids))
+        if isinstance(node, Pow):
+            structure: tuple = (Pow, (yield self._identify_tree(node.base, found)), (yield self._identify_tree(node.exponent, found)))
+        elif isinstance(node, UnaryOp):
+            structure = (UnaryOp, (yield self._identify_tree(node.operand, found)))
+        else:
+            structure = (BinOp, node.operator, (yield self._identify_tree(node.left, found)), (yield self._identify_tree(node.right, found)))
+        found[id(node)] = self._ids.setdefault(structure, len(self._ids))
+        return found[id(node)]
+
+    def get(self, key: Hashable) -> Any:
+        # The stored result, or `MISSING`
+        if (result := self._results.get(key, MISSING)) is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def set(self, key: Hashable, result: Any):
+        self._results[key] = result
+
+    def info(self) -> MemoInfo:
+        return MemoInfo(self.hits, self.misses, len(self._results))
+
+    def __repr__(self):
+        return f"<SubexpressionMemo hits={self.hits} misses={self.misses} size={len(self._results)}>"
+
+
+_memo: ContextVar[SubexpressionMemo | None] = ContextVar("memo", default=None)
+
+
+@contextmanager
+def memoize() -> Iterator[SubexpressionMemo]:
+    """Reuses the results of identical subexpressions inside the block, the memo is discarded at the end of it."""
+    memo = SubexpressionMemo()
+    token = _memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _memo.reset(token)
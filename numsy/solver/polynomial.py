@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import math
+
+from collections.abc import Generator
+from decimal import Decimal, getcontext, localcontext
+from fractions import Fraction as Rational
+from typing import Any, TypeAlias
+
+from numsy.parser import Variable, Fraction, Equals, Num, Var, Pow, UnaryOp, BinOp, Equation, Node, Value
+from numsy.parser import to_tree, trampoline
+from numsy.parser.objects import _to_value
+
+from .core import Result, NoSolution, TrueForAll
+from .datatype import CompleteEquation
+from .logging import _log
+from .lowering import NotLowerable, to_rational, add_terms, to_result
+from .memo import MISSING, SubexpressionMemo, _memo
+from .roots import find_roots, square_free
+
+# Sparse polynomial of the only variable of an equation, `{exponent: coefficient}`. The coefficients are exact, and
+# the ones which are zero aren't stored (the zero polynomial is an empty dict).
+Polynomial: TypeAlias = "dict[int, Rational]"
+
+# Higher degrees aren't expanded, (x + 1)^n has n + 1 terms and every multiplication goes through all of them
+MAX_DEGREE = 256
+# Extra digits of the irrational roots, which are rounded once to the current precision at the end
+GUARD_DIGITS = 10
+
+
+def _multiply(first: Polynomial, second: Polynomial) -> Polynomial:
+    if first and second and max(first) + max(second) > MAX_DEGREE:
+        raise NotLowerable
+    result: Polynomial = {}
+    for exponent, coefficient in first.items():
+        add_terms(result, {exponent + other: coefficient * value for other, value in second.items()})
+    return result
+
+
+def _power(base: Polynomial, exponent: int) -> Polynomial:
+    if len(base) == 1:  # A single term, the coefficient and the exponent are raised separately
+        (degree, coefficient), = base.items()
+        if degree * exponent > MAX_DEGREE:
+            raise NotLowerable
+        return {degree * exponent: coefficient ** exponent}
+    result: Polynomial = {0: Rational(1)}
+    while exponent:  # Exponentiation by squaring
+        if exponent & 1:
+            result = _multiply(result, base)
+        if exponent := exponent >> 1:
+            base = _multiply(base, base)
+    return result
+
+
+def _lower(node: Node, memo: SubexpressionMemo | None, found: dict[int, int]) -> Generator[Any, Polynomial, Polynomial]:
+    if isinstance(node, Num):
+        return {0: value} if (value := to_rational(node.value)) else {}
+    if isinstance(node, Var):
+        return {1: Rational(1)}
+    # An identical subtree was already lowered, its polynomial is reused (`found` has the ids of the subtrees)
+    key = ("polynomial", found.get(id(node)))
+    if memo is not None and (result := memo.get(key)) is not MISSING:
+        return dict(result)  # The polynomials are changed in place by `add_terms`
+    result = yield _lower_operation(node, memo, found)
+    if memo is not None:
+        memo.set(key, dict(result))
+    return result
+
+
+def _lower_operation(node: Pow | UnaryOp | BinOp, memo: SubexpressionMemo | None, found: dict[int, int]) -> Generator[Any, Polynomial, Polynomial]:
+    if isinstance(node, UnaryOp):
+        return {exponent: -coefficient for exponent, coefficient in (yield _lower(node.operand, memo, found)).items()}
+
+    if isinstance(node, Pow):
+        base, exponent = (yield _lower(node.base, memo, found)), (yield _lower(node.exponent, memo, found))
+        if exponent.keys() - {0} or (power := exponent.get(0, Rational(0))).denominator != 1:
+            raise NotLowerable  # The exponent contains the variable, or it's a root (which isn't exact)
+        if power < 0 and base.keys() - {0} or not base and power <= 0:  # 0^0 and 0^-1 are errors of the solver
+            raise NotLowerable
+        return _power(base, int(power)) if power >= 0 else {0: base[0] ** int(power)}
+
+    left, right = (yield _lower(node.left, memo, found)), (yield _lower(node.right, memo, found))
+    if node.operator == "+":
+        return add_terms(left, right)
+    if node.operator == "*":
+        return _multiply(left, right)
+    if right.keys() != {0}:  # Division by the variable or by zero
+        raise NotLowerable
+    return {exponent: coefficient / right[0] for exponent, coefficient in left.items()}
+
+
+def to_polynomial(side: Node) -> Polynomial | None:
+    """Lowers one side of an equation (as a tree, see `to_tree`) into a sparse polynomial of its only variable, with
+    the parentheses distributed and the fractions calculated exactly. Returns `None` if the side isn't a polynomial, for
+    example with the variable in a denominator or an exponent. The repeated subtrees are lowered once per solve."""
+    found: dict[int, int] = {}  # The id of the structure of every subtree, by the `id` of its node
+    if (memo := _memo.get()) is not None:
+        memo.identify_tree(side, found)
+    try:
+        return trampoline(_lower(side, memo, found))
+    except NotLowerable:
+        return None
+
+
+def _decimal(value: Rational) -> Decimal:
+    return Decimal(value.numerator) / value.denominator
+
+
+def _rational_sqrt(value: Rational) -> Rational | None:
+    # The exact square root, or `None` if it's irrational
+    numerator, denominator = math.isqrt(value.numerator), math.isqrt(value.denominator)
+    if numerator * numerator == value.numerator and denominator * denominator == value.denominator:
+        return Rational(numerator, denominator)
+    return None
+
+
+def _evaluate(coefficients: list, value):
+    # Horner's method, the coefficients are ordered from the highest degree
+    result = coefficients[0] * 0
+    for coefficient in coefficients:
+        result = result * value + coefficient
+    return result
+
+
+def _exact(root: Decimal, coefficients: list[Rational]) -> Rational | Decimal:
+    # A rational root p/q of a polynomial with integer coefficients has q dividing the leading coefficient, so the
+    # closest fraction with such a denominator is tried. It's only kept if it's exactly a root, and the same one (close
+    # roots would snap to their rational neighbour otherwise).
+    scale = math.lcm(*(coefficient.denominator for coefficient in coefficients))
+    candidate = Rational(root).limit_denominator(max(abs(int(coefficients[0] * scale)), 1))
+    if abs(_decimal(candidate) - root) > Decimal(10) ** (GUARD_DIGITS - getcontext().prec) * max(abs(root), 1):
+        return root
+    return candidate if not _evaluate(coefficients, candidate) else root
+
+
+def _quadratic(a: Rational, b: Rational, c: Rational) -> list[Rational | Decimal]:
+    if (discriminant := b * b - 4 * a * c) < 0:
+        return []
+    if (root := _rational_sqrt(discriminant)) is not None:
+        return [(-b - root) / (2 * a), (-b + root) / (2 * a)]
+    return list(_decimal_quadratic(_decimal(a), _decimal(b), _decimal(c), _decimal(discriminant)))
+
+
+def _decimal_quadratic(a: Decimal, b: Decimal, c: Decimal, discriminant: Decimal) -> list[Decimal]:
+    # The irrational roots, with the digits of the current (guarded) precision
+    root = discriminant.sqrt()
+    q = -(b + root.copy_sign(b)) / 2  # Without subtracting close values, which would lose digits
+    return [q / a, c / q] if q else [Decimal(0)]
+
+
+def _newton(coefficients: list[Rational], estimate: float) -> Decimal:
+    # Refines a root from its float estimate, with the digits of the current (guarded) precision
+    values = [_decimal(coefficient) for coefficient in coefficients]
+    derivative = [value * (len(values) - 1 - index) for index, value in enumerate(values[:-1])]
+    root = Decimal(repr(estimate))
+    for _ in range(100):
+        if not (slope := _evaluate(derivative, root)):
+            break
+        if (new := root - _evaluate(values, root) / slope) == root:
+            break
+        root = new
+    return root
+
+
+def _cbrt(value: float) -> float:
+    # The real cube root, also of a negative value (`value ** (1 / 3)` is complex then)
+    return math.copysign(abs(value) ** (1 / 3), value)
+
+
+def _cubic(a: Rational, b: Rational, c: Rational, d: Rational) -> list[Rational | Decimal] | None:
+    # Solved as the depressed cubic t^3 + pt + q = 0, with x = t - shift
+    coefficients, shift = [a, b, c, d], b / (3 * a)
+    p = (3 * a * c - b * b) / (3 * a * a)
+    q = (2 * b ** 3 - 9 * a * b * c + 27 * a * a * d) / (27 * a ** 3)
+    discriminant = -(4 * p ** 3 + 27 * q * q)
+    if not discriminant:  # Repeated roots, which are all rational
+        return [-shift] if not p else [3 * q / p - shift, -3 * q / (2 * p) - shift]
+    try:
+        p_estimate, q_estimate = float(p), float(q)
+        if discriminant > 0:  # Three real roots, with the trigonometric method (the largest one is taken)
+            angle = math.acos(max(-1.0, min(1.0, 3 * q_estimate / (2 * p_estimate) * math.sqrt(-3 / p_estimate)))) / 3
+            estimate = 2 * math.sqrt(-p_estimate / 3) * math.cos(angle)
+        else:  # A single real root, with Cardano's formula
+            root = math.sqrt(q_estimate * q_estimate / 4 + p_estimate ** 3 / 27)
+            estimate = _cbrt(-q_estimate / 2 + root) + _cbrt(-q_estimate / 2 - root)
+        estimate -= float(shift)
+    except (OverflowError, ValueError, ZeroDivisionError):  # Too large for a float
+        return None
+    if not math.isfinite(estimate):
+        return None
+
+    root = _exact(_newton(coefficients, estimate), coefficients)
+    if discriminant < 0:
+        return [root]
+    # The other two roots are the ones of the quadratic left after dividing by (x - root)
+    if isinstance(root, Rational):
+        second = a * root + b
+        return [root] + _quadratic(a, second, second * root + c)
+    first, second = _decimal(a), _decimal(a) * root + _decimal(b)
+    constant = second * root + _decimal(c)
+    discriminant = max(second * second - 4 * first * constant, Decimal(0))  # Rounded, the cubic has three real roots
+    # Checked against the whole polynomial, the other roots can be rational even if this one isn't
+    return [root] + [_exact(other, coefficients) for other in _decimal_quadratic(first, second, constant, discriminant)]
+
+
+def _round(root: Rational | Decimal) -> Value | Fraction:
+    if isinstance(root, Rational):
+        return to_result(root, divided=True)
+    return _to_value(+root)  # Rounded to the current precision once
+
+
+def solve_polynomial(equation: CompleteEquation, variable: Variable) -> Result | None:
+    """Solves an equation of a single variable by lowering both sides into a polynomial and solving their difference
+    directly, in one pass over the equation. The equations up to the third degree are solved with a closed form, the
+    roots of higher degrees are approximated (see `root_finding` for the options). `Result.numeric` is set if any root
+    is an approximation (also an irrational root of a closed form). The real roots are returned like the cases of a
+    product equal to zero. Returns `None` if the equation isn't a polynomial one, or if a cubic is too large to be
+    solved here.
+
+    Raises `RootsNotConverged` if the roots of a polynomial above the third degree can't be approximated."""
+    tree = to_tree(equation)
+    if not isinstance(tree, Equation) or tree.relations != (Equals,):
+        return None
+    if (lhs := to_polynomial(tree.sides[0])) is None or (rhs := to_polynomial(tree.sides[1])) is None:
+        return None
+    difference = add_terms(lhs, rhs, sign=-1)  # difference = 0
+    degree = max(difference, default=0)
+    _log.info("Lowered into a polynomial of degree %s, got coefficients %s", degree, {e: str(c) for e, c in sorted(difference.items(), reverse=True)})
+
+    if degree == 0:
+        return Result({variable: NoSolution() if difference else TrueForAll(variable.name)})
+    if degree == 1:  # ax + b = 0
+        coefficient = difference[1]
+        return Result({variable: to_result(-difference.get(0, 0) / coefficient, abs(coefficient) != 1)})
+    coefficients = [difference.get(exponent, Rational(0)) for exponent in range(degree, -1, -1)]
+    complex_roots: list[complex] = []
+    with localcontext() as context:
+        context.prec = getcontext().prec + GUARD_DIGITS
+        if degree > 3:  # Approximated, the real roots are refined like the ones of a cubic
+            estimates, complex_roots = find_roots(simple := square_free(coefficients))
+            roots: list[Rational | Decimal] | None = [_exact(_newton(simple, estimate), simple) for estimate in estimates]
+            _log.info("Approximated the roots numerically, got %s real and %s complex roots", len(estimates), len(complex_roots))
+        else:
+            roots = _quadratic(*coefficients) if degree == 2 else _cubic(*coefficients)
+    if roots is None:
+        return None
+    result = Result({}).compare({variable: {_round(root) for root in dict.fromkeys(roots)} | set(complex_roots)}) if roots or complex_roots else Result({variable: NoSolution()})
+    result.numeric = degree > 3 or any(isinstance(root, Decimal) for root in roots)  # Irrational roots are approximated
+    return result
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, getcontext
+from fractions import Fraction as Rational
+from typing import Any, NamedTuple
+
+from numsy.parser import Num, Var, Pow, UnaryOp, Equation, Node, Value, to_tree, trampoline
+from numsy.parser.objects import _backend
+
+from .datatype import Maybe_RO
+from .errors import ExpressionTooComplex
+
+
+class Cost(NamedTuple):
+    magnitude: float  # Digits of the largest (or smallest) value, before or after the point
+    work: float  # Digit operations of the whole calculation
+
+
+# The default magnitude is the largest exponent of the default Decimal context, larger values overflow anyway
+DEFAULT_BUDGET = Cost(magnitude=999_999, work=10_000_000)
+_budget: ContextVar[Cost] = ContextVar("budget", default=DEFAULT_BUDGET)
+
+
+@contextmanager
+def cost_budget(magnitude: float | None = None, work: float | None = None) -> Iterator[None]:
+    """Solves the expressions inside the block with another budget, the ones over it raise `ExpressionTooComplex`. A
+    limit which isn't given keeps its current value."""
+    current = _budget.get()
+    token = _budget.set(Cost(current.magnitude if magnitude is None else magnitude, current.work if work is None else work))
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+def magnitude(value: Value) -> float:
+    # log10 of the absolute value, -inf for an exact zero (so a product with it stays a zero)
+    if not value:
+        return -math.inf
+    if isinstance(value, Rational):  # Both integers can be too large for a float
+        return math.log10(abs(value.numerator)) - math.log10(value.denominator)
+    if isinstance(value, Decimal) and abs(value.adjusted()) > 300:
+        return float(value.adjusted())
+    return math.log10(abs(value))
+
+
+def value_digits(size: float) -> float:
+    # Digits of a value before or after the point from its magnitude, a zero has none
+    return 0.0 if size == -math.inf else abs(size)
+
+
+def power_magnitude(base_magnitude: float, exponent_magnitude: float, exponent_sign: int | None = None) -> float:
+    # Magnitude of a power from the ones of its operands. An exponent with an unknown sign is taken as positive and
+    # growing the value away from 1 (the worst case), a negative one inverts the power.
+    if not base_magnitude or exponent_magnitude == -math.inf:  # 1 to any power, or anything to the power of 0
+        return 0.0
+    if base_magnitude == -math.inf:  # 0^-n fails in the solver, it isn't counted
+        return -math.inf if exponent_sign == 1 else 0.0
+    exponent = math.inf if exponent_magnitude > 300 else 10 ** exponent_magnitude
+    return abs(base_magnitude) * exponent if exponent_sign is None else base_magnitude * exponent * exponent_sign
+
+
+def sign(value: Value) -> int:
+    return -1 if value < 0 else 1
+
+
+def _estimate(node: Node, digits: int | None) -> Generator[Any, Any, tuple[float, int | None, float, float]]:
+    # The estimated log10 of the absolute value of the node with its sign (`None` if unknown), and the magnitude and
+    # the work of the node and everything inside of it. `digits` is the work of a single operation, `None` if it
+    # grows with the value (exact integers).
+    if isinstance(node, Num):
+        return (size := magnitude(node.value)), sign(node.value), value_digits(size), 0
+    if isinstance(node, Var):  # Unknown, counted like 1
+        return 0.0, None, 0, 0
+    if isinstance(node, UnaryOp):  # Only the sign changes
+        size, value_sign, *rest = yield _estimate(node.operand, digits)
+        return size, None if value_sign is None else -value_sign, *rest
+
+    if isinstance(node, Pow):
+        base, base_sign, *first = yield _estimate(node.base, digits)
+        exponent, exponent_sign, *second = yield _estimate(node.exponent, digits)
+        size, steps = power_magnitude(base, exponent, exponent_sign), power_steps(base, exponent)
+        value_sign = 1 if base_sign == 1 or base == -math.inf else None  # A negative base depends on the exponent
+    else:
+        left, left_sign, *first = yield _estimate(node.left, digits)
+        right, right_sign, *second = yield _estimate(node.right, digits)
+        if node.operator == "+":  # Cancellations aren't known, the largest operand is kept
+            size = max(left, right)
+            if left == -math.inf or right == -math.inf:  # Adding a zero keeps the other operand
+                value_sign = right_sign if left == -math.inf else left_sign
+            else:
+                value_sign = left_sign if left_sign == right_sign else None
+        else:
+            if left == -math.inf or right == -math.inf:  # A zero stays a zero, x/0 fails in the solver
+                size = -math.inf if left == -math.inf or node.operator == "*" else left
+            else:
+                size = left + right if node.operator == "*" else left - right
+            value_sign = None if left_sign is None or right_sign is None else left_sign * right_sign
+        steps = 1
+    return (size, value_sign, max(first[0], second[0], value_digits(size)),
+            first[1] + second[1] + operation_work(size, steps, digits))
+
+
+def power_steps(base_magnitude: float, exponent_magnitude: float) -> float:
+    # Exponentiation by squaring, one multiplication per bit of the exponent (a power of 1 or 0 is immediate)
+    return max(exponent_magnitude * math.log2(10), 0) + 1 if base_magnitude else 1
+
+
+def operation_work(size: float, steps: float, digits: int | None) -> float:
+    return (value_digits(size) + 1 if digits is None else digits) * steps
+
+
+def operation_digits() -> int | None:
+    if (backend := _backend.get()) == "exact":
+        return None  # Integers grow with the value
+    return getcontext().prec if backend == "decimal" else 1  # A Decimal keeps `prec` digits, a float is constant
+
+
+def estimate_cost(tree: Node | Equation) -> Cost:
+    """Estimates the size of the values and the work of calculating an expression (or every side of an equation),
+    without calculating anything. The estimate follows the magnitude (log10) of the values through the operations, the
+    powers make it grow the fastest."""
+    digits = operation_digits()
+    costs = [trampoline(_estimate(side, digits)) for side in (tree.sides if isinstance(tree, Equation) else [tree])]
+    return Cost(max(largest for *_, largest, _ in costs), sum(work for *_, work in costs))
+
+
+def preflight(equation: Maybe_RO):
+    """Rejects an equation which is too expensive to solve with the current budget (see `cost_budget`), by raising
+    `ExpressionTooComplex` before any calculation starts."""
+    cost, budget = estimate_cost(to_tree(equation)), _budget.get()
+    if cost.magnitude > budget.magnitude or cost.work > budget.work:
+        raise ExpressionTooComplex(cost, budget)
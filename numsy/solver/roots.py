@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import cmath
+import math
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fractions import Fraction as Rational
+from typing import NamedTuple
+
+from .errors import RootsNotConverged
+
+
+class RootOptions(NamedTuple):
+    tolerance: float  # Largest relative change of a root in the last iteration
+    max_iterations: int
+    complex_roots: bool  # Whether the complex roots are returned too, only the real ones are by default
+
+
+DEFAULT_OPTIONS = RootOptions(tolerance=1e-12, max_iterations=500, complex_roots=False)
+_options: ContextVar[RootOptions] = ContextVar("root_options", default=DEFAULT_OPTIONS)
+
+
+@contextmanager
+def root_finding(tolerance: float | None = None, max_iterations: int | None = None, complex_roots: bool | None = None) -> Iterator[None]:
+    """Finds the roots of the polynomials inside the block (the ones above the third degree, which have no closed form
+    here) with other options. An option which isn't given keeps its current value."""
+    current = _options.get()
+    token = _options.set(RootOptions(
+        current.tolerance if tolerance is None else tolerance,
+        current.max_iterations if max_iterations is None else max_iterations,
+        current.complex_roots if complex_roots is None else complex_roots,
+    ))
+    try:
+        yield
+    finally:
+        _options.reset(token)
+
+
+# The polynomials are dense lists of exact coefficients here, from the highest degree to the constant
+def _strip(polynomial: list[Rational]) -> list[Rational]:
+    index = 0
+    while index < len(polynomial) - 1 and not polynomial[index]:
+        index += 1
+    return polynomial[index:]
+
+
+def _divide(dividend: list[Rational], divisor: list[Rational]) -> tuple[list[Rational], list[Rational]]:
+    # Long division, returns the quotient and the remainder
+    remainder, quotient = list(dividend), []
+    for index in range(len(dividend) - len(divisor) + 1):
+        quotient.append(factor := remainder[index] / divisor[0])
+        if factor:
+            for offset, coefficient in enumerate(divisor):
+                remainder[index + offset] -= factor * coefficient
+    return quotient or [Rational(0)], _strip(remainder[len(quotient):] or [Rational(0)])
+
+
+def _derivative(polynomial: list[Rational]) -> list[Rational]:
+    degree = len(polynomial) - 1
+    return [coefficient * (degree - index) for index, coefficient in enumerate(polynomial[:-1])] or [Rational(0)]
+
+
+def _primitive(polynomial: list[Rational]) -> list[Rational]:
+    # Divided by the absolute value of its leading coefficient, so the signs are kept and the numbers stay small
+    return [coefficient / abs(polynomial[0]) for coefficient in polynomial]
+
+
+def _gcd(first: list[Rational], second: list[Rational]) -> list[Rational]:
+    while any(second):
+        remainder = _divide(first, second)[1]
+        first, second = second, _primitive(remainder) if any(remainder) else [Rational(0)]
+    return first
+
+
+def square_free(polynomial: list[Rational]) -> list[Rational]:
+    """The polynomial with every repeated root kept once (divided by its gcd with its derivative), it has the same
+    roots, all simple."""
+    divisor = _gcd(polynomial, _derivative(polynomial))
+    return _primitive(_divide(polynomial, divisor)[0]) if len(divisor) > 1 else polynomial
+
+
+def count_real_roots(polynomial: list[Rational]) -> int:
+    """Counts the distinct real roots with a Sturm sequence, exactly."""
+    sequence = [polynomial, _derivative(polynomial)]
+    while len(sequence[-1]) > 1 and any(remainder := _divide(sequence[-2], sequence[-1])[1]):
+        sequence.append(_primitive([-coefficient for coefficient in remainder]))
+    # The sign at +∞ is the one of the leading coefficient, at -∞ it changes with odd degrees
+    return _sign_changes([(item[0] > 0) == (len(item) % 2 == 1) for item in sequence]) - _sign_changes([item[0] > 0 for item in sequence])
+
+
+def _sign_changes(signs: list[bool]) -> int:
+    return sum(first != second for first, second in zip(signs, signs[1:]))
+
+
+def _aberth(coefficients: list[complex], options: RootOptions) -> list[complex]:
+    # Aberth–Ehrlich iteration, every root is corrected with Newton's step and pushed away from the other roots
+    degree = len(coefficients) - 1
+    derivative = [coefficient * (degree - index) for index, coefficient in enumerate(coefficients[:-1])]
+    # The roots start on a circle of the Cauchy bound (every root is inside of it), with an angle so none is real
+    radius = 1 + max(abs(coefficient) for coefficient in coefficients[1:])
+    radius = min(radius, 2 * max(abs(coefficient) ** (1 / (index + 1)) for index, coefficient in enumerate(coefficients[1:])))
+    roots = [radius * cmath.exp(1j * (2 * math.pi * k / degree + 0.4)) for k in range(degree)]
+    for _ in range(options.max_iterations):
+        converged = True
+        for i, root in enumerate(roots):
+            value = derivative_value = 0j
+            for coefficient in coefficients:
+                value = value * root + coefficient
+            for coefficient in derivative:
+                derivative_value = derivative_value * root + coefficient
+            if not value:  # Exactly a root
+                continue
+            ratio = value / derivative_value if derivative_value else value  # Moved by the value on a flat point
+            repulsion = sum(1 / (root - other) for j, other in enumerate(roots) if j != i and root != other)
+            step = ratio / denominator if (denominator := 1 - ratio * repulsion) else ratio
+            roots[i] = root - step
+            converged = converged and abs(step) <= options.tolerance * (1 + abs(root))
+        if converged:
+            return roots
+    raise RootsNotConverged(options.max_iterations)
+
+
+def find_roots(polynomial: list[Rational]) -> tuple[list[float], list[complex]]:
+    """Approximates the roots of a polynomial with exact coefficients and simple roots (see `square_free`), returns its
+    real roots and the complex ones (only if `complex_roots` is enabled, see `root_finding`). The real roots are only
+    estimates, the solver calculates them with more digits."""
+    options = _options.get()
+    if len(polynomial) == 2:
+        return [float(-polynomial[1] / polynomial[0])], []
+    real = count_real_roots(polynomial)
+    try:  # Monic, so the coefficients fit in a float more often
+        roots = _aberth([complex(coefficient / polynomial[0]) for coefficient in polynomial], options)
+    except (OverflowError, ZeroDivisionError):
+        raise RootsNotConverged(0) from None
+    roots.sort(key=lambda root: abs(root.imag))  # The real roots are the closest ones to the real axis
+    complex_roots = [root for root in roots[real:] if root.imag > 0] if options.complex_roots else []
+    return [root.real for root in roots[:real]], [root for pair in complex_roots for root in (pair, pair.conjugate())]
@@ -1,14 +1,14 @@
-from collections import Counter
-from collections.abc import Iterable
 from decimal import Decimal
-from typing import overload, Literal, cast
+from math import gcd
+from typing import cast
 
-from numsy.parser import Group, Operator, Equals, Number, ParenthesizedGroup, Fraction, RelationalOperator, Variable
-from numsy.parser import gts
+from numsy.parser import Group, Operator, Equals, Number, ParenthesizedGroup, Fraction, RelationalOperator, Variable, Value
+from numsy.parser import gts, copy_equation
 
 from .core import Positions, Result, TrueForAll
 from .datatype import No_RO, CompleteEquation
 from .logging import _log
+from .memo import MISSING, _memo
 from .utility import determine_equation_type
 
 
@@ -30,52 +30,50 @@ def allowed_addition(parsed_group: No_RO, i: int):  # This should be refactored
     return is_not_after_mul and is_not_before_mul
 
 
-def clean_deletion(parsed_group: No_RO, index: int, first_element: int | None):
+def clean_deletion(positions: Positions, index: int, first_element: int | None):
     # Delete object with given index safely (removes addition sign)
     # `index` is the index of object to delete, while `first_element` is the index of main object
+    parsed_group = positions.groups
     if not len(parsed_group):
         return
     if index == 0 and index != first_element:  # First object in the list
-        return parsed_group.pop(index)
+        return positions.delete(index)
     if index != first_element and parsed_group[index - 1] == Operator.Add:
-        parsed_group.pop(index - 1)
+        positions.delete(index - 1)
 
 
-def safe_delete_addition(groups: CompleteEquation | No_RO, index: int, is_deleted: bool = True):
+def safe_delete_addition(positions: Positions, index: int, is_deleted: bool = True):
     # Safe delete an object at given index (delete addition sign that wraps the object)
+    groups = positions.groups
     if not is_deleted:
-        del groups[index]
+        positions.delete(index)
     if groups[index - 1] == Operator.Add:  # Even if idx = 0, means lhs[-1] will not be an Operator
-        del groups[index - 1]
+        positions.delete(index - 1)
     # The order shifts one time to the left, so adjust based on that
     if index == 0 and len(groups) > 1 and groups[0] == Operator.Add:
-        del groups[index]
+        positions.delete(index)
     return groups
 
 
 def combine_similar_groups(parsed_group: No_RO):
     # Combine all similar groups (same variable and power) on one side
     positions = Positions(parsed_group)
-    done = set()
     for key in list(positions.variable_groups.keys()):  # Iterate until there's only 1 group left of each kind
-        if key in done:  # This key has already been checked
+        if not (indexes := positions.variable_groups.get(key)):  # Every group of this kind was combined
             continue
-        done.add(key)
-        positions.update_data(parsed_group)
-        variables = positions.variable_groups
-        indexes = list(reversed(variables[key]))
-        first_element = variables[key][0]
-        iterate_times = 0
-        for index in indexes:
+        first_element = indexes[0]
+        total = key.get_value()
+        deleted: list[int] = []  # Deleted at once, with the addition signs before them (like `clean_deletion`)
+        for index in reversed(indexes):
             if allowed_addition(parsed_group, index):
-                group = cast(Group, parsed_group.pop(index))
-                coefficient = group.get_value()
-                key.number = Number.from_data(key.get_value() + coefficient)
-                clean_deletion(parsed_group, index, first_element)
-                iterate_times += 1
-        if iterate_times != 0:  # That means we have combined something, we don't want to keep junk group and log here
-            parsed_group.insert(first_element, key)
-            _log.info("Finished combining key '%s', got '%s' as the result", _log_key(key), gts(parsed_group))
+                total = total + cast(Group, parsed_group[index]).get_value()  # type: ignore
+                deleted.append(index)
+                if index != first_element and parsed_group[index - 1] == Operator.Add:
+                    deleted.append(index - 1)
+        if deleted:  # That means we have combined something, we don't want to keep junk group and log here
+            positions.delete_many(deleted)  # All of them are after the first element
+            positions.insert(first_element, combined := Group.from_data(Number.from_data(total), key.variable, power=key.power))
+            _log.info("Finished combining key '%s', got '%s' as the result", _log_key(combined), gts(parsed_group))
 
     return parsed_group
 
@@ -83,25 +81,18 @@ def combine_similar_groups(parsed_group: No_RO):
 def merge_lhs_and_rhs(lhs: No_RO, rhs: No_RO) -> CompleteEquation | TrueForAll:
     # Merge lhs to rhs
     lhs_pos, rhs_pos = Positions(lhs), Positions(rhs)
-    for key in set(list(lhs_pos.variable_groups) + list(rhs_pos.variable_groups)):
-        lhs_pos.update_data(lhs)
-        rhs_pos.update_data(rhs)
-        lhs_variables, rhs_variables = lhs_pos.variable_groups, rhs_pos.variable_groups
+    lhs_variables, rhs_variables = lhs_pos.variable_groups, rhs_pos.variable_groups  # Kept up to date by the positions
+    for key in set(list(lhs_variables) + list(rhs_variables)):
         if key.variable is None:  # Design: Non-variable group should be on the right hand side
             # There should always be one group only here, the non-variable group
-            if (lhs_index := lhs_variables.get(key)) is not None and allowed_addition(lhs, lhs_index[0]):
+            if (lhs_index := lhs_variables.get(key)) is not None and allowed_addition(lhs, index := lhs_index[0]):
                 try:
                     rhs_group = cast(Group, rhs[rhs_variables[key][0]])
                 except KeyError:
                     continue
-                if key not in rhs_variables:
-                    if not rhs[-1] == Operator.Add:  # Maybe useful
-                        rhs.append(Operator.Add)
-                    rhs.insert(x := len(rhs), key)  # Create a new group at the end of rhs if not exist
-                    rhs_variables[key] = [x]
-                result = rhs_group.get_value() - cast(Group, lhs.pop(lhs_index[0])).get_value()
+                result = rhs_group.get_value() - cast(Group, lhs_pos.delete(index)).get_value()  # type: ignore
                 rhs_group.number = Number.from_data(result)
-                clean_deletion(lhs, lhs_index[0], -1)
+                clean_deletion(lhs_pos, index, -1)
                 _log.info("Finished merging non-variable group, got '%s'", gts(lhs + [Equals] + (rhs or [Group()])))
         else:
             try:
@@ -109,27 +100,23 @@ def merge_lhs_and_rhs(lhs: No_RO, rhs: No_RO) -> CompleteEquation | TrueForAll:
             except KeyError:
                 continue
             if (rhs_index := rhs_variables.get(key)) is not None:
-                if key not in lhs_variables:
-                    if not lhs[-1] == Operator.Add:  # Maybe useful
-                        lhs.append(Operator.Add)
-                    lhs.insert(x := len(lhs), key)  # Create a new group at the end of lhs if not exist
-                    lhs_variables[key] = [x]
                 if lhs == rhs:  # A pretty common case where there are infinite number of solutions
                     return TrueForAll(key.variable.name)
-                result = lhs_group.get_value() - cast(Group, rhs.pop(rhs_index[0])).get_value()
+                index = rhs_index[0]
+                result = lhs_group.get_value() - cast(Group, rhs_pos.delete(index)).get_value()  # type: ignore
                 lhs_group.number = Number.from_data(result)
-                clean_deletion(rhs, rhs_index[0], -1)
+                clean_deletion(rhs_pos, index, -1)
                 # If result is 0, then check if any variable still exist in the equation.
                 # If none exist, don't delete the 0x, otherwise delete it
-                del lhs[idx]  # Delete, so the contains_variable check ignores it. Can't think of a better way.
+                lhs_pos.delete(idx)  # Delete, so the contains_variable check ignores it. Can't think of a better way.
                 if result == 0 and any([g.contains_variable for g in lhs + rhs if not isinstance(g, (Operator, RelationalOperator))]):
-                    lhs = safe_delete_addition(lhs, idx)
+                    safe_delete_addition(lhs_pos, idx)
                 else:
-                    lhs.insert(idx, lhs_group)
+                    lhs_pos.insert(idx, lhs_group)
 
             _log.info("Finished merging variable group '%s', got '%s'", _log_key(key), gts(lhs + [Equals] + (rhs or [Group()])))
         if not rhs:  # Case like `x + 3 = ` might happen
-            rhs.append(Group())
+            rhs_pos.insert(0, Group())
     return lhs + [Equals] + rhs
 
 
@@ -150,54 +137,50 @@ def join_chained_groups(groups: No_RO) -> No_RO:
     return new
 
 
-@overload
-def get_common_factors(groups: No_RO, highest: Literal[False]) -> list[int]: ...
-@overload
-def get_common_factors(groups: No_RO, highest: Literal[True] = True) -> int: ...
-@overload
-def get_common_factors(groups: No_RO, highest: bool = ...) -> int | list[int]: ...
+def _integer(value: Value) -> int | None:
+    # The value as an integer, or `None` if it isn't one (a decimal, infinity or NaN)
+    try:
+        return int(value) if value % 1 == 0 else None
+    except (ArithmeticError, ValueError):
+        return None
 
 
-def get_common_factors(groups: No_RO, highest: bool = True) -> int | list[int]:
-    factors: list[int] = []
-    checked_group = 0
-    index = -1
-    for group in groups:
-        index += 1
+def get_common_factor(groups: No_RO) -> int:
+    """The greatest common factor of the coefficients of the groups, the ones inside parentheses and the numerators of
+    the fractions included. It's the gcd of the coefficients, so their size isn't limited. Returns 1 if a coefficient
+    isn't an integer, and 0 if every coefficient is zero (which any factor divides)."""
+    factor = 0
+    for index, group in enumerate(groups):
         if isinstance(group, ParenthesizedGroup):
-            factors += get_common_factors(group.groups, highest=False)
+            coefficient = get_common_factor(group.groups)
         elif isinstance(group, Group):
             if groups[index - 1] == Operator.Mul:  # Will not raise IndexError because last group shouldn't be operator
-                continue  # Don't increment checked_group for chained multiplications
-            try:
-                # Maybe deal common factors differently for Groups with exponent
-                # For example 25 ^ 25 = 625 but there's 125 as a factor of 625 which isn't a factor of 25
-                factors += group.number.factors
-            except ValueError:
-                return 1 if highest else [1]
+                continue  # Only the first group of chained multiplications is divided
+            # Maybe deal common factors differently for Groups with exponent
+            # For example 25 ^ 25 = 625 but there's 125 as a factor of 625 which isn't a factor of 25
+            if (coefficient := _integer(group.number.value)) is None:
+                return 1
         elif isinstance(group, Fraction):
-            factors += get_common_factors(group.numerator, highest=False)
+            coefficient = get_common_factor(group.numerator)
         else:  # Operator
             continue
-        checked_group += 1
-    common_factors = [item for item, count in Counter(factors).items() if count == checked_group]  # Always in order
-    return max(common_factors or [1]) if highest else common_factors
+        if (factor := gcd(factor, coefficient)) == 1:  # It can't get any lower
+            return 1
+    return factor
 
 
-def divide_multiplications(groups: No_RO, divisor: int | Decimal) -> No_RO:
+def divide_multiplications(groups: No_RO, divisor: Value | int) -> No_RO:
     # This should already be only the multiplications, no other operators
     # For example: 5x * 3x * 10x, divisor = 5 become x * 3x * 10x
+    # Any group which is a multiple of the divisor is divided, zero and the negative ones too (-10x * 3 -> -2x * 3)
     for group in groups:
-        if isinstance(group, Group):
-            if (coefficient := group.number.value) >= divisor and coefficient / divisor % 1 == 0:
-                group.number.value /= divisor
-                return groups
-            elif (coefficient := group.number.value) < divisor and coefficient / divisor % 1 == 0:
-                continue
+        if isinstance(group, Group) and group.number.value / divisor % 1 == 0:  # type: ignore
+            group.number.value /= divisor  # type: ignore
+            return groups
     raise TypeError("This is a bug. This function should only be called when a common factor is found.")
 
 
-def _divide(group: Group, divisor: int | Decimal, power: Group | None = None, override: bool = False) -> No_RO:
+def _divide(group: Group, divisor: Value | int, power: Group | None = None, override: bool = False) -> No_RO:
     power = power or cast(Group, group.power[0])
     if not override and divisor == abs(int(group.number.value)):  # For example: (5^3)/(5) is equals (5^2)/(5)
         power.number.integer -= 1  # Cases like (-5^2)/(5) should be handled as -(5^2)/(5)
@@ -212,7 +195,7 @@ def _divide(group: Group, divisor: int | Decimal, power: Group | None = None, ov
     return result
 
 
-def divide_powered_group(group: Group | ParenthesizedGroup, divisor: int | Decimal) -> No_RO:
+def divide_powered_group(group: Group | ParenthesizedGroup, divisor: Value | int) -> No_RO:
     # Divide powered groups by a divisor
     if not group.power:
         return [group]
@@ -225,7 +208,7 @@ def divide_powered_group(group: Group | ParenthesizedGroup, divisor: int | Decim
         a = join_chained_groups(chain)
         return a
     group.power = combine_similar_groups(group.power)
-    if isinstance((g := group.power[0]), Group) and g.number.value % 1 == 0 and group.number.value % divisor == 0:
+    if isinstance((g := group.power[0]), Group) and g.number.value % 1 == 0 and group.number.value % divisor == 0:  # type: ignore
         # NOTE: Here, 5x^2 should be treated as 5 * x^2 -> x^2, not (5x)^2. This is a common mistake.
         if group.variable:
             raise TypeError("Variables should not enter here.")
@@ -234,25 +217,23 @@ def divide_powered_group(group: Group | ParenthesizedGroup, divisor: int | Decim
         raise NotImplementedError("Shouldn't reach here, this is a bug.")
 
 
-def divide_all(groups: No_RO, divisor: int | Decimal) -> No_RO:
+def divide_all(groups: No_RO, divisor: Value | int) -> No_RO:
     # Divide every group in a side by a divisor
     new = []
     index = -1
     skip = 0
     for group in groups:
+        index += 1  # The skipped groups are counted too, it's always the index of `group`
         if skip > 0:
             skip -= 1
             continue
-        index += 1
-        if isinstance(group, (Operator, Fraction)):
+        if isinstance(group, Operator):
+            new.append(group)
+            continue
+        if isinstance(group, Fraction):  # The common factor includes the numerator, so only the numerator is divided
+            group.numerator = divide_all(group.numerator, divisor=divisor)
             new.append(group)
             continue
-        if isinstance(group, Fraction):
-            # Awaiting test case
-            if o := overlapping_common_factors(get_common_factors(group.numerator, highest=False), Number.from_data(divisor).factors):
-                group.numerator = divide_all(group.numerator, divisor=o)
-            if not divisor or divisor != o:  # At least one of the if-statements should be executed
-                group.denominator = multiply_all(group.numerator, multiplier=divisor//o)
         if group.power:  # In case of like 5^2, fallback to divide_powered_group
             if not (isinstance(group, Group) and group.variable):  # We shouldn't solve variables with power here
                 new += divide_powered_group(group, divisor=divisor)
@@ -272,7 +253,7 @@ def divide_all(groups: No_RO, divisor: int | Decimal) -> No_RO:
                 skip = len(chain_mul) - 1
                 continue
             else:
-                group.number.value /= divisor
+                group.number.value /= divisor  # type: ignore
         new.append(group)
     return new
 
@@ -280,12 +261,8 @@ def divide_all(groups: No_RO, divisor: int | Decimal) -> No_RO:
 def divide_both_side(groups: CompleteEquation, divisor: int | None = None) -> CompleteEquation:
     # Divide both side by a common factor
     lhs, rhs = separate_lhs_rhs(groups)
-    c_factors = get_common_factors(lhs, highest=False) + get_common_factors(rhs, highest=False)
-    if divisor is None:
-        try:
-            divisor = max([item for item, count in Counter(c_factors).items() if count == 2])
-        except ValueError:  # That means common factor count of one of the sides is 0, nothing to divide with
-            return groups
+    if divisor is None and (divisor := gcd(get_common_factor(lhs), get_common_factor(rhs))) in (0, 1):
+        return groups  # Every coefficient is zero, or there's no common factor to divide with
     result: CompleteEquation = divide_all(lhs, divisor) + [Equals] + divide_all(rhs, divisor)
     _log.info("Finished dividing groups with similar coefficient (%s), got '%s'", divisor, gts(result))
 
@@ -304,14 +281,14 @@ def calculate_non_groups_muls(groups: CompleteEquation):
             if (before.variable is not None and after.variable is not None) and before.variable != after.variable:
                 raise NotImplementedError  # Support for example 5x * 3y
             variable = before.variable or after.variable
-            new = Group.from_value(value=after.get_value() * before.get_value(), variable=variable)
+            new = Group.from_value(value=after.get_value() * before.get_value(), variable=variable)  # type: ignore
             del groups[index - 1], groups[index - 1], groups[index - 1]  # When deleting, items shift to the left
             groups.insert(index - 1, new)
     _log.info("Finished calculating multiplications, got '%s'", gts(groups))
     return groups
 
 
-def multiply_all(groups: CompleteEquation | No_RO, multiplier: int | Decimal) -> CompleteEquation:
+def multiply_all(groups: CompleteEquation | No_RO, multiplier: Value | int) -> CompleteEquation:
     # Currently only works for non-variable multiplier
     is_on_chain = False
     new = []
@@ -320,9 +297,9 @@ def multiply_all(groups: CompleteEquation | No_RO, multiplier: int | Decimal) ->
     for group in groups:
         if isinstance(group, Group):
             if not is_on_chain:  # For example: 5x * 3 * 2 (mult=3) should be treated as 15x * 3 * 2, not 15x * 9 * 6
-                group.number.value *= multiplier
+                group.number.value *= multiplier  # type: ignore
         elif isinstance(group, Fraction):
-            if multiplier in get_common_factors(group.denominator, highest=False):
+            if (factor := get_common_factor(group.denominator)) and (integer := _integer(multiplier)) and integer > 0 and factor % integer == 0:
                 # For example: 5x/10 (mult=5) should be treated as 5x/2
                 group.denominator = divide_all(group.denominator, divisor=multiplier)
                 if cast(Group, group.denominator[0]).number.integer == 1:
@@ -334,7 +311,7 @@ def multiply_all(groups: CompleteEquation | No_RO, multiplier: int | Decimal) ->
                 group.groups = multiply_all(group.groups, multiplier=multiplier)
             if group.power:
                 raise NotImplementedError("ParenthesizedGroups with exponent is not supported yet.")
-        elif isinstance(group, Operator):
+        elif isinstance(group, (Operator, RelationalOperator)):  # The chain ends at the relational operator too
             is_on_chain = True if group == Operator.Mul else False
         new.append(group)
     return new
@@ -343,6 +320,12 @@ def multiply_all(groups: CompleteEquation | No_RO, multiplier: int | Decimal) ->
 def simplify_side(positions: Positions):
     groups = positions.groups
     initial = gts(groups)
+    memo = _memo.get()
+    key = ("side", memo.identify(groups)) if memo is not None else None
+    if memo is not None:  # An identical side was already simplified, it's copied
+        if (simplified := memo.get(key)) is not MISSING:
+            _log.info("SIDE '%s' WAS ALREADY SIMPLIFIED, got '%s'.", initial, gts(simplified))
+            return copy_equation(simplified)
     _log.info("START OF SIMPLIFYING SIDE '%s'.", initial)
     if positions.fractions:  # Multiply every group by every fraction's denominator
         groups = calculate_fractions(groups)
@@ -352,23 +335,17 @@ def simplify_side(positions: Positions):
     groups = clean_parenthesized_groups(Positions(groups))
     _log.info("Combined all similar groups in side '%s', got '%s'.", initial, gts(groups))
     _log.info("END OF SIMPLIFYING SIDE '%s', got '%s'.", initial, gts(groups))
+    if memo is not None:
+        memo.set(key, copy_equation(groups))  # The groups are modified in place by the solver
     return groups
 
 
-def overlapping_common_factors(*factors: Iterable[int]) -> int:
-    total_factors = []
-    for f in factors:
-        total_factors.extend(f)
-    if overlap := (x for x in total_factors if total_factors.count(x) == len(factors)):
-        return max(overlap)
-    return 0
-
-
 def calculate_fractions(groups: CompleteEquation):
     positions = Positions(groups)
-    frac_pos = positions.fractions.values()
+    frac_pos = [index for _, index in positions.fractions]
     for index in frac_pos:
-        fraction = cast(Fraction, groups[index])
+        if not isinstance(fraction := groups[index], Fraction):  # Its denominator was cancelled by `multiply_all` already
+            continue
         initial = gts([fraction])  # For logging purposes
         fraction.denominator = deno = simplify_side(Positions(fraction.denominator))
         fraction.numerator = num = simplify_side(Positions(fraction.numerator))
@@ -377,11 +354,11 @@ def calculate_fractions(groups: CompleteEquation):
         deno_coefficient = deno[0].number.value
         to_divide = 1
         # Check if there's a common factor between numerator and denominator
-        if numerator_factors := get_common_factors(num, highest=False):
-            if numerator_factors[-1] % deno[0].number.value == 0:
+        if numerator_factor := get_common_factor(num):
+            if numerator_factor % deno_coefficient == 0:
                 to_divide = deno_coefficient
             else:
-                to_divide = overlapping_common_factors(get_common_factors(deno, highest=False), numerator_factors)
+                to_divide = gcd(numerator_factor, get_common_factor(deno))
 
         if to_divide == 1:  # There is no common factor
             groups = multiply_all(groups, multiplier=deno_coefficient)  # Assume there's no variable in deno
@@ -403,7 +380,7 @@ def calculate_fractions(groups: CompleteEquation):
 def simplify_equation(groups: CompleteEquation, positions: Positions) -> CompleteEquation | Result:
     if positions.fractions:  # Multiply every group by every fraction's denominator
         groups = calculate_fractions(groups)
-    if (factor := get_common_factors(groups=groups, highest=True)) != 1:  # Speed things up
+    if (factor := get_common_factor(groups)) > 1:  # Speed things up
         groups = divide_both_side(groups, factor)  # Divide both side with a common factor
     groups = calculate_non_groups_muls(groups)  # Multiply groups which can be multiplied
     positions.update_data(groups)
@@ -440,6 +417,18 @@ def side_equals_zero(positions: Positions) -> tuple[bool, No_RO | None]:  # Retu
 
 
 def clean_parenthesized_groups(positions: Positions) -> CompleteEquation:
+    if (memo := _memo.get()) is None:
+        return _clean_parenthesized_groups(positions)
+    # Identical groups were already cleaned, the result is copied
+    if (cleaned := memo.get(key := ("clean", memo.identify(positions.groups)))) is not MISSING:
+        positions.update_data(new := copy_equation(cleaned))
+        return new
+    new = _clean_parenthesized_groups(positions)
+    memo.set(key, copy_equation(new))  # The groups are modified in place by the solver
+    return new
+
+
+def _clean_parenthesized_groups(positions: Positions) -> CompleteEquation:
     new: CompleteEquation = []
     index = -1
     pending_multiplier = False
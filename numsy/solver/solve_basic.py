@@ -1,12 +1,18 @@
-from decimal import Decimal
-from typing import cast
+import math
 
-from numsy.parser import Group, Operator, Fraction, ParenthesizedGroup, Number
-from numsy.parser import gts, truncate_trailing_zero
+from collections.abc import Generator
+from decimal import Decimal, Inexact, InvalidOperation, Overflow, Rounded, getcontext
+from fractions import Fraction as Rational
+from typing import Any, cast
+
+from numsy.parser import Group, Operator, Fraction, ParenthesizedGroup, Number, Value
+from numsy.parser.objects import _is_signed
+from numsy.parser import gts, trampoline
 
 from .core import Positions
 from .datatype import No_RO
 from .logging import _log
+from .memo import MISSING, _memo
 
 
 def convert_fraction_to_division(positions: Positions) -> No_RO:
@@ -19,7 +25,54 @@ def convert_fraction_to_division(positions: Positions) -> No_RO:
     return new
 
 
-def create_new_group(v1: Decimal, v2: Decimal | None = None, operator: Operator | None = None, power: No_RO | None = None):
+def _decimal_power(base: Decimal, exponent: Decimal) -> Decimal:
+    if exponent != exponent.to_integral_value():  # Roots and other fractional exponents
+        return base ** exponent
+    context = getcontext()
+    bits = context.prec * 3  # The bits of an integer which always fits in the precision
+    if base and 0 <= exponent <= bits and base.adjusted() < context.prec and base == base.to_integral_value():
+        if int(exponent) * int(base).bit_length() <= bits:
+            return Decimal(int(base) ** int(exponent))  # Exact
+    # Otherwise calculated with extra digits and rounded once, a single `**` is sometimes off by one in the last digit
+    extra = context.copy()
+    extra.prec += 20
+    extra.clear_flags()
+    result = extra.power(base, exponent)
+    if extra.flags[Inexact]:
+        context.flags[Inexact] = context.flags[Rounded] = True
+    return context.create_decimal(result)  # Unlike `plus`, keeps the sign of a zero
+
+
+def _float_power(base: float, exponent: float) -> float:
+    if base and base.is_integer() and exponent.is_integer() and abs(exponent) * math.log2(abs(base)) < 1000:
+        # With integers, so the result is rounded once (`math.pow` is sometimes off by one in the last bit)
+        result = int(base) ** int(abs(exponent))
+        return float(result) if exponent >= 0 else 1 / result
+    return math.pow(base, exponent)  # Raises instead of returning a complex number for roots of negative numbers
+
+
+def calculate_power(base: Value, exponent: Value) -> Value:
+    if isinstance(base, Decimal):
+        return _decimal_power(base, cast(Decimal, exponent))
+    if not base and not exponent:  # Undefined, like for Decimal
+        raise InvalidOperation("0 ** 0 is undefined.")
+    if isinstance(base, float):
+        return _float_power(base, cast(float, exponent))
+    exponent = cast(Rational, exponent)
+    # Decimal overflows past its largest exponent, the integers of an exact result would grow without a limit instead
+    bits = abs(base.numerator.bit_length() - base.denominator.bit_length())  # About log2(|base|)
+    if abs(exponent) * bits > getcontext().Emax * math.log2(10):
+        raise Overflow(f"Cannot calculate the expression, {base} ** {exponent} is too large.")
+    if exponent.denominator != 1:
+        # Roots aren't rational, they're calculated with Decimal and converted back (the result is exact from here on)
+        result = (Decimal(base.numerator) / base.denominator) ** (Decimal(exponent.numerator) / exponent.denominator)
+        if not result.is_finite():
+            raise OverflowError(f"Cannot calculate the expression, got {result}.")
+        return Rational(result)
+    return base ** exponent
+
+
+def create_new_group(v1: Value, v2: Value | None = None, operator: Operator | None = None, power: No_RO | None = None):
     if v2 is None and operator is None:
         result = v1
     elif operator is None:
@@ -28,71 +81,102 @@ def create_new_group(v1: Decimal, v2: Decimal | None = None, operator: Operator
         raise TypeError("Parameter 'operator' must not be given if parameter 'rv2' is not given.")
     else:
         match operator.symbol:
-            case "*": result = v1 * v2
-            case "/": result = v1 / v2
-            case "+": result = v1 + v2
+            case "*": result = v1 * v2  # type: ignore
+            case "/": result = v1 / v2  # type: ignore
+            case "+": result = v1 + v2  # type: ignore
             case _: raise TypeError("Unsupported operator.")
-    try:
-        whole, dec = f"{result.normalize():f}".split(".")
-    except ValueError:
-        whole, dec = str(truncate_trailing_zero(result)), 0
-    num = Number.from_data(value=abs(Decimal(whole)), decimal=f"0.{dec}", is_negative=whole[0] == "-")
-    group = Group.from_data(num)
+    if isinstance(result, Decimal):
+        if not result.is_finite():
+            raise OverflowError(f"Cannot calculate the expression, got {result}.")
+        result = result.normalize()
+    elif isinstance(result, float) and not math.isfinite(result):
+        raise OverflowError(f"Cannot calculate the expression, got {result}.")
+    group = Group.from_data(Number.from_data(result, is_negative=_is_signed(result)))  # Exact values aren't normalized
     if power is not None:
         group.power = power
     return group
 
 
-def combine_groups(positions: Positions, parsed_groups: No_RO, is_addition: bool):
-    # If is_addition is True, Operator will be "+" else it is mul_and_div
-    if not is_addition:
-        index, operator = list(positions.get_mul_div_pos().items())[0]
-    elif is_addition:
-        operator = Operator.Add
-        index = positions.operators[operator][0]
-    else:
-        raise NotImplementedError
-    before = cast(Group, parsed_groups[index - 1]).get_value()
-    after = cast(Group, parsed_groups[index + 1]).get_value()
-    parsed_groups.insert(index - 1, create_new_group(before, after, operator))
-    del parsed_groups[index:index + 3]
-
-
-def solve_basic(parsed_groups: No_RO) -> Decimal:
+def combine_operators(parsed_groups: No_RO) -> No_RO:
+    # Single pass over the groups: multiplications and divisions are calculated from left to right while reading a term,
+    # the terms are added together at the end. Returns the list with the remaining group (empty if there's nothing).
+    terms: list[Group] = []
+    term: Group | None = None
+    operator: Operator | None = None
+    for group in parsed_groups:
+        if isinstance(group, Operator):
+            if term is None or operator is not None:
+                raise NotImplementedError("There's a bug here or the input is invalid")
+            operator = group
+            continue
+        group = cast(Group, group)
+        if term is None:
+            term = group
+        elif operator is None:  # Two groups next to each other, the equation wasn't cleaned
+            raise NotImplementedError("There's a bug here or the input is invalid")
+        elif operator == Operator.Add:
+            terms.append(term)
+            term = group
+        else:
+            term = create_new_group(term.get_value(), group.get_value(), operator)
+        operator = None
+    if operator is not None:
+        raise NotImplementedError("There's a bug here or the input is invalid")
+    if term is None:
+        return []
+    terms.append(term)
+    _log.info("Finished calculating multiplies and divisions, got '%s'", gts(terms[:1] + [g for t in terms[1:] for g in (Operator.Add, t)]))
+
+    result = terms[0]
+    for term in terms[1:]:
+        result = create_new_group(result.get_value(), term.get_value(), Operator.Add)
+    return [result]
+
+
+def solve_basic(parsed_groups: No_RO) -> Value:
+    if (memo := _memo.get()) is None:
+        return trampoline(_solve_basic(parsed_groups))
+    found: dict[int, tuple[Any, Any]] = {}  # The key of every ParenthesizedGroup and powered Group, by their `id`
+    memo.identify(parsed_groups, found)
+    return trampoline(_solve_basic(parsed_groups, found))
+
+
+def _solve_basic(parsed_groups: No_RO, found: dict[int, tuple[Any, Any]] | None = None) -> Generator[Any, Value, Value]:
+    memo = _memo.get() if found is not None else None
     positions = Positions(parsed_groups)
     if positions.fractions:
-        parsed_groups = convert_fraction_to_division(positions)
-    for i in positions.parent_loc:  # The index here is static, so we don't need to re-calculate it
+        positions = Positions(parsed_groups := convert_fraction_to_division(positions))
+    for i in list(positions.parent_loc):  # The index here is static, so we don't need to re-calculate it
         if isinstance(par := parsed_groups[i], ParenthesizedGroup):  # Type checking purposes
-            result = solve_basic(par.groups)
+            # An identical ParenthesizedGroup was already calculated, its value is reused
+            key = ("value", found[id(par)][1]) if found is not None else None
+            if memo is not None and (result := memo.get(key)) is not MISSING:
+                positions.replace(i, create_new_group(result))
+                continue
+            result = yield _solve_basic(par.groups, found)
             if par.power:  # We handle powers in PG differently from normal Group
-                result = cast(Group, par.groups[0]).get_value() ** solve_basic(par.power)
-                par.power = []
-            parsed_groups[i] = create_new_group(Decimal(-result if par.is_negative else result), power=par.power)
+                result = calculate_power(cast(Group, par.groups[0]).get_value(), (yield _solve_basic(par.power, found)))
+            positions.replace(i, create_new_group(result := -result if par.is_negative else result))  # The power is calculated
+            if memo is not None:
+                memo.set(key, result)
     _log.info("Finished calculating parentheses, got '%s'", gts(parsed_groups))
 
-    positions.update_data(parsed_groups)
-
     for i in positions.existing_powers:
         if isinstance((group := parsed_groups[i]), Group):
-            power = solve_basic(group.power)
+            key = ("value", found[id(group)][1]) if found is not None else None
+            if memo is not None and (result := memo.get(key)) is not MISSING:
+                parsed_groups[i] = create_new_group(result)
+                continue
+            power = yield _solve_basic(group.power, found)
             op = -1 if group.number.is_negative else 1
-            parsed_groups[i] = create_new_group(op * abs(group.get_value()) ** power)
+            parsed_groups[i] = create_new_group(result := op * calculate_power(abs(group.get_value()), power))
+            if memo is not None:
+                memo.set(key, result)
     _log.info("Finished calculating powers, got '%s'", gts(parsed_groups))
 
-    for _ in positions.operators.get(Operator.Mul, []) + positions.operators.get(Operator.Div, []):
-        positions.update_data(parsed_groups)
-        combine_groups(positions, parsed_groups, is_addition=False)
-    _log.info("Finished calculating multiplies and divisions, got '%s'", gts(parsed_groups))
-
-    for _ in positions.operators.get(Operator.Add, []):
-        positions.update_data(parsed_groups)
-        combine_groups(positions, parsed_groups, is_addition=True)
+    parsed_groups[:] = combine_operators(parsed_groups)  # The groups are replaced in place, like the powers above
     _log.info("Finished calculating additions and subtractions, got '%s'", gts(parsed_groups))
 
     if len(parsed_groups) == 1:
         return cast(Group, parsed_groups[0]).get_value()
-    elif not len(parsed_groups):  # Empty result
-        return None  # type: ignore  # for direct call on solve_basic
-
-    raise NotImplementedError("There's a bug here or the input is invalid")
+    return None  # type: ignore  # Empty result, for direct call on solve_basic
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections.abc import Generator, Sequence
+from fractions import Fraction as Rational
+from typing import Any, TypeAlias
+
+from numsy.parser import Variable, Equals, Num, Var, Pow, UnaryOp, Equation, Node
+from numsy.parser import to_tree, trampoline
+
+from .core import Result, NoSolution
+from .datatype import CompleteEquation
+from .errors import NonInvertibleMatrixError
+from .logging import _log
+from .matrices import Matrix
+from .lowering import NotLowerable, to_rational, add_terms, to_result
+
+# Linear combination of the variables of a side, `{name: coefficient}` with the constant term stored under `None`. Like
+# `Polynomial`, the coefficients are exact and the ones which are zero aren't stored.
+Linear: TypeAlias = "dict[str | None, Rational]"
+
+
+def _is_constant(linear: Linear) -> bool:
+    return not linear.keys() - {None}
+
+
+def _lower(node: Node) -> Generator[Any, Linear, Linear]:
+    if isinstance(node, Num):
+        return {None: value} if (value := to_rational(node.value)) else {}
+    if isinstance(node, Var):
+        return {node.name: Rational(1)}
+    if isinstance(node, UnaryOp):
+        return {name: -coefficient for name, coefficient in (yield _lower(node.operand)).items()}
+
+    if isinstance(node, Pow):
+        base, exponent = (yield _lower(node.base)), (yield _lower(node.exponent))
+        if not _is_constant(exponent) or (power := exponent.get(None, Rational(0))).denominator != 1:
+            raise NotLowerable
+        if not _is_constant(base):  # Only x^1 is linear
+            if power != 1:
+                raise NotLowerable
+            return base
+        if not base and power <= 0:  # 0^0 and 0^-1 are errors of the solver
+            raise NotLowerable
+        return {None: base[None] ** int(power)} if base else {}
+
+    left, right = (yield _lower(node.left)), (yield _lower(node.right))
+    if node.operator == "+":
+        return add_terms(left, right)
+    if node.operator == "*":
+        if not _is_constant(left) and not _is_constant(right):  # A product of variables
+            raise NotLowerable
+        constant, other = (left, right) if _is_constant(left) else (right, left)
+        factor = constant.get(None, Rational(0))
+        return {name: coefficient * factor for name, coefficient in other.items()} if factor else {}
+    if right.keys() != {None}:  # Division by a variable or by zero
+        raise NotLowerable
+    return {name: coefficient / right[None] for name, coefficient in left.items()}
+
+
+def to_linear(side: Node) -> Linear | None:
+    """Lowers one side of an equation (as a tree, see `to_tree`) into a linear combination of its variables, with the
+    parentheses distributed and the fractions calculated exactly. Returns `None` if the side isn't linear, for example
+    with a product of variables or a variable in a denominator or a power."""
+    try:
+        return trampoline(_lower(side))
+    except NotLowerable:
+        return None
+
+
+def _reduce(coefficients: list[list[Rational]], constants: list[Rational]) -> list[Rational] | None:
+    # Gauss-Jordan elimination of a system which isn't square or is singular, returns its only solution, or `None` if it
+    # has none. Raises `NotImplementedError` if it has infinitely many.
+    rows = [row + [constant] for row, constant in zip(coefficients, constants)]
+    pivots: list[int] = []
+    for column in range(len(coefficients[0])):
+        if (pivot := next((i for i in range(len(pivots), len(rows)) if rows[i][column]), None)) is None:
+            continue
+        rows[len(pivots)], rows[pivot] = rows[pivot], rows[len(pivots)]
+        pivot_row = rows[len(pivots)]
+        pivot_row[:] = [value / pivot_row[column] for value in pivot_row]
+        for row in rows:
+            if row is not pivot_row and (factor := row[column]):
+                row[:] = [value - factor * other for value, other in zip(row, pivot_row)]
+        pivots.append(column)
+    if any(row[-1] for row in rows[len(pivots):]):  # 0 = c, where c isn't 0
+        return None
+    if len(pivots) < len(coefficients[0]):
+        raise NotImplementedError("Systems of equations with infinitely many solutions are not supported yet.")
+    return [row[-1] for row in rows[:len(pivots)]]
+
+
+def solve_system(equations: Sequence[CompleteEquation]) -> Result:
+    """Solves a system of linear equations, which are cleaned like the ones of `solve`. Every equation is lowered into a
+    row of exact coefficients (its variables moved to the left hand side and its constant to the right hand side). A
+    square system is solved with `Matrix.solve`, which eliminates the exact coefficients without fractions (Bareiss's
+    algorithm) instead of using its LU decomposition. The other systems (and the singular ones) are reduced with a
+    Gauss-Jordan elimination. Returns a `Result` with every variable, they all have `NoSolution` if the equations
+    contradict each other.
+
+    Raises `NotImplementedError` if an equation isn't linear or doesn't have a single "=", or if the system has
+    infinitely many solutions."""
+    rows: list[Linear] = []
+    for equation in equations:
+        tree = to_tree(equation)
+        if not isinstance(tree, Equation) or tree.relations != (Equals,):
+            raise NotImplementedError("Every equation of a system must have a single '='.")
+        if (lhs := to_linear(tree.sides[0])) is None or (rhs := to_linear(tree.sides[1])) is None:
+            raise NotImplementedError("Only systems of linear equations are supported.")
+        rows.append(add_terms(lhs, rhs, sign=-1))  # row = 0
+    names = list(dict.fromkeys(name for row in rows for name in row if name is not None))  # In the order they appear
+    if not names:
+        return Result(not any(rows))
+    coefficients = [[row.get(name, Rational(0)) for name in names] for row in rows]
+    constants = [-row.get(None, Rational(0)) for row in rows]
+    _log.info("Lowered into a linear system of %s equations and %s variables %s", len(rows), len(names), names)
+
+    values: list[Rational] | None = None
+    if len(rows) == len(names):
+        try:
+            values = Matrix(coefficients).solve(constants)
+        except NonInvertibleMatrixError:  # No solution or infinitely many, told apart by the elimination
+            pass
+    if values is None and (values := _reduce(coefficients, constants)) is None:
+        return Result({Variable(name): NoSolution() for name in names})
+    return Result({Variable(name): to_result(value, divided=True) for name, value in zip(names, values)})
@@ -1,54 +1,161 @@
 from collections import Counter
-from typing import cast, TypeVar
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Context, Inexact, localcontext
+from typing import Any, cast, TypeVar
 
 from numsy.parser import Variable, Operator, ParenthesizedGroup, RelationalOperator, Fraction, Group, Equals
-from numsy.parser import gts
+from numsy.parser import gts, trampoline, copy_equation, numeric_backend
 
 from .logging import _log
-from .datatype import Maybe_RO, CompleteEquation
+from .datatype import Maybe_RO, CompleteEquation, No_RO, mul_and_div
 from .core import Result, NoSolution
 from .errors import SolutionNotFoundError
 from .logging import set_log_equation
+from .memo import SubexpressionMemo
 
 T = TypeVar("T", bound=Maybe_RO)
 
+# Rewriting steps of the algebra before an equation is given up on, every step is a full pass over the equation
+DEFAULT_MAX_STEPS = 100
+_max_steps: ContextVar[int] = ContextVar("max_steps", default=DEFAULT_MAX_STEPS)
+
 
 def clean_equation(parsed_group: T, base: bool = True) -> T:
+    return trampoline(_clean_equation(parsed_group, base))
+
+
+def _clean_equation(parsed_group: T, base: bool) -> Generator[Any, Any, T]:
+    # The original groups aren't modified, only the ones which change are copied (with the lists containing them). The
+    # rest is shared with the original, it's returned as is if it's already clean.
+    new: list = []
     for index, group in enumerate(parsed_group):
         if not base and isinstance(group, RelationalOperator):
             raise TypeError("Relational operators cannot be inside power or ParenthesizedGroup.")
 
         if isinstance(group, ParenthesizedGroup):
-            group.groups = clean_equation(group.groups, base=False)
-            group.power = clean_equation(group.power, base=False)
+            inside, power = (yield _clean_equation(group.groups, base=False)), (yield _clean_equation(group.power, base=False))
+            if inside is not group.groups or power is not group.power:
+                cleaned = ParenthesizedGroup(inside, power)
+                cleaned.is_negative = group.is_negative
+                group = cleaned
         elif isinstance(group, Group):
-            group.power = clean_equation(group.power, base=False)
-        if index == 0:
-            continue
-        before = parsed_group[index - 1]
-        if isinstance(group, (Group, ParenthesizedGroup)) and isinstance(before, (Group, ParenthesizedGroup)):
-            if isinstance(group, ParenthesizedGroup):
-                if group.is_negative:
-                    parsed_group.insert(index, Operator.Add)
-                else:  # For multiplications with ParenthesizedGroup without the "*" Operator
-                    parsed_group.insert(index, Operator.Mul)
+            if (power := (yield _clean_equation(group.power, base=False))) is not group.power:
+                group = group.copy()
+                group.power = power
+        if index > 0 and isinstance(group, (Group, ParenthesizedGroup)) and isinstance(parsed_group[index - 1], (Group, ParenthesizedGroup)):
+            if isinstance(group, ParenthesizedGroup) and not group.is_negative:
+                new.append(Operator.Mul)  # For multiplications with ParenthesizedGroup without the "*" Operator
             else:  # For possibly negative values or double negative sign ('--')
-                parsed_group.insert(index, Operator.Add)
+                new.append(Operator.Add)
+        new.append(group)
+    if len(new) == len(parsed_group) and all(group is original for group, original in zip(new, parsed_group)):
+        new = parsed_group  # Nothing changed
     if base:
-        _log.info("Finished cleaning equation, got '%s'", gts(parsed_group))
-    return parsed_group
+        _log.info("Finished cleaning equation, got '%s'", gts(new))
+    return cast(T, new)
+
+
+def fold_constants(equation: T) -> T:
+    """Calculates every part of the equation without variables (powers, parentheses, numerators and denominators of
+    fractions, and the multiplications and divisions at the start of a term) into a single group, so the algebra only
+    has to deal with the terms containing variables. For example `2^3 * x + (4 * 5 - 6) = 3^2 * 7` becomes
+    `8 * x + 14 = 63`.
+
+    The parts are calculated with Decimal and are only replaced when the result is exact, `2/3` stays a division so
+    the answer can still be a fraction. Parts raising an error are kept too, the solver raises it later.
+    """
+    if not any(group.contains_variable for group in equation if isinstance(group, (Group, ParenthesizedGroup, Fraction))):
+        return equation  # Calculated as a whole by `solve_basic` anyway
+    with numeric_backend("decimal"), localcontext() as context:
+        folded, _ = trampoline(_fold_constants(equation, context))
+    _log.info("Finished folding constants, got '%s'", gts(folded))
+    return folded
+
+
+def _calculate_constant(groups: No_RO, context: Context) -> Group | None:
+    from .solve_basic import solve_basic, create_new_group
+
+    context.clear_flags()
+    try:
+        value = solve_basic(cast(No_RO, copy_equation(groups)))  # `solve_basic` modifies the groups
+    except (ArithmeticError, ValueError):
+        return None
+    return None if value is None or context.flags[Inexact] else create_new_group(value)
+
+
+def _fold_constants(groups: T, context: Context, nested: bool = False) -> Generator[Any, Any, tuple[T, bool]]:
+    # Returns the folded groups (the original ones aren't modified) and whether they contain a variable. `nested` groups
+    # (inside parentheses, powers and fractions) are a single expression, which is calculated as a whole if possible.
+    new: list = []
+    constant: list[bool] = []  # Whether each group of `new` is variable-free, operators aren't
+    for group in groups:
+        if isinstance(group, (Operator, RelationalOperator)):
+            new.append(group)
+            constant.append(False)
+            continue
+        if isinstance(group, Fraction):
+            (numerator, first), (denominator, second) = (yield _fold_constants(group.numerator, context, True)), (yield _fold_constants(group.denominator, context, True))
+            try:
+                group = Fraction(numerator, denominator)
+            except ZeroDivisionError:  # Left for the solver, see `Fraction`
+                pass
+            has_variable = first or second
+        elif isinstance(group, ParenthesizedGroup):
+            (inside, first), (power, second) = (yield _fold_constants(group.groups, context, True)), (yield _fold_constants(group.power, context, True))
+            folded = ParenthesizedGroup(inside, power)
+            folded.is_negative = group.is_negative
+            group, has_variable = folded, first or second
+        else:
+            power, has_variable = yield _fold_constants(group.power, context, True)
+            if group.power:
+                group = group.copy()
+                group.power = power
+            has_variable = has_variable or group.variable is not None
+        if not has_variable and (not isinstance(group, Group) or group.power):  # Nothing to calculate in a plain number
+            group = _calculate_constant([group], context) or group
+        new.append(group)
+        constant.append(not has_variable)
+
+    if nested and len(new) > 1 and all(constant[::2]) and (folded := _calculate_constant(new, context)) is not None:
+        return cast(T, [folded]), False
+    # The multiplications and divisions of constants at the start of every term, `2 * 3 * x` is `(2 * 3) * x`
+    folded_groups: list = []
+    index = 0
+    while index < len(new):
+        end = index + 1  # The constant start of the term is `new[index:end]`
+        if constant[index]:
+            while end + 1 < len(new) and new[end] in mul_and_div and constant[end + 1]:
+                end += 2
+        if end - index > 1 and (folded := _calculate_constant(new[index:end], context)) is not None:
+            folded_groups.append(folded)
+        else:
+            folded_groups += new[index:end]
+        # The rest of the term, up to (and including) the operator starting the next one
+        while end < len(new):
+            folded_groups.append(group := new[end])
+            end += 1
+            if group == Operator.Add or isinstance(group, RelationalOperator):
+                break
+        index = end
+    return cast(T, folded_groups), any(not is_constant and not isinstance(group, (Operator, RelationalOperator)) for group, is_constant in zip(new, constant))
 
 
 class EquationIdentity:
     def __init__(self):
         self.variable_count: dict[Variable, int] = {}
         self.relational_operators: list[tuple[RelationalOperator, int]] = []
-        self.fractions: dict[Fraction, int] = {}
-        self.parenthesized_groups: dict[ParenthesizedGroup, int] = {}
+        self.fractions: list[tuple[Fraction, int]] = []
+        self.parenthesized_groups: list[tuple[ParenthesizedGroup, int]] = []
         self.has_powers: bool = False
 
 
 def get_equation_identity(parsed_groups: Maybe_RO) -> EquationIdentity:
+    return trampoline(_get_equation_identity(parsed_groups))
+
+
+def _get_equation_identity(parsed_groups: Maybe_RO) -> Generator[Any, EquationIdentity, EquationIdentity]:
     identity = EquationIdentity()
     for index, group in enumerate(parsed_groups):
         if isinstance(group, RelationalOperator):
@@ -59,14 +166,15 @@ def get_equation_identity(parsed_groups: Maybe_RO) -> EquationIdentity:
         if isinstance(group, (Group, ParenthesizedGroup)):
             if group.power:
                 identity.has_powers = True
-                power = get_equation_identity(group.power)
+                power = yield _get_equation_identity(group.power)
                 base = Counter(identity.variable_count)
                 base.update(power.variable_count)
                 identity.variable_count = dict(base)
 
         if isinstance(group, Fraction):
-            identity.fractions[group] = index
-            numerator, denominator = get_equation_identity(group.numerator), get_equation_identity(group.denominator)
+            identity.fractions.append((group, index))
+            numerator = yield _get_equation_identity(group.numerator)
+            denominator = yield _get_equation_identity(group.denominator)
             base = Counter(identity.variable_count)
             base.update(numerator.variable_count)
             base.update(denominator.variable_count)
@@ -77,8 +185,8 @@ def get_equation_identity(parsed_groups: Maybe_RO) -> EquationIdentity:
                 identity.variable_count[var] = identity.variable_count.get(var, 0) + 1
 
         elif isinstance(group, ParenthesizedGroup):
-            identity.parenthesized_groups[group] = index
-            inside = get_equation_identity(group.groups)
+            identity.parenthesized_groups.append((group, index))
+            inside = yield _get_equation_identity(group.groups)
             base = Counter(identity.variable_count)
             base.update(inside.variable_count)
             identity.variable_count = dict(base)
@@ -87,22 +195,67 @@ def get_equation_identity(parsed_groups: Maybe_RO) -> EquationIdentity:
 
 
 def convert_division_to_fraction(groups: CompleteEquation):  # Performs a detailed-lookup and might be slow
+    new = trampoline(_convert_division_to_fraction(groups))
+    _log.info("Finished converting division to fraction, got '%s'", gts(new))
+    return new
+
+
+def _convert_division_to_fraction(groups: CompleteEquation) -> Generator[Any, Any, CompleteEquation]:
     new: CompleteEquation = []
     index = 0
     for group in groups:
         if isinstance(group, (ParenthesizedGroup, Group)) and group.power:
-            group.power = convert_division_to_fraction(group.power)
+            group.power = yield _convert_division_to_fraction(group.power)
         if isinstance(group, Operator) and group.symbol == "/":
             group = Fraction(numerator=[new.pop(-1)], denominator=[groups.pop(index + 1)])
         elif isinstance(group, ParenthesizedGroup):
-            group.groups = convert_division_to_fraction(group.groups)
+            group.groups = yield _convert_division_to_fraction(group.groups)
         new.append(group)
         index += 1
-    _log.info("Finished converting division to fraction, got '%s'", gts(new))
     return new
 
 
+@contextmanager
+def step_budget(max_steps: int) -> Iterator[None]:
+    """Solves the equations inside the block with another budget of rewriting steps, the ones which aren't solved within
+    it raise `SolutionNotFoundError`."""
+    token = _max_steps.set(max_steps)
+    try:
+        yield
+    finally:
+        _max_steps.reset(token)
+
+
 def determine_equation_type(groups: CompleteEquation, identity: EquationIdentity | None = None, base: bool = False) -> Result:
+    """Solves the equation by identifying its type, the algebra is rewritten step by step until it's solved. Every
+    intermediate equation is fingerprinted by its structure, so the solver stops as soon as a step gives back an earlier
+    equation (it's going in circles, or not making any progress). The equation isn't modified, it's only copied once if
+    it has to be rewritten (the polynomials are solved without copying it).
+
+    Raises `SolutionNotFoundError` with the last equation if it isn't solved within the budget (see `step_budget`)."""
+    fingerprints = SubexpressionMemo()  # Only its structure ids are used
+    seen: set[int] = set()
+    max_steps = _max_steps.get()
+    for step in range(1, max_steps + 1):
+        solved = _determine_equation_type(groups, identity, base, owned=step > 1)  # The later steps are the solver's own
+        if isinstance(solved, Result):
+            return solved
+        if (fingerprint := fingerprints.identify(solved)) in seen:
+            _log.info("Got '%s' again after %s steps, stopping", gts(solved), step)
+            raise SolutionNotFoundError(solved, step, repeated=True)
+        seen.add(fingerprint)
+        groups, identity, base = solved, None, False
+    raise SolutionNotFoundError(groups, max_steps)
+
+
+def _writable(groups: CompleteEquation, owned: bool) -> CompleteEquation:
+    # The rewriting solvers modify the equation in place, so the one of the caller is copied first
+    return groups if owned else cast(CompleteEquation, copy_equation(groups))
+
+
+def _determine_equation_type(groups: CompleteEquation, identity: EquationIdentity | None, base: bool, owned: bool) -> Result | CompleteEquation:
+    # A single step, returns the result or the rewritten equation to solve next. `owned` is whether the equation can be
+    # modified, the one given to `determine_equation_type` isn't.
     set_log_equation(gts(groups))
     _log.info("Attempting to solve '%s'", gts(groups))
 
@@ -112,7 +265,7 @@ def determine_equation_type(groups: CompleteEquation, identity: EquationIdentity
 
         _log.info("Identified as [BASIC PEMDAS]")
         _log.info("[START OF SOLVING PEMDAS]")
-        return Result(solve_basic(groups))
+        return Result(solve_basic(_writable(groups, owned)))
 
     elif len(identity.variable_count) == 0 and identity.relational_operators:  # Basic PEMDAS with relational operator
         # Evaluates every Relational Operator left hand side and right hand side accordingly
@@ -120,6 +273,7 @@ def determine_equation_type(groups: CompleteEquation, identity: EquationIdentity
         from .solve_basic import solve_basic
         _log.info("Identified as [BASIC PEMDAS with RELATIONAL OPERATOR]")
         _log.info("[START OF SOLVING PEMDAS WITH RELATIONAL OPERATOR]")
+        groups = _writable(groups, owned)
         cond, count, last = (), -1, None
         for ro, index in identity.relational_operators:
             count += 1
@@ -134,9 +288,14 @@ def determine_equation_type(groups: CompleteEquation, identity: EquationIdentity
     elif len(identity.variable_count) == 1 and identity.relational_operators:
         if identity.relational_operators[0][0] == Equals:
             from .solve_algebra import solve_algebra, divide_both_side
+            from .polynomial import solve_polynomial
 
             _log.info("Identified as [BASIC ALGEBRA]")
+            if len(identity.relational_operators) == 1 and (solved := solve_polynomial(groups, next(iter(identity.variable_count)))) is not None:
+                _log.info("Solved as [POLYNOMIAL], got '%s'", solved)
+                return solved
             _log.info("[START OF SOLVING ALGEBRA]")
+            groups = _writable(groups, owned)
             # In the format of <variable> = <non-variable>
             identity = get_equation_identity(groups)
             if len(groups) == 3 and list(identity.variable_count.values())[0] == 1 and isinstance(groups[0], Group) and not identity.has_powers and not identity.parenthesized_groups:
@@ -153,12 +312,6 @@ def determine_equation_type(groups: CompleteEquation, identity: EquationIdentity
                         return Result({var_obj: NoSolution()})  # For `0x = <non-var>` cases
                     return Result({var_obj: fraction})
                 return Result({var_obj: non_var.get_value()})
-            solved = solve_algebra(convert_division_to_fraction(groups) if base else groups)
-            if isinstance(solved, Result):
-                return solved
-            try:
-                return determine_equation_type(solved)  # Keep recurring until it's found, otherwise, raise RecursionError
-            except RecursionError:
-                raise SolutionNotFoundError(solved) from None
+            return solve_algebra(convert_division_to_fraction(groups) if base else groups)
 
     raise NotImplementedError("Problem of that type is not supported yet.")
@@ -1,7 +1,13 @@
-from numsy.parser import parse_group
-from numsy.parser import gts
+import pytest
 
-from numsy.solver.solve_algebra import divide_all
+from numsy import solver
+from numsy.parser import Group, Operator, parse_group
+from numsy.parser import gts, copy_equation
+
+from numsy.solver.core import Positions
+from numsy.solver.solve_algebra import divide_all, divide_both_side, get_common_factor
+from numsy.solver.errors import SolutionNotFoundError
+from numsy.solver.utility import clean_equation, convert_division_to_fraction, fold_constants, step_budget
 
 
 def test_divide_all():
@@ -14,8 +20,94 @@ def test_divide_all():
     assert gts(divide_all(parse_group("(2x) ^ 2 - 4 + (10 - 6x)"), divisor=2)) == "x * 2x - 2 + (5 - 3x)"
 
 
+def test_common_factor():
+    def factor(string: str) -> int:
+        return get_common_factor(convert_division_to_fraction(clean_equation(parse_group(string))))
+
+    assert factor("15x + 25 - (10 + 5x)") == 5
+    assert factor("6x * 5 + 4/7") == 2  # Only the first group of a multiplication, and the numerator of a fraction
+    assert factor("4x + 2.5") == 1
+    assert factor("0x + 0") == 0
+    assert factor("300000000000000000000x + 4500000000000000000000") == 300000000000000000000  # Not limited by size
+
+    def divide(string: str) -> str:
+        return gts(divide_both_side(convert_division_to_fraction(clean_equation(parse_group(string)))))
+
+    assert divide("300000000000000000000x = 4500000000000000000000") == "x = 15"
+    assert divide("-10x * 3 + 20 = 0") == "-x * 3 + 2 = 0"
+    assert divide("4x * 2 + 6x * 2 = 10x / 3") == "2x * 2 + 3x * 2 = 5x/3"
+    assert divide("3x + 2 = 4") == "3x + 2 = 4"
+
+
 def test_multiply_groups():
     assert gts(parse_group("5x")[0] * parse_group("3x")[0]) == "15x^2"
     assert gts(parse_group("x^2")[0] * parse_group("x^3")[0]) == "x^5"
     assert gts(parse_group("7")[0] * parse_group("2")[0]) == "14"
     assert gts(parse_group("7")[0] * parse_group("2x")[0]) == "14x"
+
+
+def test_fold_constants():
+    def fold(string: str) -> str:
+        return gts(fold_constants(clean_equation(parse_group(string))))
+
+    assert fold("2^3 * x + (4 * 5 - 6) = 3^2 * 7") == "8 * x + 14 = 63"
+    assert fold("x^(1 + 1) = (2 * 3)^2") == "x^2 = 36"
+    assert fold("2 * 3 * x - 2 * 4 = 0") == "6 * x - 8 = 0"
+    assert fold("x * 2 * 3 = 1") == "x * 2 * 3 = 1"  # Not a constant part, it's (x * 2) * 3
+    assert fold("x + 2/3 = 1/4") == "x + 2 / 3 = 0.25"  # Inexact results are kept
+    assert fold("x + (1 - 1)^-1 = 2") == "x + (0)^-1 = 2"  # Errors are left for the solver
+    assert fold("2 * 3 + 4 = 10") == "2 * 3 + 4 = 10"  # Nothing to fold without variables
+
+    groups = clean_equation(parse_group("x + (2 * 3)^2 = 1"))
+    fold_constants(groups)
+    assert gts(groups) == "x + (2 * 3)^2 = 1"  # Not modified
+
+
+def test_step_budget():
+    with pytest.raises(SolutionNotFoundError) as error:
+        solver.solve("x^0.5 = 3")  # The algebra can't rewrite it, the step gives back the same equation
+    assert error.value.repeated and error.value.steps == 2 and gts(error.value.equation) == "x^0.5 = 3"
+    with step_budget(1), pytest.raises(SolutionNotFoundError) as error:
+        solver.solve("x^0.5 = 3")
+    assert not error.value.repeated and error.value.steps == 1
+
+
+def _scanned(positions: Positions) -> tuple:
+    return positions.parent_loc, positions.operators, positions.existing_powers, positions.fractions, positions.ro_positions, positions.variable_groups
+
+
+def test_incremental_positions():
+    groups = clean_equation(parse_group("2x + 3 * (x + 1) - 4y^2 + 5 = 7x + y^2"))
+    positions = Positions(groups)
+    positions.delete(0)  # Every change leaves the same indexes as a new scan of the groups
+    assert _scanned(positions) == _scanned(Positions(groups))
+    positions.insert(3, Operator.Mul)
+    positions.insert(4, Group.from_value(2))
+    assert _scanned(positions) == _scanned(Positions(groups))
+    positions.replace(positions.parent_loc[0], Group.from_value(9))
+    assert _scanned(positions) == _scanned(Positions(groups))
+    positions.delete_many([0, 1, len(groups) - 1, len(groups) - 2])
+    assert _scanned(positions) == _scanned(Positions(groups)) and Operator.Mul in positions.operators
+    positions.delete(-1)
+    assert _scanned(positions) == _scanned(Positions(groups))
+
+
+@pytest.mark.parametrize("backend", ["decimal", "exact", "float"])
+@pytest.mark.parametrize("problem", ["2(x + 3) - (x - 1)^2 = 4", "(x + 3)(2x - 1) = 0", "4x/6 + 2 = 3(x + 1)", "x^0.5 = 3"])
+def test_input_is_not_modified(problem, backend):
+    groups = parse_group(problem)
+    original = copy_equation(groups)
+    try:
+        solver.solve(groups, backend=backend)
+    except SolutionNotFoundError:
+        pass
+    assert groups == original and repr(groups) == repr(original)
+
+
+def test_clean_equation_shares_groups():
+    groups = parse_group("2(x + 3) + (4 - x)^2 = 5")
+    cleaned = clean_equation(groups)
+    assert gts(cleaned) == "2 * (x + 3) + (4 - x)^2 = 5" and gts(groups) == "2(x + 3) + (4 - x)^2 = 5"
+    assert cleaned[0] is groups[0] and cleaned[2] is groups[1]  # Already clean
+    assert cleaned[4] is not groups[3] and cleaned[4].power is groups[3].power  # Copied for the "+" inside, not its power
+    assert clean_equation(cleaned) is cleaned
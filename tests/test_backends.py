@@ -0,0 +1,60 @@
+import pytest
+import re
+from numsy import solver
+
+from decimal import Decimal
+from fractions import Fraction
+from numsy.parser import gts
+from numsy.solver import Matrix
+
+problems = [x for x in open(r"tests/test_problems.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+variables = [x for x in open(r"tests/test_variables.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+
+
+@pytest.mark.parametrize("problem", problems)
+def test_float_problems(problem: str):
+    problem, answer = re.match("(.+)==(.+)", problem.replace(" ", "")).groups()
+    solved = solver.solve(problem, backend="float")
+    if isinstance(solved.other_value, bool):
+        assert str(solved.other_value) == answer
+    else:
+        assert isinstance(solved.other_value, float)
+        assert solved.other_value == pytest.approx(float(answer), rel=1e-9)
+
+
+@pytest.mark.parametrize("problem", variables)
+def test_float_variables(problem: str):
+    problem, variable, expected_answer = re.match(r"(.+\s*),\s*(\w)\s*=\s*\{?([^}]*)?", problem.strip()).groups()
+    solved = getattr(solver.solve(problem, backend="float"), variable)
+    if isinstance(solved, set):
+        assert set(gts(res) for res in solved) == set(e.replace(" ", "") for e in expected_answer.split(","))
+    else:
+        assert gts(solved) == expected_answer
+
+
+def test_precision():
+    assert solver.solve("1/3", precision=50).other_value == Decimal("0." + "3" * 50)
+    assert solver.solve("2/3", precision=5, rounding="ROUND_DOWN").other_value == Decimal("0.66666")
+    assert solver.solve("2/3", precision=5).other_value == Decimal("0.66667")
+    assert solver.solve("2/3").other_value == Decimal("0.6666666666667")  # The context is restored after the call
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        solver.solve("1 + 1", backend="complex")
+
+
+def test_matrix_backend():
+    assert Matrix([[1, 2], [3, 4]], backend="exact").inverse().matrix == [[-2, 1], [Fraction(3, 2), Fraction(-1, 2)]]
+    assert Matrix([[1, 2]], backend="float").matrix == [[1.0, 2.0]]
+    assert Matrix([[1, 2]], backend="decimal").matrix == [[Decimal(1), Decimal(2)]]
+    assert Matrix([["0.123456"]], backend="decimal", precision=3).matrix == [[Decimal("0.123")]]
+
+
+def test_integer_powers():
+    # Correctly rounded, a plain Decimal power is off by one in the last digit
+    assert solver.solve("8878^36", precision=28).other_value == Decimal("1.378304153252197726241739859E+142")
+    assert solver.solve("3^40", backend="float").other_value == float(3 ** 40)
+    assert solver.solve("7^-3", backend="float").other_value == 1 / 343
+    assert solver.solve("2^100", backend="exact").other_value == 2 ** 100
+    assert solver.solve("(-0)^3").other_value.is_signed()
@@ -0,0 +1,53 @@
+import pytest
+
+import numsy
+from numsy import solver
+from numsy.solver import batch, Undefined
+
+expressions = [  # The expression and the same expression with `x` substituted
+    ("3x^2 + 2x - 7", "3({x})^2 + 2({x}) - 7"),
+    ("(x - 1)(x + 2) / 4", "(({x}) - 1)(({x}) + 2) / 4"),
+    ("-x^3 + 2^x - (x + 1)^2", "-({x})^3 + 2^({x}) - (({x}) + 1)^2"),
+    ("5E3 * x - 1/2 * x", "5E3 * ({x}) - 1/2 * ({x})"),
+]
+values = [-3, -1.5, 0, 2, 7.25]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(batch, "numpy", None)
+    elif batch.numpy is None:
+        pytest.skip("NumPy is not installed.")
+    return request.param
+
+
+@pytest.mark.parametrize("expression, substituted", expressions)
+def test_same_answer_as_solver(backend, expression, substituted):
+    results = numsy.evaluate_many(expression, x=values)
+    for value, result in zip(values, results, strict=True):
+        assert result == pytest.approx(float(solver.solve(substituted.format(x=value)).other_value))
+
+
+def test_undefined(backend):
+    assert numsy.evaluate_many("1/x + y", x=[1, 0, 2], y=[1, 2, 3]) == [2.0, Undefined(), 3.5]
+    assert numsy.evaluate_many("x^0.5 - x^-1", x=[4, -4, 0]) == [1.75, Undefined(), Undefined()]
+    assert numsy.evaluate_many("1/0 + x", x=[1, 2]) == [Undefined()] * 2
+    assert numsy.evaluate_many("2 * 3", x=[1, 2]) == [6.0, 6.0]
+
+
+def test_undefined_like_solver(backend):
+    # The elements which the solver raises for are undefined
+    with pytest.raises(ArithmeticError):
+        solver.solve("0^0")
+    assert numsy.evaluate_many("x^y", x=[0, 0, 2], y=[0, 2, 0]) == [Undefined(), 0.0, 1.0]
+    assert numsy.evaluate_many("0^0 + x", x=[1]) == [Undefined()]
+
+
+def test_invalid_input(backend):
+    with pytest.raises(TypeError):
+        numsy.evaluate_many("x + y", x=[1])
+    with pytest.raises(ValueError):
+        numsy.evaluate_many("x + y", x=[1], y=[1, 2])
+    with pytest.raises(TypeError):
+        numsy.evaluate_many("x = 2", x=[1])
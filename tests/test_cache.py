@@ -0,0 +1,61 @@
+import pytest
+import re
+
+from numsy import solver
+from numsy.solver import ParseCache, parse_cache, calculate
+from numsy.parser import gts
+
+problems = [re.match(r"(.+?),\s*\w\s*=", x).group(1) for x in open(r"tests/test_variables.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+problems += [x.split("==")[0] for x in open(r"tests/test_problems.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+
+
+@pytest.fixture
+def enabled_cache():
+    parse_cache.resize(512)
+    yield parse_cache
+    parse_cache.resize(0)
+    parse_cache.clear()
+
+
+def answer(result):
+    return {k.name: gts(v) if not isinstance(v, set) else {gts(i) for i in v} for k, v in result.variables_map.items()} or result.other_value
+
+
+@pytest.mark.parametrize("problem", problems)
+def test_cached_solve_is_not_corrupted(enabled_cache, problem):
+    first = answer(solver.solve(problem))
+    assert answer(solver.solve(problem)) == first
+    assert answer(solver.solve(f"  {problem}  ")) == first
+    if calculate(problem) is None:
+        assert enabled_cache.hits == 2 and enabled_cache.misses == 1
+    else:  # Calculated directly, without parsing
+        assert enabled_cache.hits == 0 and enabled_cache.misses == 0
+
+
+def test_shared_entries(enabled_cache):
+    copied = enabled_cache.parse("2(x + 1) = 4")
+    assert enabled_cache.parse("2(x + 1) = 4", copy=False) is enabled_cache.parse("2(x+1)=4", copy=False) is not copied
+    solver.solve("2(x + 1) = 4")  # Solved with the cached equation itself, which isn't modified
+    assert gts(enabled_cache.parse("2(x + 1) = 4", copy=False)) == gts(copied) == "2 * (x + 1) = 4"
+
+
+def test_cache_eviction_and_resize():
+    cache = ParseCache(maxsize=2)
+    cache.parse("1 + 1")
+    cache.parse("1 + 2")
+    cache.parse("1+1")
+    cache.parse("1 + 3")  # Evicts "1 + 2", the least recently used
+    assert cache.info() == (1, 3, 1, 2, 2)
+    cache.parse("1 + 2")
+    assert cache.misses == 4 and cache.evictions == 2
+    cache.resize(1)
+    assert len(cache) == 1 and cache.evictions == 3
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 1, 0)
+
+
+def test_disabled_cache():
+    cache = ParseCache()
+    cache.parse("1 + 1")
+    assert len(cache) == 0 and cache.misses == 0
+    assert gts(cache.parse("1 >= 1")) != gts(cache.parse("1 > = 1"))
@@ -0,0 +1,50 @@
+import pytest
+
+from numsy import solver
+from numsy.parser import parse_group
+from numsy.solver import calculate, clean_equation, determine_equation_type
+from numsy.solver.core import Result
+
+problems = [x.split("==")[0] for x in open(r"tests/test_problems.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+problems += [
+    "-0", "0 * -1", "-(0)", "-0^2", "(-0)^2", "1 - 1", "0.000", "-(2 - 2)", "1/3", "2^0.5", "2^-3^2", "-(2)^2",
+    "2^-(1 + 1)", "--3", "1 - - - 2", "(1) - 5E3", "5E3(2)", "6/2(3)", "2^3(4)", "2^(1)(2)", "1E40 * 1E-40",
+    "123456789012345678901234567890", "12345678901234567890123456789.5 - 1",
+]
+
+
+def full_solve(problem: str):
+    return determine_equation_type(clean_equation(parse_group(problem)), base=True).other_value
+
+
+@pytest.mark.parametrize("problem", problems)
+def test_same_answer_as_solver(problem):
+    if "=" in problem or "<" in problem or ">" in problem or "≠" in problem:
+        assert calculate(problem) is None
+        return
+    value = calculate(problem)
+    assert value is not None
+    assert str(Result(value).other_value) == str(full_solve(problem))
+
+
+@pytest.mark.parametrize("problem", [
+    "2 3",  # Joined into 23 by the parser
+    "(2)3",  # Added to the ParenthesizedGroup by the parser
+    "2 - 5E3",  # Multiplied by the parser
+    "2 --(3)",
+    "2^(1)^2",
+    "0^-1",
+    "1 / 0",
+    "(1 + 2",
+    "1 +",
+    "3x + 1",
+    "1 + 1 = 2",
+])
+def test_falls_back_to_solver(problem):
+    assert calculate(problem) is None
+
+
+def test_long_expression():
+    string = " + ".join(f"{i}^2 * (3 - {i})" for i in range(1, 2000))
+    assert solver.solve(string).other_value == sum(i ** 2 * (3 - i) for i in range(1, 2000))
+    assert solver.solve("(" * 10000 + "1 + 2" + ")" * 10000).other_value == 3
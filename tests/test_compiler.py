@@ -0,0 +1,41 @@
+import pytest
+
+import numsy
+from numsy import solver
+
+expressions = [  # The expression and the same expression with `x` substituted
+    ("3x^2 + 2x - 7", "3({x})^2 + 2({x}) - 7"),
+    ("(x - 1)(x + 2) / 4", "(({x}) - 1)(({x}) + 2) / 4"),
+    ("-x^3 + 2^x - (x + 1)^2", "-({x})^3 + 2^({x}) - (({x}) + 1)^2"),
+    ("5E3 * x - 1/2 * x", "5E3 * ({x}) - 1/2 * ({x})"),
+    ("2^(x + 1) - 3", "2^(({x}) + 1) - 3"),
+]
+
+
+@pytest.mark.parametrize("expression, substituted", expressions)
+@pytest.mark.parametrize("value", ["-3", "-1.5", "0", "2", "7.25"])
+def test_compiled_matches_solve(expression, substituted, value):
+    assert numsy.compile(expression).evaluate(x=value) == solver.solve(substituted.format(x=value)).other_value
+
+
+def test_compiled_expression():
+    compiled = numsy.compile("3x^2 + 2x - 7")
+    assert compiled.variables == ("x",)
+    assert compiled(x=2) == 9
+    assert compiled(x=0.5) == -5.25
+    assert numsy.compile("2 * 3 + 1").evaluate() == 7
+    with pytest.raises(TypeError):
+        compiled.evaluate(y=1)
+    with pytest.raises(TypeError):
+        numsy.compile("x + 1 = 2")
+
+
+def test_compiled_errors():
+    # The same errors as `solver.solve` with the values substituted, instead of an infinite result
+    with pytest.raises(OverflowError):
+        solver.solve("(0)^-2 + (0)")
+    with pytest.raises(OverflowError):
+        numsy.compile("x^-2 + x").evaluate(x=0)
+    with pytest.raises(OverflowError):
+        numsy.compile("(x - 1)^-1").evaluate(x=1)
+    assert numsy.compile("x^-2 + x").evaluate(x=2) == solver.solve("(2)^-2 + (2)").other_value
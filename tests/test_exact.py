@@ -0,0 +1,53 @@
+import pytest
+import re
+from numsy import solver
+
+from decimal import Decimal
+from fractions import Fraction
+from numsy.parser import gts, parse_group
+
+problems = [x for x in open(r"tests/test_problems.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+variables = [x for x in open(r"tests/test_variables.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+
+
+@pytest.mark.parametrize("problem", problems)
+def test_problems(problem: str):
+    problem, answer = re.match("(.+)==(.+)", problem.replace(" ", "")).groups()
+    solved = solver.solve(problem, backend="exact")
+    if isinstance(solved.other_value, bool):
+        assert str(solved.other_value) == answer
+    else:
+        assert isinstance(solved.other_value, Fraction)
+        assert solver.Result(solved.to_decimal()).other_value == Decimal(answer)
+
+
+@pytest.mark.parametrize("problem", variables)
+def test_variables(problem: str):
+    problem, variable, expected_answer = re.match(r"(.+\s*),\s*(\w)\s*=\s*\{?([^}]*)?", problem.strip()).groups()
+    solved = getattr(solver.solve(problem, backend="exact"), variable)
+    if isinstance(solved, set):
+        assert set(gts(res) for res in solved) == set(e.replace(" ", "") for e in expected_answer.split(","))
+    else:
+        assert gts(solved) == expected_answer
+
+
+def test_exact_values():
+    assert solver.solve("1/3 * 3", backend="exact").other_value == 1
+    assert solver.solve("(1/3)^2 + 1/9", backend="exact").other_value == Fraction(2, 9)
+    assert solver.solve("0.1 + 0.2 == 0.3", backend="exact").other_value is True
+    assert solver.solve("2^-2", backend="exact").other_value == Fraction(1, 4)
+    assert solver.Result(solver.solve("2^0.5", backend="exact").to_decimal()).other_value == solver.solve("2^0.5").other_value
+    with pytest.raises(ArithmeticError):
+        solver.solve("10^10^10", backend="exact")
+
+
+def test_original_not_converted():
+    groups = parse_group("1/3 * 3")
+    assert solver.solve(groups, backend="exact").other_value == 1
+    assert isinstance(groups[0].number.value, Decimal) and gts(groups) == "1 / 3 * 3"
+
+
+def test_huge_values():
+    # Too many digits to be converted to a string exactly, they're shown like the Decimal backend would
+    assert str(solver.solve("17.27^(4E3) + 1", backend="exact")).startswith("1.476897209203239730489464914E+4949")
+    assert solver.solve("((2) + 5.27 + 10)^(4E3 - 3.49) * -0", backend="exact").other_value == 0
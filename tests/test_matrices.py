@@ -1,5 +1,8 @@
 import pytest
 
+from decimal import Decimal
+from fractions import Fraction
+
 from numsy.solver.errors import NonInvertibleMatrixError
 from numsy.solver import Matrix, DimensionMismatch, NormEnum, Identity
 
@@ -181,6 +184,28 @@ def test_matrix_adjugate():
     assert Matrix(m2).adjugate().matrix == [[-90, 28, 9], [153, -53, -18], [-63, 22, 9]]
     assert Matrix(m6).adjugate().matrix == [[-5959, 1968, 674, -309, 1948], [10539, -3488, -1192, 565, -3432], [3115, -1020, -358, 151, -1000], [-1150, 372, 138, -56, 374], [-7888, 2642, 896, -430, 2584]]
 
+def test_matrix_lu_decompose():
+    lu, permutation = Matrix(m5).lu_decompose()
+    assert permutation == [1, 0] and lu.matrix == [[3, 4], [1 / 3, 2 - 4 / 3]]
+    lu, permutation = Matrix([[Fraction(e) for e in row] for row in m1]).lu_decompose()
+    lower = [[lu[i, j] if j < i else int(i == j) for j in range(3)] for i in range(3)]
+    upper = [[lu[i, j] if j >= i else 0 for j in range(3)] for i in range(3)]
+    assert (Matrix(lower) * Matrix(upper)).matrix == [m1[i] for i in permutation]
+    with pytest.raises(NonInvertibleMatrixError):
+        Matrix([[1, 2], [2, 4]]).lu_decompose()
+    with pytest.raises(DimensionMismatch):
+        Matrix(m3).lu_decompose()
+
+def test_matrix_solve():
+    assert Matrix(m1).solve([14, 10, 24]) == [1, 2, 3]  # Exact, without rounding
+    assert Matrix(m2).solve([Fraction(1, 2), 0, 1]) == [Fraction(4, 3), Fraction(-13, 6), Fraction(5, 6)]
+    assert Matrix([[0.5, 1.0], [2.0, 1.0]]).solve([2.0, 5.0]) == pytest.approx([2.0, 1.0])
+    assert Matrix([[Decimal(2), Decimal(1)], [Decimal(1), Decimal(3)]]).solve([Decimal(3), Decimal(4)]) == [1, 1]
+    with pytest.raises(NonInvertibleMatrixError):
+        Matrix([[1, 2], [2, 4]]).solve([1, 2])
+    with pytest.raises(DimensionMismatch):
+        Matrix(m5).solve([1, 2, 3])
+
 def test_matrix_trace():
     assert Matrix(m0).trace() == 0
     assert Matrix(m2).trace() == -6
@@ -0,0 +1,64 @@
+import pytest
+
+from numsy import solver
+from numsy.parser import Fraction, Group, gts, parse_group, parse_tree
+from numsy.solver import SubexpressionMemo, determine_equation_type, clean_equation, memoize
+from numsy.solver.core import Positions
+from numsy.solver.solve_algebra import clean_parenthesized_groups
+
+
+def full_solve(problem: str, memo: bool):
+    groups = clean_equation(parse_group(problem))
+    if not memo:
+        return determine_equation_type(groups, base=True)
+    with memoize():
+        return determine_equation_type(groups, base=True)
+
+
+@pytest.mark.parametrize("problem", [
+    "(1 + 2)^2 + (1 + 2)^2",
+    "(1 + 2) * (1 + 2) + 2^(1 + 2) * 2^(1 + 2)",
+    "-(1 + 2)^2 + (1 + 2)^2 + (-(1 + 2))^2",  # The sign is part of the key
+    "(2 - 2) * -1 + -(2 - 2)",
+    "(1.0 + 1) + (1 + 1)",
+    "2(x + 3) + 2(x + 3) = 4",
+    "(x + 1) + (x + 1) * 2 = 7",
+])
+def test_same_answer(problem):
+    assert repr(full_solve(problem, memo=True)) == repr(full_solve(problem, memo=False))
+
+
+def test_hits():
+    assert solver.solve(parse_group("(1 + 2)^2 + (1 + 2)^2 + (1 + 2)^2")).memo == (2, 1, 1)
+    assert solver.solve("(1 + 2) - (2 + 1)").memo is None  # Calculated directly, without any memo
+    assert solver.solve(parse_group("(1 + 2) + (2 + 1)")).memo.hits == 0
+    # Every side of a comparison is calculated with `solve_basic`, the repeated parentheses are reused across the sides
+    assert solver.solve("(1 + 2)^2 + (1 + 2)^2 > (1 + 2)^2").memo == (2, 1, 1)
+    # The repeated parentheses of a polynomial equation are lowered once
+    assert solver.solve("2(x + 3) + 2(x + 3) = 4").memo.hits == 1
+    assert solver.solve("(x + 1)(x + 1) - (x + 1) = 0").memo.hits > 0
+
+
+def test_cleaned_groups():
+    with memoize() as memo:
+        first = clean_parenthesized_groups(Positions(parse_group("(x + 3) + 1 = 4")))
+        second = clean_parenthesized_groups(Positions(parse_group("(x + 3) + 1 = 4")))
+    assert memo.hits == 1 and first is not second
+    assert gts(first) == gts(second) == "x + 3 + 1 = 4"
+
+
+def test_structure():
+    memo = SubexpressionMemo()
+    assert memo.identify(parse_group("(1 + 2)^2 + x")) == memo.identify(parse_group("(1 + 2)^2 + x"))
+    assert memo.identify(parse_group("(1 + 2)^2")) != memo.identify(parse_group("(1 + 2)^3"))
+    assert memo.identify(parse_group("(1 + 2)")) != memo.identify(parse_group("-(1 + 2)"))
+    assert memo.identify(parse_group("((1) + 2)")) != memo.identify(parse_group("(1 + (2))"))
+    found: dict[int, int] = {}
+    memo.identify_tree(tree := parse_tree("(x + 1)(x + 1) - (x - 1)"), found)
+    assert found[id(tree.left.left)] == found[id(tree.left.right)] != found[id(tree.right)]
+
+
+def test_fraction_hash():
+    first, second = Fraction([Group.from_value(1)], [Group.from_value(2)]), Fraction([Group.from_value(1)], [Group.from_value(2)])
+    assert first == second and hash(first) == hash(second)
+    assert hash(first) != hash(Fraction([Group.from_value(2)], [Group.from_value(1)]))
@@ -0,0 +1,86 @@
+import sys
+
+from decimal import Decimal
+
+import pytest
+
+from numsy import parser, solver
+from numsy.parser import gts, UnmatchedParenthesis
+from numsy.solver.utility import clean_equation, get_equation_identity
+
+
+@pytest.mark.parametrize("string, expected", [
+    ("1 >= 1", "1 >= 1"),
+    ("1 <= 2", "1 <= 2"),
+    ("1 == 1", "1 = 1"),
+    ("1 != 2", "1 != 2"),
+])
+def test_compound_relational_operators(string, expected):
+    assert gts(parser.parse_group(string)) == expected
+
+
+def test_unmatched_parentheses():
+    with pytest.raises(UnmatchedParenthesis):
+        parser.parse_group("(1 + 2")
+    with pytest.raises(UnmatchedParenthesis):
+        parser.parse_group("1 + 2)")
+    with pytest.raises(UnmatchedParenthesis):
+        parser.parse_group("2^(1 + (2)")
+
+
+def test_power_after_parenthesized_group():
+    assert solver.solve("(1 + 1) + 2^2").other_value == 6
+    assert solver.solve("(2)^2 - 3^2").other_value == -5
+    assert solver.solve("2 ^ -2").other_value == 0.25
+
+
+def test_power_after_scientific_notation():
+    assert gts(parser.parse_group("4E2^2")) == "(4 * 10^2)^2"
+    assert gts(parser.parse_group("2E-2^(1 + 1)")) == "(2 * 10^-2)^(1 + 1)"
+    assert gts(parser.parse_group("181E+1^15 * 15")) == "(181 * 10)^15 * 15"
+    assert solver.solve("x = 4E2^2").x == 160000
+
+
+def test_long_expression():
+    string = " + ".join(f"{i}^2 * (3 - {i})" for i in range(1, 100))
+    assert solver.solve(string).other_value == sum(i ** 2 * (3 - i) for i in range(1, 100))
+
+
+def test_deeply_nested_parentheses():
+    depth = 3 * sys.getrecursionlimit()
+    assert solver.solve("(" * depth + "1 + 2" + ")" * depth).other_value == 3
+    assert solver.solve("2 * (" * depth + "1" + ")" * depth + " / 2 ^ " + str(depth - 1)).other_value == 2
+
+
+def test_deeply_nested_powers():
+    depth = 3 * sys.getrecursionlimit()
+    groups = parser.parse_group("2^(" * depth + "3" + ")" * depth)
+    assert gts(groups).count("^") == depth
+    assert not get_equation_identity(clean_equation(groups)).variable_count
+    depth = sys.getrecursionlimit() + 100
+    assert solver.solve("2^(" * 3 + "1^(" * depth + "2" + ")" * (depth + 3)).other_value == 16
+
+
+def test_compact_objects():
+    groups = parser.parse_group("2x^2 - (3 + 1) * 4")
+    for obj in (groups[0], groups[0].number, groups[0].variable, groups[1], groups[2], groups[3]):
+        assert not hasattr(obj, "__dict__")
+    assert groups[0].number.factors == {1, 2}
+    assert parser.Group.from_value(Decimal(12)).number.factors is parser.Group.from_value(Decimal(-12)).number.factors
+
+
+def test_interned_objects():
+    groups = parser.parse_group("2x + x * y - x / 2")
+    assert groups[1] is parser.Operator.Add and groups[3] is parser.Operator.Mul and groups[6] is parser.Operator.Div
+    assert groups[0].variable is groups[2].variable is parser.Variable("x")
+    assert groups[0].number.value is parser.parse_group("-2 + 2")[2].number.value
+
+
+def test_number_value():
+    number = parser.parse_group("-12.05")[0].number
+    assert (number.value, number.integer, number.decimal, number.is_negative) == (Decimal("-12.05"), 12, Decimal("0.05"), True)
+    number.integer = 3
+    assert number.value == Decimal("-3.05")
+    number.is_negative = False
+    assert number.value == Decimal("3.05") and parser.Number.from_data(Decimal("-5E-8")).value == Decimal("-0.00000005")
+    assert parser.Number.from_data(Decimal(0), is_negative=True).value.is_signed()
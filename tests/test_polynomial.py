@@ -0,0 +1,61 @@
+import math
+import pytest
+
+from decimal import Decimal
+from fractions import Fraction
+
+from numsy import solver
+from numsy.parser import gts, parse_tree
+from numsy.solver import RootsNotConverged, root_finding
+from numsy.solver.polynomial import to_polynomial
+from numsy.solver.roots import count_real_roots, square_free
+
+
+def test_to_polynomial():
+    assert to_polynomial(parse_tree("(x + 1)^2 - 3x/4")) == {2: 1, 1: Fraction(5, 4), 0: 1}
+    assert to_polynomial(parse_tree("2(x - 1) - 2x + 2")) == {}
+    assert to_polynomial(parse_tree("x^3 * 2^-1")) == {3: Fraction(1, 2)}
+    assert to_polynomial(parse_tree("1/x")) is None  # The variable in a denominator
+    assert to_polynomial(parse_tree("2^x")) is None
+    assert to_polynomial(parse_tree("x^0.5")) is None
+    assert to_polynomial(parse_tree("(x + 1)^1000")) is None  # Too large to be expanded
+
+
+def test_long_linear_equation():
+    equation = " + ".join(f"{i}x - {i % 7}" for i in range(1, 3000)) + " = 7"
+    coefficient, constant = sum(range(1, 3000)), sum(i % 7 for i in range(1, 3000)) + 7
+    expected = Fraction(constant, coefficient)
+    assert gts(solver.solve(equation).x) == f"{expected.numerator}/{expected.denominator}"
+
+
+def test_irrational_roots():
+    roots = solver.solve("x^2 = 2").x
+    assert {abs(root - Decimal(2).sqrt()) < Decimal("1E-26") or abs(root + Decimal(2).sqrt()) < Decimal("1E-26") for root in roots} == {True}
+    assert solver.solve("x^2 = 2", backend="float").x == {2 ** 0.5, -2 ** 0.5}
+    roots = sorted(solver.solve("x^3 - 3x + 1 = 0", backend="float").x)  # Three real roots, 2cos(2πk/9 ± ...)
+    assert roots == pytest.approx([2 * math.cos(8 * math.pi / 9), 2 * math.cos(4 * math.pi / 9), 2 * math.cos(2 * math.pi / 9)])
+    assert solver.solve("x^3 + x + 1 = 0", backend="float").x == pytest.approx(-0.6823278038280193)
+
+
+def test_higher_degrees():
+    result = solver.solve("x^4 - 2 = 0", backend="float")
+    assert result.numeric and sorted(result.x) == pytest.approx([-2 ** 0.25, 2 ** 0.25])
+    assert not solver.solve("x^2 = 4").numeric
+    assert not solver.solve("x^2 = 4", backend="exact").numeric
+    result = solver.solve("x^2 = 2", backend="exact")  # Irrational, the exact roots are Decimal approximations
+    assert result.numeric and sorted(float(root) for root in result.x) == pytest.approx([-2 ** 0.5, 2 ** 0.5])
+    assert solver.solve("x^3 = 2").numeric
+    roots = solver.solve("(x - 1) * (x - 1.02) * (x^2 + 1) * (x + 3) = 0").x
+    assert {gts(root) for root in roots} == {"1", "51/50", "-3"}  # Close roots stay apart
+    with root_finding(complex_roots=True):
+        roots = solver.solve("x^4 - 1 = 0", backend="float").x
+    assert {1, -1} < roots and sorted((root.real, root.imag) for root in roots if isinstance(root, complex)) == pytest.approx([(0, -1), (0, 1)], abs=1e-12)
+    with root_finding(max_iterations=1), pytest.raises(RootsNotConverged):
+        solver.solve("x^5 - 3x + 1 = 0")
+
+
+def test_real_roots():
+    polynomial = [Fraction(c) for c in (1, 0, -5, 0, 4)]
+    assert count_real_roots(polynomial) == 4
+    assert count_real_roots([Fraction(c) for c in (1, 0, 0, 0, 1)]) == 0
+    assert square_free([Fraction(c) for c in (1, -3, 3, -1)]) == [1, -1]  # (x - 1)^3
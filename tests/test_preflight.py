@@ -0,0 +1,64 @@
+import pytest
+
+from numsy import solver
+from numsy.parser import parse_tree, parse_group
+from numsy.solver import ExpressionTooComplex, cost_budget, estimate_cost
+
+
+@pytest.mark.parametrize("problem", ["9^9^9", "(10E5000)^(10E5000)", "9^9^9 + x = 1", "(2x)^(9^9^9) = 4", "2^(1/0 + 10^10^10)"])
+@pytest.mark.parametrize("backend", ["decimal", "exact", "float"])
+def test_rejected(problem: str, backend: str):
+    with pytest.raises(ExpressionTooComplex) as excinfo:
+        solver.solve(problem, backend=backend)
+    assert excinfo.value.cost.magnitude > excinfo.value.budget.magnitude
+
+
+def test_estimate():
+    assert estimate_cost(parse_tree("2 + 3")).magnitude == pytest.approx(0.47712125)
+    assert estimate_cost(parse_tree("10^300 / 10^300")).magnitude == pytest.approx(300)
+    assert estimate_cost(parse_tree("2^2^2^2^2")).magnitude == pytest.approx(19728.3, rel=1e-4)
+    assert estimate_cost(parse_tree("1^(10^10^10)")).magnitude == pytest.approx(10 ** 10)  # Only the exponent is large
+    assert estimate_cost(parse_tree("x^2 = 4")).magnitude == pytest.approx(0.60205999)
+    assert estimate_cost(parse_tree("2^(1E-7)")).magnitude == pytest.approx(7)  # Only 10^-7 has digits
+    assert estimate_cost(parse_tree("2^(-(10^5))")).magnitude == pytest.approx(30103)
+    assert estimate_cost(parse_tree("0 * 10^100")).magnitude == pytest.approx(100)
+
+
+@pytest.mark.parametrize("problem", ["x = 2^(1E-7)", "x = 2^(10^-7)", "4^(0E+14 / 5.24 - 0E0)", "2^(0E7)",
+                                     "2^(-(10^5))", "2^(0 * 10^9)", "(0 * 10^9)^(10^9)"])
+def test_small_exponents(problem: str):
+    # A tiny, zero or negative exponent keeps the power close to 1 (or below it), and a zero stays a zero
+    assert estimate_cost(parse_tree(problem)).magnitude < 100000
+
+
+@pytest.mark.parametrize("problem", ["2^(0*10^7)", "((17^(4E-020)))", "4^(0E+14 / 5.24 - 0E0)", "2^(0E7)", "2^-10",
+                                     "(1/2)^(10^7)", "2^(-(10^7))", "9^9^9"])
+def test_same_verdict(problem: str):
+    # The calculator checks the calculated values, the full solver the estimate, both accept or reject the same ones
+    def verdict(equation):
+        try:
+            return solver.solve(equation).other_value
+        except ExpressionTooComplex:
+            return None
+    assert verdict(problem) == verdict(parse_group(problem))
+
+
+def test_budget():
+    assert solver.solve("2^2000").other_value > 0
+    with cost_budget(magnitude=100):
+        with pytest.raises(ExpressionTooComplex):
+            solver.solve("2^2000")  # Calculator-style expressions are checked too
+        with pytest.raises(ExpressionTooComplex):
+            solver.solve(parse_group("2^2000"))
+        assert solver.solve("2^300").other_value > 0
+    with cost_budget(work=3):
+        with pytest.raises(ExpressionTooComplex):
+            solver.solve("1 + 2 * 3", backend="exact")
+        assert solver.solve("1 + 2", backend="float").other_value == 3
+    assert solver.solve("2^2000").other_value > 0  # Restored after the block
+
+
+def test_factors_limit():
+    group = parse_group("-100000000000000000000")[0]
+    with pytest.raises(ValueError):
+        group.number.factors
@@ -20,3 +20,12 @@ def test_main(number, problem: str):
 
     error_message = f"{number} | {problem}, got {solved} ❌ [Expected answer: {answer.strip()}]"
     assert result, error_message
+
+
+def test_long_expression():
+    from numsy.parser import parse_group
+    from numsy.solver import clean_equation
+    from numsy.solver.solve_basic import solve_basic
+
+    groups = clean_equation(parse_group(" + ".join(f"{i} * 3 / 2 - {i}" for i in range(5000))))
+    assert solve_basic(groups) == Decimal(6248750) and len(groups) == 1
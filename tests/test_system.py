@@ -0,0 +1,54 @@
+import random
+
+from decimal import Decimal
+
+import pytest
+
+from numsy import solver
+from numsy.parser import gts, parse_tree
+from numsy.solver.core import NoSolution
+from numsy.solver.system import to_linear
+
+
+def test_to_linear():
+    assert to_linear(parse_tree("2(x - y) + y/4 + 3^2")) == {"x": 2, "y": Decimal("-1.75"), None: 9}
+    assert to_linear(parse_tree("x * y")) is None
+    assert to_linear(parse_tree("x^2")) is None
+    assert to_linear(parse_tree("1/x")) is None
+
+
+@pytest.mark.parametrize("system, expected", [
+    ("x + y = 3; x - y = 1", {"x": "2", "y": "1"}),
+    (["2x + 3y = 1", "x - y = 2"], {"x": "7/5", "y": "-3/5"}),
+    ("x + 2(y - z) = 3; y/2 + z = 1; x = z + 0.5", {"x": "4/5", "y": "7/5", "z": "3/10"}),
+    ("x + y = 2; 2x + 2y = 4; x - y = 0", {"x": "1", "y": "1"}),  # More equations than variables
+    ("x + y = 3; x - y = 1;", {"x": "2", "y": "1"}),
+])
+def test_systems(system, expected):
+    result = solver.solve(system)
+    assert {variable.name: gts(value) for variable, value in result.variables_map.items()} == expected
+
+
+def test_special_systems():
+    assert solver.solve("x + y = 1; x + y = 2").x == NoSolution()
+    assert solver.solve("x = 1; x = 1").x == 1
+    assert isinstance(x := solver.solve("x + y = 3; x - y = 1", backend="float").x, float) and x == 2
+    with pytest.raises(NotImplementedError):
+        solver.solve("x + y = 1; 2x + 2y = 2")  # Infinitely many solutions
+    with pytest.raises(NotImplementedError):
+        solver.solve("x * y = 1; x = 2")
+    with pytest.raises(NotImplementedError):
+        solver.solve("x + y < 1; x = 2")
+
+
+def test_large_system():
+    random.seed(0)
+    names = [chr(c) for c in range(ord("a"), ord("z") + 1)] + [chr(c) for c in range(ord("A"), ord("Z") + 1) if chr(c) != "E"]
+    names = names[:50]  # "E" is read as scientific notation
+    answer = [random.randint(-9, 9) for _ in names]
+    equations = []
+    for _ in names:
+        coefficients = [random.randint(-9, 9) for _ in names]
+        equations.append(" + ".join(f"{c} * {name}" for c, name in zip(coefficients, names)) + f" = {sum(c * a for c, a in zip(coefficients, answer))}")
+    result = solver.solve(equations)
+    assert [getattr(result, name) for name in names] == answer
@@ -0,0 +1,56 @@
+import dataclasses
+import re
+import sys
+
+import pytest
+
+from decimal import Decimal
+from fractions import Fraction
+
+from numsy import solver
+from numsy.parser import parse_tree, to_tree, from_tree, gts, parse_group, Num, Var, Pow, UnaryOp, BinOp, Equation, Equals
+
+problems = [re.match(r"(.+?),\s*\w\s*=", x).group(1) for x in open(r"tests/test_variables.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+problems += [x.split("==")[0] for x in open(r"tests/test_problems.txt", encoding="UTF-8").readlines() if not x.startswith("#") and x != "\n"]
+
+
+def answer(result):
+    return {k.name: gts(v) if not isinstance(v, set) else {gts(i) for i in v} for k, v in result.variables_map.items()} or result.other_value
+
+
+@pytest.mark.parametrize("problem", problems)
+def test_round_trip(problem):
+    tree = parse_tree(problem)
+    groups = from_tree(tree)
+    assert to_tree(groups) == tree
+    assert answer(solver.solve(groups)) == answer(solver.solve(problem))
+
+
+def test_tree_structure():
+    assert parse_tree("3x^2 + 2x - 7") == BinOp(
+        "+",
+        BinOp("+", BinOp("*", Num(Decimal(3)), Pow(Var("x"), Num(Decimal(2)))), BinOp("*", Num(Decimal(2)), Var("x"))),
+        Num(Decimal(-7))
+    )
+    assert parse_tree("-2^2") == UnaryOp(Pow(Num(Decimal(2)), Num(Decimal(2))))
+    assert parse_tree("6/2(1 + 2)") == BinOp("*", BinOp("/", Num(Decimal(6)), Num(Decimal(2))), BinOp("+", Num(Decimal(1)), Num(Decimal(2))))
+    assert parse_tree("x = 1") == Equation((Var("x"), Num(Decimal(1))), (Equals,))
+    assert gts(from_tree(parse_tree("2 * x + 1 = 3"))) == "2x + 1 = 3"
+
+
+def test_nodes_are_immutable_and_hashable():
+    tree = parse_tree("(x + 1)(x + 1)")
+    assert isinstance(tree, BinOp) and tree.left == tree.right and hash(tree.left) == hash(tree.right)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        tree.operator = "+"  # type: ignore
+
+
+def test_deeply_nested_tree():
+    depth = 3 * sys.getrecursionlimit()
+    groups = from_tree(parse_tree("(" * depth + "1 + 2" + ")" * depth))
+    assert gts(groups) == gts(parse_group("1 + 2"))
+
+
+def test_exact_values():
+    groups = from_tree(BinOp("+", Num(Fraction(-1, 2)), Num(Fraction(3))))
+    assert solver.solve(groups, backend="exact").other_value == Fraction(5, 2)